@@ -1,4 +1,7 @@
+from engine.motor import POOL_MOTORES
 from ui import mostrar_interfaz
 
 if __name__ == "__main__":
+    # Construye los motores de cada cultivo sin bloquear el primer render
+    POOL_MOTORES.calentar_en_segundo_plano()
     mostrar_interfaz()
\ No newline at end of file
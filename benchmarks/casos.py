@@ -0,0 +1,73 @@
+"""
+Casos para los benchmarks: los reales de las pruebas y sintéticos al azar.
+
+Ambos se leen con `ast` (sin importar los módulos) para no depender de
+pytest ni de Streamlit.
+"""
+import ast
+import glob
+import os
+import random
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATRONES_PRUEBAS = ("test_inferencia_*.py", "test_borde_*.py", "test_explicacion_*.py")
+
+
+def _literal(nodo, variables):
+    if isinstance(nodo, ast.Name):
+        return variables.get(nodo.id)
+    try:
+        return ast.literal_eval(nodo)
+    except ValueError:
+        return None
+
+
+def casos_reales(raiz=RAIZ):
+    """Pares (cultivo, síntomas) de cada `sistema.diagnosticar(...)` literal en las pruebas."""
+    casos = []
+    for patron in PATRONES_PRUEBAS:
+        for ruta in sorted(glob.glob(os.path.join(raiz, "tests", patron))):
+            with open(ruta, encoding="utf-8") as f:
+                arbol = ast.parse(f.read(), ruta)
+            for funcion in ast.walk(arbol):
+                if not isinstance(funcion, ast.FunctionDef):
+                    continue
+                variables = {}
+                for nodo in ast.walk(funcion):
+                    if (isinstance(nodo, ast.Assign) and len(nodo.targets) == 1
+                            and isinstance(nodo.targets[0], ast.Name)):
+                        valor = _literal(nodo.value, variables)
+                        if isinstance(valor, list):
+                            variables[nodo.targets[0].id] = valor
+                    elif (isinstance(nodo, ast.Call) and isinstance(nodo.func, ast.Attribute)
+                            and nodo.func.attr == "diagnosticar" and len(nodo.args) == 2):
+                        cultivo = _literal(nodo.args[0], variables)
+                        sintomas = _literal(nodo.args[1], variables)
+                        if isinstance(cultivo, str) and isinstance(sintomas, list):
+                            casos.append((cultivo.lower(), sintomas))
+    return casos
+
+
+def vocabularios(raiz=RAIZ):
+    """Síntomas de cada cultivo según `CULTIVOS` en ui/layout.py (clave en minúsculas)."""
+    with open(os.path.join(raiz, "ui", "layout.py"), encoding="utf-8") as f:
+        arbol = ast.parse(f.read())
+    for nodo in arbol.body:
+        if (isinstance(nodo, ast.Assign) and isinstance(nodo.targets[0], ast.Name)
+                and nodo.targets[0].id == "CULTIVOS"):
+            cultivos = ast.literal_eval(nodo.value)
+            return {nombre.lower(): info["sintomas"] for nombre, info in cultivos.items()}
+    raise LookupError("No se encontró CULTIVOS en ui/layout.py")
+
+
+def casos_sinteticos(n_por_cultivo, semilla=0, cultivos=None, maximo=6):
+    """`n_por_cultivo` conjuntos de 1 a `maximo` síntomas al azar por cultivo."""
+    rng = random.Random(semilla)
+    casos = []
+    for cultivo, vocabulario in sorted(vocabularios().items()):
+        if cultivos is not None and cultivo not in cultivos:
+            continue
+        for _ in range(n_por_cultivo):
+            k = rng.randint(1, min(maximo, len(vocabulario)))
+            casos.append((cultivo, rng.sample(vocabulario, k)))
+    return casos
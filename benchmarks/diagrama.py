@@ -0,0 +1,74 @@
+"""
+Diagramas de decisión frente a experta y al matcher compilado (una
+condición por regla), en uva y limón: tamaño del diagrama, costo de
+construirlo y microsegundos por caso.
+
+    python benchmarks/diagrama.py --sinteticos 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import obtener_matcher
+from engine.diagramas import construir_diagrama
+from benchmarks.casos import casos_reales, casos_sinteticos
+
+CULTIVOS = ("uva", "limon")
+
+
+def _por_caso(funcion, casos, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for sintomas in casos:
+            funcion(sintomas)
+    return (time.perf_counter() - inicio) / (len(casos) * repeticiones) * 1e6
+
+
+def medir(cultivo, casos, repeticiones=5):
+    clase = MAPA_CULTIVOS[cultivo]
+    matcher = obtener_matcher(clase, cultivo)
+
+    inicio = time.perf_counter()
+    diagrama = construir_diagrama(clase, cultivo)
+    construccion = (time.perf_counter() - inicio) * 1000
+
+    conjuntos = [set(s) for s in casos]
+    for sintomas in conjuntos:
+        diagrama.declarados(sintomas)  # combinaciones que se resuelven al vuelo
+    experta = SistemaExpertoPlagas()
+    experta.diagnosticar(cultivo, [])
+    return dict(
+        diagrama.estadisticas(),
+        reglas=len(matcher.reglas),
+        construccion_ms=construccion,
+        experta_us=_por_caso(lambda s: experta.diagnosticar(cultivo, s), casos, 1),
+        compilado_us=_por_caso(matcher.declarados, conjuntos, repeticiones),
+        diagrama_us=_por_caso(diagrama.declarados, conjuntos, repeticiones),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cultivos", nargs="*", default=list(CULTIVOS))
+    parser.add_argument("--sinteticos", type=int, default=300)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'cultivo':>8} {'nodos':>6} {'grupos':>6} {'camino':>6} {'construir ms':>12} "
+          f"{'experta us':>10} {'compilado us':>12} {'diagrama us':>11}")
+    for cultivo in args.cultivos:
+        casos = [s for c, s in casos_reales() if c == cultivo]
+        casos += [s for _, s in casos_sinteticos(args.sinteticos, args.semilla, cultivos=[cultivo])]
+        m = medir(cultivo, casos)
+        print(f"{cultivo:>8} {m['nodos']:>6} {m['grupos']:>6} {m['camino_maximo']:>6} "
+              f"{m['construccion_ms']:>12.1f} {m['experta_us']:>10.1f} "
+              f"{m['compilado_us']:>12.1f} {m['diagrama_us']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
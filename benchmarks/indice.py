@@ -0,0 +1,103 @@
+"""
+Matcher compilado con y sin el índice síntoma -> reglas, sobre bases de
+reglas sintéticas cada vez más grandes (cada regla nombra unos pocos
+síntomas y cada caso trae 2 a 4).
+
+    python benchmarks/indice.py --reglas 10 50 100 200 400
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine.compilado  # noqa: F401  (parche de collections antes de experta)
+from experta import KnowledgeEngine, Rule, MATCH, TEST, NOT
+from knowledge.hechos import Caso, Diagnostico, precalcular_diagnosticos
+from engine.compilado import MatcherCompilado
+
+_REGLA = '''
+    @Rule(Caso(cultivo="sintetico", sintomas=MATCH.s),
+          TEST(lambda s: len({conjunto!r} & s) >= {minimo}))
+    def regla_{i}(self):
+        self.declare(Diagnostico(plaga="plaga_{i}", certeza={certeza}, umbral="5%",
+                                 recomendaciones=["revisar"], regla_activada="regla_{i}"))
+'''
+
+_SIN_DIAGNOSTICO = '''
+    @Rule(Caso(cultivo="sintetico", sintomas=MATCH.s), NOT(Diagnostico()))
+    def sin_diagnostico(self):
+        self.declare(Diagnostico(plaga="Sin plaga identificada", certeza=0.0,
+                                 regla_activada="sin_diagnostico"))
+'''
+
+
+def base_sintetica(n_reglas, semilla=0, sintomas_por_regla=3):
+    """Clase de reglas con `n_reglas` reglas y un vocabulario de n_reglas síntomas."""
+    azar = random.Random(semilla)
+    vocabulario = [f"s{j}" for j in range(max(n_reglas, sintomas_por_regla))]
+    fuente = ["class ReglasSinteticas(KnowledgeEngine):"]
+    for i in range(n_reglas):
+        conjunto = set(azar.sample(vocabulario, sintomas_por_regla))
+        fuente.append(_REGLA.format(i=i, conjunto=conjunto, minimo=azar.randint(1, 2),
+                                    certeza=round(azar.random(), 2)))
+    fuente.append(_SIN_DIAGNOSTICO)
+    espacio = {"KnowledgeEngine": KnowledgeEngine, "Rule": Rule, "MATCH": MATCH,
+               "TEST": TEST, "NOT": NOT, "Caso": Caso, "Diagnostico": Diagnostico}
+    exec("\n".join(fuente), espacio)
+    return precalcular_diagnosticos(espacio["ReglasSinteticas"]), vocabulario
+
+
+def casos_para(vocabulario, n, semilla=0):
+    azar = random.Random(semilla)
+    return [set(azar.sample(vocabulario, azar.randint(2, 4))) for _ in range(n)]
+
+
+def _sin_indice(matcher, sintomas):
+    m = matcher.mascara(sintomas)
+    reglas = matcher.reglas
+    return [hecho for _, hecho in matcher.disparar(lambda i: reglas[i].activacion.evaluar(m),
+                                                   lambda i: reglas[i].declaracion.evaluar(m))]
+
+
+def medir(n_reglas, casos=2000, semilla=0):
+    clase, vocabulario = base_sintetica(n_reglas, semilla)
+    matcher = MatcherCompilado(clase, "sintetico")
+    observaciones = casos_para(vocabulario, casos, semilla)
+
+    tiempos = {}
+    for nombre, correr in (("sin_indice", lambda s: _sin_indice(matcher, s)),
+                           ("con_indice", matcher.declarados)):
+        inicio = time.perf_counter()
+        for sintomas in observaciones:
+            correr(sintomas)
+        tiempos[nombre] = (time.perf_counter() - inicio) / len(observaciones) * 1e6
+    candidatas = sum(len(matcher.candidatas(s)) for s in observaciones) / len(observaciones)
+    return {
+        "reglas": len(matcher.reglas),
+        "candidatas_por_caso": candidatas,
+        "sin_indice_us": tiempos["sin_indice"],
+        "con_indice_us": tiempos["con_indice"],
+        "aceleracion": tiempos["sin_indice"] / tiempos["con_indice"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reglas", type=int, nargs="+", default=[10, 50, 100, 200, 400])
+    parser.add_argument("--casos", type=int, default=2000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'reglas':>7} {'candidatas':>11} {'sin índice us':>14} {'con índice us':>14} {'x':>6}")
+    for n in args.reglas:
+        m = medir(n, args.casos, args.semilla)
+        print(f"{m['reglas']:>7} {m['candidatas_por_caso']:>11.1f} {m['sin_indice_us']:>14.1f} "
+              f"{m['con_indice_us']:>14.1f} {m['aceleracion']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+ReglasPapa con las condiciones en el TEST frente a la versión anterior, que
+activaba las 20 reglas en cada caso y comprobaba la condición en el cuerpo
+(la copia congelada de tests/reglas_papa_original.py).
+
+    python benchmarks/papa.py --sinteticos 500
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.motor import _correr_motor
+from engine.metricas import contar_activaciones
+from benchmarks.casos import casos_reales, casos_sinteticos
+from knowledge.hechos import Caso
+from knowledge.reglas_papa import ReglasPapa
+from tests.reglas_papa_original import ReglasPapaOriginal
+
+
+def medir(clase_reglas, casos, repeticiones=3):
+    motor = clase_reglas()
+    conteos = {"reglas_coincidentes": 0, "activaciones_disparadas": 0}
+    for sintomas in casos:
+        motor.reset()
+        with contar_activaciones(motor, conteos):
+            motor.declare(Caso(cultivo="papa", sintomas=set(sintomas)))
+            motor.run()
+
+    latencias = []
+    for _ in range(repeticiones):
+        for sintomas in casos:
+            inicio = time.perf_counter()
+            _correr_motor(motor, "papa", sintomas)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    return {
+        "activaciones_por_caso": conteos["activaciones_disparadas"] / len(casos),
+        "p50_ms": statistics.median(latencias),
+        "media_ms": statistics.mean(latencias),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sinteticos", type=int, default=500)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    casos = [s for c, s in casos_reales() if c == "papa"]
+    casos += [s for _, s in casos_sinteticos(args.sinteticos, cultivos=["papa"])]
+
+    antes = medir(ReglasPapaOriginal, casos, args.repeticiones)
+    ahora = medir(ReglasPapa, casos, args.repeticiones)
+    print(f"{'':<14} {'activaciones/caso':>18} {'p50 ms':>8} {'media ms':>9}")
+    for nombre, m in (("sin guardas", antes), ("con TEST", ahora)):
+        print(f"{nombre:<14} {m['activaciones_por_caso']:>18.2f} {m['p50_ms']:>8.3f} {m['media_ms']:>9.3f}")
+    print(f"latencia media: {antes['media_ms'] / ahora['media_ms']:.1f}x más rápido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Escalado de DiagnosticoParalelo según el número de procesos.
+
+    python benchmarks/paralelo.py --casos 20000 --procesos 1 2 4 8 16
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.paralelo import DiagnosticoParalelo
+from benchmarks.casos import casos_sinteticos
+
+
+def generar_casos(n, semilla=0):
+    """`n` casos sintéticos de todos los cultivos, mezclados."""
+    casos = casos_sinteticos(-(-n // 6), semilla)
+    random.Random(semilla).shuffle(casos)
+    return casos[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--casos", type=int, default=20000)
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--trozo", type=int, default=None)
+    parser.add_argument("--backend", default="experta")
+    args = parser.parse_args()
+
+    casos = generar_casos(args.casos)
+    base = None
+    print(f"{'procesos':>8} {'casos/s':>12} {'aceleración':>12}")
+    for procesos in args.procesos:
+        with DiagnosticoParalelo(procesos=procesos, tamano_trozo=args.trozo,
+                                 backend=args.backend) as paralelo:
+            paralelo.diagnosticar_lote(casos[:procesos * 10])  # arranca los trabajadores
+            lote = paralelo.diagnosticar_lote(casos)
+        base = base or lote["casos_por_segundo"]
+        print(f"{procesos:>8} {lote['casos_por_segundo']:>12.0f} "
+              f"{lote['casos_por_segundo'] / base:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
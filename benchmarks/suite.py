@@ -0,0 +1,172 @@
+"""
+Benchmark de diagnosticar por cultivo.
+
+    python benchmarks/suite.py --salida resultados.json
+    python benchmarks/suite.py --linea-base benchmarks/linea_base.json --umbral 0.25
+    python benchmarks/suite.py --guardar-base benchmarks/linea_base.json
+
+Por cada cultivo mide: costo de construir el motor, latencia de
+diagnosticar (p50/p90/p99/máx, con motores ya construidos), casos por
+segundo y pico de memoria. Sale con código 1 si alguna métrica empeora más
+que el umbral respecto de la línea base.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from benchmarks.casos import casos_reales, casos_sinteticos
+
+# Métricas comparadas con la línea base y si más alto es peor
+METRICAS = {
+    "construccion_ms": True,
+    "p50_ms": True,
+    "p90_ms": True,
+    "p99_ms": True,
+    "casos_por_segundo": False,
+    "memoria_pico_kb": True,
+}
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    k = (len(ordenados) - 1) * p / 100
+    i = int(k)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (k - i)
+
+
+def medir_cultivo(cultivo, casos, backend="experta", construcciones=5, repeticiones=3):
+    clase = MAPA_CULTIVOS[cultivo]
+    tiempos = []
+    for _ in range(construcciones):
+        inicio = time.perf_counter()
+        clase()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    sistema = SistemaExpertoPlagas(backend=backend)
+    sistema.diagnosticar(cultivo, [])  # motor del pool (o matcher) ya construido
+
+    latencias = []
+    inicio_total = time.perf_counter()
+    for _ in range(repeticiones):
+        for sintomas in casos:
+            inicio = time.perf_counter()
+            sistema.diagnosticar(cultivo, sintomas)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    total = time.perf_counter() - inicio_total
+
+    tracemalloc.start()
+    for sintomas in casos:
+        sistema.diagnosticar(cultivo, sintomas)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "casos": len(casos),
+        "construccion_ms": statistics.median(tiempos),
+        "p50_ms": _percentil(latencias, 50),
+        "p90_ms": _percentil(latencias, 90),
+        "p99_ms": _percentil(latencias, 99),
+        "max_ms": max(latencias, default=0.0),
+        "casos_por_segundo": len(latencias) / total if total > 0 else 0.0,
+        "memoria_pico_kb": pico / 1024,
+    }
+
+
+def correr(backend="experta", sinteticos=200, semilla=0, cultivos=None, repeticiones=3):
+    cultivos = [c for c in (cultivos or MAPA_CULTIVOS) if c in MAPA_CULTIVOS]
+    por_cultivo = {c: [] for c in cultivos}
+    for cultivo, sintomas in casos_reales():
+        if cultivo in por_cultivo:
+            por_cultivo[cultivo].append(sintomas)
+    for cultivo, sintomas in casos_sinteticos(sinteticos, semilla, cultivos=cultivos):
+        if cultivo in por_cultivo:
+            por_cultivo[cultivo].append(sintomas)
+
+    return {
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "backend": backend,
+            "sinteticos": sinteticos,
+            "semilla": semilla,
+        },
+        "cultivos": {c: medir_cultivo(c, casos, backend, repeticiones=repeticiones)
+                     for c, casos in por_cultivo.items()},
+    }
+
+
+def comparar(actual, base, umbral=0.2):
+    """Lista de regresiones (cultivo, métrica, base, actual, cambio relativo)."""
+    regresiones = []
+    for cultivo, metricas in actual["cultivos"].items():
+        anteriores = base.get("cultivos", {}).get(cultivo)
+        if not anteriores:
+            continue
+        for metrica, mas_es_peor in METRICAS.items():
+            antes, ahora = anteriores.get(metrica), metricas.get(metrica)
+            if not antes or ahora is None:
+                continue
+            cambio = (ahora - antes) / antes
+            if (cambio if mas_es_peor else -cambio) > umbral:
+                regresiones.append((cultivo, metrica, antes, ahora, cambio))
+    return regresiones
+
+
+def _imprimir(resultado):
+    print(f"{'cultivo':<8} {'casos':>6} {'constr ms':>10} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'casos/s':>9} {'mem KB':>8}")
+    for cultivo, m in resultado["cultivos"].items():
+        print(f"{cultivo:<8} {m['casos']:>6} {m['construccion_ms']:>10.2f} {m['p50_ms']:>8.3f} "
+              f"{m['p90_ms']:>8.3f} {m['p99_ms']:>8.3f} {m['casos_por_segundo']:>9.0f} "
+              f"{m['memoria_pico_kb']:>8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="experta")
+    parser.add_argument("--sinteticos", type=int, default=200, help="casos al azar por cultivo")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--cultivos", nargs="+")
+    parser.add_argument("--salida", help="archivo JSON con los resultados")
+    parser.add_argument("--linea-base", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="empeoramiento relativo tolerado (0.2 = 20%%)")
+    parser.add_argument("--guardar-base", help="guarda esta corrida como línea base")
+    args = parser.parse_args(argv)
+
+    resultado = correr(args.backend, args.sinteticos, args.semilla, args.cultivos,
+                       args.repeticiones)
+    _imprimir(resultado)
+
+    for ruta in (args.salida, args.guardar_base):
+        if ruta:
+            with open(ruta, "w", encoding="utf-8") as f:
+                json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    if args.linea_base:
+        with open(args.linea_base, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar(resultado, base, args.umbral)
+        for cultivo, metrica, antes, ahora, cambio in regresiones:
+            print(f"REGRESIÓN {cultivo} {metrica}: {antes:.3f} -> {ahora:.3f} ({cambio:+.0%})")
+        if regresiones:
+            return 1
+        print(f"Sin regresiones (umbral {args.umbral:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,2 @@
-from .motor import SistemaExpertoPlagas
\ No newline at end of file
+from .motor import SistemaExpertoPlagas
+from .sesion import SesionDiagnostico
@@ -0,0 +1,147 @@
+import asyncio
+import weakref
+
+from engine.motor import SistemaExpertoPlagas
+
+
+def _cubeta(n):
+    """Cubeta de histograma en potencias de 2: 1, 2, 4, 8..."""
+    return 1 << (n.bit_length() - 1) if n > 0 else 0
+
+
+class DiagnosticoAsincrono:
+    """
+    Frente asyncio que agrupa diagnósticos concurrentes en micro-lotes.
+
+    Las peticiones que llegan dentro de `ventana` segundos (o hasta juntar
+    `max_lote`) se resuelven con una sola llamada a diagnosticar_lote en un
+    hilo del executor, que agrupa por cultivo; el event loop nunca se bloquea
+    con experta. Si el lote falla, sus casos se resuelven de a uno y el error
+    solo le llega a quien lo causó.
+    """
+
+    def __init__(self, sistema: SistemaExpertoPlagas = None, ventana: float = 0.002,
+                 max_lote: int = 256, executor=None):
+        if ventana < 0 or max_lote < 1:
+            raise ValueError("La ventana no puede ser negativa y el lote debe ser al menos 1.")
+        self.sistema = sistema if sistema is not None else SistemaExpertoPlagas()
+        self.ventana = ventana
+        self.max_lote = max_lote
+        self.executor = executor
+        self._espera = []
+        self._temporizador = None
+        self._en_curso = 0
+        self._tareas = set()
+        self._stats = {"peticiones": 0, "lotes": 0, "profundidad_maxima": 0}
+        self._hist_lotes = {}
+        self._hist_cola = {}
+
+    async def diagnosticar(self, cultivo: str, sintomas: list):
+        # Se valida antes de encolar: un caso malo no debe tumbar al resto del lote
+        if not isinstance(cultivo, str):
+            raise TypeError(f"El cultivo debe ser un texto, no {type(cultivo).__name__}")
+        sintomas = list(sintomas)
+        for sintoma in sintomas:
+            if not isinstance(sintoma, str):
+                raise TypeError(f"Cada síntoma debe ser un texto, no {type(sintoma).__name__}")
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._espera.append((cultivo, sintomas, futuro))
+        self._stats["peticiones"] += 1
+
+        profundidad = len(self._espera) + self._en_curso
+        self._stats["profundidad_maxima"] = max(self._stats["profundidad_maxima"], profundidad)
+        cubeta = _cubeta(profundidad)
+        self._hist_cola[cubeta] = self._hist_cola.get(cubeta, 0) + 1
+
+        if len(self._espera) >= self.max_lote:
+            self._despachar(loop)
+        elif self._temporizador is None:
+            self._temporizador = loop.call_later(self.ventana, self._despachar, loop)
+        return await futuro
+
+    def _despachar(self, loop):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._espera = self._espera, []
+        if not lote:
+            return
+        self._en_curso += len(lote)
+        self._stats["lotes"] += 1
+        cubeta = _cubeta(len(lote))
+        self._hist_lotes[cubeta] = self._hist_lotes.get(cubeta, 0) + 1
+        tarea = loop.create_task(self._resolver(loop, lote))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _resolver(self, loop, lote):
+        casos = [(cultivo, sintomas) for cultivo, sintomas, _ in lote]
+        try:
+            try:
+                resultado = await loop.run_in_executor(
+                    self.executor, self.sistema.diagnosticar_lote, casos)
+                respuestas = [(None, diagnostico) for diagnostico in resultado["resultados"]]
+            except Exception:
+                # Caso por caso, para que el error le llegue solo a quien lo causó
+                respuestas = await loop.run_in_executor(self.executor, self._resolver_de_a_uno, casos)
+        except asyncio.CancelledError:
+            # Sin esto, quien espera el lote (p. ej. al cerrar el loop) no se despierta nunca
+            for _, _, futuro in lote:
+                futuro.cancel()
+            raise
+        else:
+            for (_, _, futuro), (error, diagnostico) in zip(lote, respuestas):
+                if futuro.done():
+                    continue
+                if error is not None:
+                    futuro.set_exception(error)
+                else:
+                    futuro.set_result(diagnostico)
+        finally:
+            self._en_curso -= len(lote)
+
+    def _resolver_de_a_uno(self, casos):
+        """[(error, diagnóstico)] de cada caso, resuelto en su propio lote."""
+        resultados = []
+        for caso in casos:
+            try:
+                resultados.append((None, self.sistema.diagnosticar_lote([caso])["resultados"][0]))
+            except Exception as exc:
+                resultados.append((exc, None))
+        return resultados
+
+    def estadisticas(self):
+        """Peticiones, lotes, profundidad de cola e histogramas (cubetas en potencias de 2)."""
+        return dict(
+            self._stats,
+            profundidad=len(self._espera) + self._en_curso,
+            tamano_medio=self._stats["peticiones"] / self._stats["lotes"] if self._stats["lotes"] else 0.0,
+            hist_tamano_lote=dict(sorted(self._hist_lotes.items())),
+            hist_profundidad=dict(sorted(self._hist_cola.items())),
+        )
+
+
+# Un agrupador por event loop para diagnosticar_async
+_AGRUPADORES = weakref.WeakKeyDictionary()
+
+
+def agrupador(**opciones):
+    """
+    Devuelve (o crea con `opciones`) el DiagnosticoAsincrono del loop actual.
+    Si ya existe, `opciones` debe coincidir con las suyas (o no pasarse).
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _AGRUPADORES:
+        _AGRUPADORES[loop] = DiagnosticoAsincrono(**opciones)
+        return _AGRUPADORES[loop]
+    existente = _AGRUPADORES[loop]
+    distintas = sorted(k for k, v in opciones.items() if getattr(existente, k, None) != v)
+    if distintas:
+        raise ValueError(f"Este loop ya tiene un agrupador con otras opciones: {', '.join(distintas)}")
+    return existente
+
+
+async def diagnosticar_async(cultivo: str, sintomas: list):
+    """Versión asíncrona de SistemaExpertoPlagas.diagnosticar con micro-lotes."""
+    return await agrupador().diagnosticar(cultivo, sintomas)
@@ -0,0 +1,180 @@
+import hashlib
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from engine.compilado import obtener_matcher
+from engine.resultado import DiagnosticoItem, ResultadoDiagnostico
+from knowledge.hechos import Ficha
+
+
+def _tamano(obj, vistos=None):
+    """Estimación en bytes de un objeto y lo que contiene."""
+    if vistos is None:
+        vistos = set()
+    # Las fichas están internadas: viven una sola vez fuera de la caché
+    if id(obj) in vistos or isinstance(obj, (type, Ficha)):
+        return 0
+    vistos.add(id(obj))
+    total = sys.getsizeof(obj)
+    if isinstance(obj, (ResultadoDiagnostico, DiagnosticoItem)):
+        total += sum(_tamano(getattr(obj, campo), vistos) for campo in obj.__slots__
+                     if campo != "_json")
+    elif isinstance(obj, dict):
+        total += sum(_tamano(k, vistos) + _tamano(v, vistos) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        total += sum(_tamano(v, vistos) for v in obj)
+    return total
+
+
+class _Huella:
+    """Identifica la versión de las reglas de un cultivo (clase + fuente)."""
+
+    def __init__(self, clase_reglas):
+        self.clase_reglas = clase_reglas
+        try:
+            self.archivo = inspect.getsourcefile(clase_reglas)
+        except TypeError:
+            self.archivo = None
+        self._stat = None
+        self.digest = None
+        self.actualizar()
+
+    def actualizar(self):
+        """Relee el archivo si cambió en disco. Devuelve True si cambió el contenido."""
+        if not self.archivo:
+            return False
+        try:
+            st = os.stat(self.archivo)
+        except OSError:
+            return False
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._stat:
+            return False
+        self._stat = stat
+        with open(self.archivo, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        cambio = self.digest is not None and digest != self.digest
+        self.digest = digest
+        return cambio
+
+
+class CacheDiagnosticos:
+    """
+    Caché LRU (con TTL opcional) de resultados de diagnosticar.
+
+    La clave es (cultivo_key, frozenset de síntomas) quedándose solo con los
+    síntomas que las reglas del cultivo mencionan, así los síntomas que no
+    influyen no generan entradas distintas. Las entradas se guardan congeladas
+    y cada acierto devuelve una copia nueva. Si cambia la clase de reglas del
+    cultivo o su archivo fuente, sus entradas se descartan.
+    """
+
+    def __init__(self, mapa_cultivos, max_entradas: int = 4096, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = None, intervalo_verificacion: float = 1.0):
+        self.mapa_cultivos = mapa_cultivos
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.intervalo_verificacion = intervalo_verificacion
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._huellas = {}
+        self._vocabularios = {}
+        self._ultima_verificacion = {}
+        self._stats = {"aciertos": 0, "fallos": 0, "expulsados": 0,
+                       "expirados": 0, "invalidaciones": 0}
+
+    def _vigilar(self, cultivo_key, ahora):
+        """Invalida el cultivo si sus reglas cambiaron (se comprueba cada `intervalo_verificacion`)."""
+        clase = self.mapa_cultivos[cultivo_key]
+        huella = self._huellas.get(cultivo_key)
+        if huella is None or huella.clase_reglas is not clase:
+            if huella is not None:
+                self._invalidar(cultivo_key)
+            self._huellas[cultivo_key] = _Huella(clase)
+            self._vocabularios.pop(cultivo_key, None)
+            self._ultima_verificacion[cultivo_key] = ahora
+            return
+        if ahora - self._ultima_verificacion.get(cultivo_key, 0) >= self.intervalo_verificacion:
+            self._ultima_verificacion[cultivo_key] = ahora
+            if huella.actualizar():
+                self._invalidar(cultivo_key)
+
+    def _vocabulario(self, cultivo_key):
+        if cultivo_key not in self._vocabularios:
+            matcher = obtener_matcher(self.mapa_cultivos[cultivo_key], cultivo_key)
+            self._vocabularios[cultivo_key] = (
+                frozenset(matcher.vocabulario) if matcher is not None else None)
+        return self._vocabularios[cultivo_key]
+
+    def clave(self, cultivo_key, sintomas):
+        vocabulario = self._vocabulario(cultivo_key)
+        if vocabulario is None:
+            return (cultivo_key, frozenset(sintomas))
+        return (cultivo_key, vocabulario.intersection(sintomas))
+
+    def _quitar(self, clave):
+        _, tamano, _ = self._entradas.pop(clave)
+        self._bytes -= tamano
+
+    def _invalidar(self, cultivo_key):
+        for clave in [c for c in self._entradas if c[0] == cultivo_key]:
+            self._quitar(clave)
+        self._stats["invalidaciones"] += 1
+
+    def obtener(self, cultivo_key: str, sintomas):
+        """Devuelve una copia del resultado guardado o None."""
+        ahora = time.monotonic()
+        with self._lock:
+            self._vigilar(cultivo_key, ahora)
+            clave = self.clave(cultivo_key, sintomas)
+            entrada = self._entradas.get(clave)
+            if entrada is not None and self.ttl is not None and ahora - entrada[2] > self.ttl:
+                self._quitar(clave)
+                self._stats["expirados"] += 1
+                entrada = None
+            if entrada is None:
+                self._stats["fallos"] += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self._stats["aciertos"] += 1
+            guardado = entrada[0]
+        return guardado.copia()
+
+    def guardar(self, cultivo_key: str, sintomas, resultado):
+        # Copia propia de la lista; los DiagnosticoItem (inmutables) se comparten
+        guardado = resultado.copia()
+        tamano = _tamano(guardado)
+        if tamano > self.max_bytes:
+            return
+        ahora = time.monotonic()
+        with self._lock:
+            self._vigilar(cultivo_key, ahora)
+            clave = self.clave(cultivo_key, sintomas)
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = (guardado, tamano, ahora)
+            self._bytes += tamano
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                self._quitar(next(iter(self._entradas)))
+                self._stats["expulsados"] += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self._stats["aciertos"] + self._stats["fallos"]
+            return dict(
+                self._stats,
+                entradas=len(self._entradas),
+                bytes=self._bytes,
+                tasa_aciertos=self._stats["aciertos"] / consultas if consultas else 0.0,
+            )
@@ -0,0 +1,556 @@
+import collections.abc
+
+# Parche para compatibilidad con Python 3.10+
+collections.Mapping = collections.abc.Mapping
+collections.MutableMapping = collections.abc.MutableMapping
+collections.MutableSequence = collections.abc.MutableSequence
+collections.Sequence = collections.abc.Sequence
+collections.Iterable = collections.abc.Iterable
+collections.Iterator = collections.abc.Iterator
+collections.MutableSet = collections.abc.MutableSet
+collections.Callable = collections.abc.Callable
+
+import bisect
+import dis
+import inspect
+import threading
+
+from experta import Fact, NOT, TEST, W
+from experta.utils import freeze
+from knowledge.hechos import Caso, _Grabador
+from engine.resultado import DiagnosticoItem
+
+# Un predicado con más variables que esto no se tabula (2^n evaluaciones)
+LIMITE_VARIABLES = 16
+
+# Síntomas que ninguna regla puede referenciar: sirven para comprobar que los
+# predicados solo dependen de la pertenencia de los síntomas que nombran. Se
+# agregan de a varios para que también se note si cuentan síntomas (len(s)).
+_RUIDO = tuple(f"\x00sintoma_ajeno_{i}" for i in range(8))
+_CONJUNTOS_RUIDO = tuple(frozenset(_RUIDO[:n]) for n in (1, 3, len(_RUIDO)))
+
+# Globales que un TEST puede usar: cualquier otro nombre (una constante del
+# módulo, una función) puede esconder síntomas que el análisis no ve.
+GLOBALES_PERMITIDAS = frozenset({"len", "set", "frozenset", "any", "all", "sum",
+                                 "min", "max", "bool", "int", "abs", "sorted"})
+
+
+# Posiciones de los bits encendidos de cada byte (para recorrer máscaras)
+_BITS_BYTE = tuple(tuple(j for j in range(8) if b >> j & 1) for b in range(256))
+
+
+class ReglasNoCompilables(Exception):
+    """Las reglas usan construcciones que el backend compilado no soporta."""
+    pass
+
+
+class Condicion:
+    """
+    Predicado sobre la máscara de bits de un caso.
+
+    Se normaliza a la forma
+        (m & requeridos) == requeridos
+        and not (m & prohibidos)
+        and popcount(m & grupo) >= minimo
+    y, si la tabla de verdad no encaja en ella, se evalúa por tabla.
+    """
+
+    __slots__ = ("variables", "tabla", "requeridos", "prohibidos",
+                 "grupo", "minimo", "bits", "evaluar")
+
+    def __init__(self, variables, tabla, indice):
+        self.variables = tuple(variables)
+        self.tabla = tuple(tabla)
+        self.bits = tuple(indice[v] for v in self.variables)
+        self.requeridos = self.prohibidos = self.grupo = self.minimo = None
+        self.evaluar = self._normalizar()
+
+    def _normalizar(self):
+        verdaderas = [i for i, valor in enumerate(self.tabla) if valor]
+        if not verdaderas:
+            return lambda m: False
+        if len(verdaderas) == len(self.tabla):
+            return lambda m: True
+
+        n = len(self.variables)
+        siempre = [j for j in range(n) if all(i >> j & 1 for i in verdaderas)]
+        nunca = [j for j in range(n) if not any(i >> j & 1 for i in verdaderas)]
+        libres = [j for j in range(n) if j not in siempre and j not in nunca]
+        minimo = min(sum(i >> j & 1 for j in libres) for i in verdaderas)
+
+        def cumple(i):
+            return (all(i >> j & 1 for j in siempre)
+                    and not any(i >> j & 1 for j in nunca)
+                    and sum(i >> j & 1 for j in libres) >= minimo)
+
+        if any(bool(self.tabla[i]) != cumple(i) for i in range(len(self.tabla))):
+            bits, tabla = self.bits, self.tabla
+
+            def por_tabla(m):
+                i = 0
+                for j, b in enumerate(bits):
+                    if m & b:
+                        i |= 1 << j
+                return tabla[i]
+            return por_tabla
+
+        req = sum(self.bits[j] for j in siempre)
+        proh = sum(self.bits[j] for j in nunca)
+        grupo = sum(self.bits[j] for j in libres)
+        self.requeridos, self.prohibidos, self.grupo, self.minimo = req, proh, grupo, minimo
+
+        if not proh and not grupo:
+            return lambda m: m & req == req
+        if not req and not proh and minimo == 1:
+            return lambda m: bool(m & grupo)
+        return lambda m: (m & req == req and not m & proh
+                          and (m & grupo).bit_count() >= minimo)
+
+    @property
+    def forma(self):
+        """Descripción legible del predicado (para inspección y pruebas)."""
+        if self.requeridos is None:
+            if not any(self.tabla):
+                return "nunca"
+            if all(self.tabla):
+                return "siempre"
+            return "tabla"
+        return "mascara"
+
+    def __call__(self, m):
+        return self.evaluar(m)
+
+
+class HechoCompilado:
+    """Hecho que declara el cuerpo de una regla, ya congelado."""
+
+    __slots__ = ("clase", "campos", "clave", "diagnostico")
+
+    def __init__(self, hecho):
+        self.clase = type(hecho)
+        self.campos = {k: freeze(v) for k, v in hecho.items()
+                       if not Fact.is_special(k)}
+        # Misma identidad que usa FactList para descartar duplicados
+        self.clave = frozenset([self.clase] + list(self.campos.items()))
+        # Item del resultado, armado una vez y compartido por cada disparo
+        self.diagnostico = (DiagnosticoItem.desde_hecho(self.campos)
+                            if "plaga" in self.campos else None)
+
+    def crear(self, factid):
+        # Los campos ya están congelados: se copian sin pasar por Fact.__setitem__
+        hecho = self.clase()
+        dict.update(hecho, self.campos)
+        hecho.__factid__ = factid
+        return hecho
+
+
+class ReglaCompilada:
+    """Una regla de experta reducida a condiciones sobre máscaras de bits."""
+
+    __slots__ = ("nombre", "salience", "activacion", "declaracion",
+                 "hechos", "negaciones")
+
+    def __init__(self, nombre, salience, activacion, declaracion, hechos, negaciones):
+        self.nombre = nombre
+        self.salience = salience
+        self.activacion = activacion
+        self.declaracion = declaracion
+        self.hechos = hechos
+        self.negaciones = negaciones
+
+    def suprimida_por(self, hecho):
+        """True si `hecho` invalida alguno de los NOT(...) de la regla."""
+        for clase, campos in self.negaciones:
+            if hecho.clase is clase and all(
+                    k in hecho.campos and hecho.campos[k] == v
+                    for k, v in campos.items()):
+                return True
+        return False
+
+
+def _textos(codigo):
+    """Cadenas constantes que aparecen en un objeto código y sus anidados."""
+    encontradas = []
+    pendientes = list(codigo.co_consts)
+    while pendientes:
+        c = pendientes.pop(0)
+        if isinstance(c, str):
+            if c not in encontradas:
+                encontradas.append(c)
+        elif isinstance(c, frozenset):
+            pendientes.extend(sorted(x for x in c if isinstance(x, str)))
+        elif isinstance(c, tuple):
+            pendientes.extend(c)
+        elif inspect.iscode(c):
+            pendientes.extend(c.co_consts)
+    return encontradas
+
+
+def _revisar_prueba(prueba, nombre):
+    """
+    Un TEST solo se tabula si todo lo que consulta está en su propio código:
+    sin variables de clausura, valores por omisión ni globales fuera de
+    GLOBALES_PERMITIDAS (sus síntomas no aparecerían entre las candidatas).
+    """
+    codigo = getattr(prueba, "__code__", None)
+    if codigo is None:
+        raise ReglasNoCompilables(f"{nombre}: TEST que no es una función")
+    if codigo.co_freevars or prueba.__defaults__ or prueba.__kwdefaults__:
+        raise ReglasNoCompilables(f"{nombre}: TEST que usa valores de fuera de la regla")
+    pendientes = [codigo]
+    while pendientes:
+        actual = pendientes.pop()
+        for instruccion in dis.get_instructions(actual):
+            if (instruccion.opname in ("LOAD_GLOBAL", "LOAD_NAME")
+                    and instruccion.argval not in GLOBALES_PERMITIDAS):
+                raise ReglasNoCompilables(
+                    f"{nombre}: TEST que usa el nombre global '{instruccion.argval}'")
+        pendientes.extend(c for c in actual.co_consts if inspect.iscode(c))
+
+
+def _textos_valor(valor):
+    """Cadenas contenidas en un valor (dict, lista, tupla...) de forma recursiva."""
+    if isinstance(valor, str):
+        return {valor}
+    if isinstance(valor, collections.abc.Mapping):
+        return set().union(*(_textos_valor(k) | _textos_valor(v) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return set().union(*(_textos_valor(v) for v in valor))
+    return set()
+
+
+def _kwargs(funcion, contexto):
+    parametros = inspect.signature(funcion).parameters
+    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parametros.values()):
+        return dict(contexto)
+    return {k: v for k, v in contexto.items() if k in parametros}
+
+
+def _quitar_bit(tabla, j):
+    bit = 1 << j
+    return [valor for i, valor in enumerate(tabla) if not i & bit]
+
+
+def _ejecutar_cuerpo(cuerpo, contexto, nombre):
+    """Ejecuta la parte derecha de una regla y devuelve los hechos que declara."""
+    grabador = _Grabador()
+    try:
+        cuerpo(grabador, **_kwargs(cuerpo, contexto))
+    except Exception as exc:
+        raise ReglasNoCompilables(
+            f"{nombre}: el cuerpo no se puede ejecutar fuera del motor ({exc})") from exc
+    return grabador.declarados
+
+
+def _tabular(predicado, candidatas, nombre):
+    """
+    Evalúa `predicado` sobre todos los subconjuntos de `candidatas` y descarta
+    las variables que no influyen en el resultado.
+    """
+    if len(candidatas) > LIMITE_VARIABLES:
+        raise ReglasNoCompilables(f"{nombre}: demasiados síntomas ({len(candidatas)})")
+
+    tabla = []
+    for i in range(1 << len(candidatas)):
+        conjunto = {c for j, c in enumerate(candidatas) if i >> j & 1}
+        valor = predicado(conjunto)
+        if any(valor != predicado(conjunto | ruido) for ruido in _CONJUNTOS_RUIDO):
+            raise ReglasNoCompilables(
+                f"{nombre}: el resultado depende de síntomas que la regla no nombra")
+        tabla.append(valor)
+
+    variables = list(candidatas)
+    j = 0
+    while j < len(variables):
+        bit = 1 << j
+        if all(tabla[i] == tabla[i ^ bit] for i in range(len(tabla))):
+            tabla = _quitar_bit(tabla, j)
+            variables.pop(j)
+        else:
+            j += 1
+    return variables, tabla
+
+
+def _analizar_regla(regla, cultivo_key):
+    """Extrae de una regla de experta sus predicados y los hechos que declara."""
+    nombre = regla.__name__
+    patrones = list(regla)
+    if not patrones or type(patrones[0]) is not Caso:
+        raise ReglasNoCompilables(f"{nombre}: la regla debe empezar por Caso(...)")
+
+    caso = patrones[0]
+    contexto_var = None
+    coincide_cultivo = True
+    for campo, valor in caso.items():
+        if Fact.is_special(campo):
+            continue
+        if campo == "cultivo" and isinstance(valor, str):
+            coincide_cultivo = valor == cultivo_key
+        elif campo == "sintomas" and isinstance(valor, W) and valor.__bind__:
+            contexto_var = valor.__bind__
+        else:
+            raise ReglasNoCompilables(f"{nombre}: patrón Caso no soportado ({campo})")
+
+    pruebas, negaciones = [], []
+    for patron in patrones[1:]:
+        if isinstance(patron, TEST):
+            pruebas.append(patron[0])
+        elif isinstance(patron, NOT) and len(patron) == 1 and isinstance(patron[0], Fact):
+            negado = patron[0]
+            campos = {k: v for k, v in negado.items() if not Fact.is_special(k)}
+            if negado.has_field_constraints() or any(not isinstance(k, str) for k in campos):
+                raise ReglasNoCompilables(f"{nombre}: NOT con restricciones no literales")
+            negaciones.append((type(negado), {k: freeze(v) for k, v in campos.items()}))
+        else:
+            raise ReglasNoCompilables(f"{nombre}: patrón no soportado {patron!r}")
+
+    if pruebas and contexto_var is None:
+        raise ReglasNoCompilables(f"{nombre}: TEST sin síntomas enlazados")
+    for prueba in pruebas:
+        _revisar_prueba(prueba, nombre)
+
+    def activa(conjunto):
+        if not coincide_cultivo:
+            return False
+        contexto = {contexto_var: conjunto} if contexto_var else {}
+        return all(p(**_kwargs(p, contexto)) for p in pruebas)
+
+    cuerpo = regla._wrapped
+    usa_sintomas = contexto_var is not None and contexto_var in _kwargs(
+        cuerpo, {contexto_var: None})
+    hechos_vistos = {}
+
+    def declara(conjunto):
+        contexto = {contexto_var: conjunto} if contexto_var else {}
+        hechos = tuple(HechoCompilado(h) for h in _ejecutar_cuerpo(cuerpo, contexto, nombre))
+        if hechos:
+            hechos_vistos[tuple(h.clave for h in hechos)] = hechos
+        return bool(hechos)
+
+    candidatas_act = []
+    for prueba in pruebas:
+        for texto in _textos(prueba.__code__):
+            if texto not in candidatas_act:
+                candidatas_act.append(texto)
+    activacion = _tabular(activa, candidatas_act, nombre)
+
+    candidatas_decl = []
+    if usa_sintomas:
+        # Las cadenas que acaban dentro de los hechos declarados (nombres de
+        # campo, plaga, recomendaciones...) son carga útil, no condiciones.
+        textos = _textos(cuerpo.__code__)
+        carga = set()
+        for conjunto in (set(textos), set()):
+            for hecho in _ejecutar_cuerpo(cuerpo, {contexto_var: conjunto}, nombre):
+                carga.update(_textos_valor(dict(hecho)))
+        candidatas_decl = [t for t in textos if t not in carga]
+    declaracion = _tabular(declara, candidatas_decl, nombre)
+
+    if len(hechos_vistos) > 1:
+        raise ReglasNoCompilables(f"{nombre}: el cuerpo declara hechos que dependen del caso")
+    hechos = next(iter(hechos_vistos.values()), ())
+    return nombre, regla.salience, activacion, declaracion, hechos, negaciones
+
+
+class MatcherCompilado:
+    """
+    Evalúa las reglas de un cultivo con operaciones sobre enteros.
+
+    Reproduce la agenda de experta (estrategia en profundidad, supresión por
+    NOT y la forma en que el motor retira activaciones) con el orden de disparo
+    que la red Rete tiene en este proceso, de modo que el resultado es el mismo
+    que daría `motor.run()`.
+    """
+
+    origen = "compilado"
+
+    def __init__(self, clase_reglas, cultivo_key):
+        self.clase_reglas = clase_reglas
+        self.cultivo_key = cultivo_key
+
+        motor = clase_reglas()
+        nodos = motor.matcher._get_conflict_set_nodes()
+        analizadas = [_analizar_regla(nodo.rule, cultivo_key) for nodo in nodos]
+
+        vocabulario = []
+        for _, _, (v_act, _), (v_decl, _), _, _ in analizadas:
+            for s in v_act + v_decl:
+                if s not in vocabulario:
+                    vocabulario.append(s)
+        self.vocabulario = tuple(sorted(vocabulario))
+        self.indice = {s: 1 << i for i, s in enumerate(self.vocabulario)}
+
+        self.reglas = tuple(
+            ReglaCompilada(nombre, salience,
+                           Condicion(*activacion, self.indice),
+                           Condicion(*declaracion, self.indice),
+                           hechos, negaciones)
+            for nombre, salience, activacion, declaracion, hechos, negaciones in analizadas)
+
+        # Orden inicial de la agenda: insort estable por salience sobre el
+        # orden de los nodos del conjunto conflicto; se dispara desde el final.
+        n = len(self.reglas)
+        self._orden_agenda = tuple(sorted(range(n), key=lambda i: self.reglas[i].salience))
+        self._salience = tuple(r.salience for r in self.reglas)
+
+        # Índice invertido: bit de síntoma -> reglas cuya activación lo nombra,
+        # como máscara sobre posiciones de `_orden_agenda`. Una regla que no
+        # nombra ningún síntoma del caso se activa igual que con el caso vacío,
+        # así que solo hace falta evaluar esas más las `_fijas` (las que se
+        # activan sin síntomas, como sin_diagnostico).
+        posicion = {i: p for p, i in enumerate(self._orden_agenda)}
+        self._por_sintoma = [0] * len(self.vocabulario)
+        self._fijas = 0
+        for i, regla in enumerate(self.reglas):
+            bit = 1 << posicion[i]
+            if regla.activacion.evaluar(0):
+                self._fijas |= bit
+            for s in regla.activacion.variables:
+                self._por_sintoma[self.indice[s].bit_length() - 1] |= bit
+
+        # Para cada hecho declarable: reglas (en orden de nodo) que suprime
+        self._suprime = {}
+        for regla in self.reglas:
+            for hecho in regla.hechos:
+                self._suprime[hecho.clave] = frozenset(
+                    q for q in range(n) if self.reglas[q].suprimida_por(hecho))
+
+    def mascara(self, sintomas):
+        m = 0
+        indice = self.indice
+        for s in sintomas:
+            m |= indice.get(s, 0)
+        return m
+
+    def _candidatas(self, m):
+        """Máscara (sobre posiciones de la agenda) de las reglas a evaluar para `m`."""
+        c = self._fijas
+        por_sintoma = self._por_sintoma
+        while m:
+            b = m & -m
+            c |= por_sintoma[b.bit_length() - 1]
+            m ^= b
+        return c
+
+    def _nombres(self, mascara):
+        orden = self._orden_agenda
+        return [self.reglas[orden[p]].nombre for p in range(len(orden)) if mascara >> p & 1]
+
+    @property
+    def indice_reglas(self):
+        """Síntoma -> nombres de las reglas cuya activación lo nombra."""
+        return {s: self._nombres(self._por_sintoma[self.indice[s].bit_length() - 1])
+                for s in self.vocabulario}
+
+    @property
+    def reglas_fijas(self):
+        """Reglas que se evalúan en todo caso (se activan sin ningún síntoma)."""
+        return self._nombres(self._fijas)
+
+    def candidatas(self, sintomas):
+        """Nombres de las reglas que se evalúan para `sintomas`, en orden de agenda."""
+        return self._nombres(self._candidatas(self.mascara(sintomas)))
+
+    def _quitar(self, agenda, q):
+        """Copia de DepthStrategy._update_agenda: solo mira idx, idx+1 e idx-1."""
+        claves = [self._salience[j] for j in agenda]
+        idx = bisect.bisect_left(claves, self._salience[q])
+        for o in (0, 1, -1):
+            try:
+                if agenda[idx + o] == q:
+                    del agenda[idx + o]
+                else:
+                    continue
+            except IndexError:
+                pass
+            else:
+                break
+
+    def disparar(self, activa, declara, conteos=None, candidatas=None):
+        """
+        Ejecuta la agenda dadas las reglas activadas.
+
+        `activa(i)` dice si la regla i entra en la agenda y `declara(i)` si su
+        cuerpo declara sus hechos. Devuelve pares (regla, hecho) en orden de
+        declaración. Si se pasa `conteos`, suma ahí las reglas que entraron a
+        la agenda y las que se dispararon. Con `candidatas` (máscara de
+        `_candidatas`) solo se consulta `activa` para esas reglas.
+        """
+        reglas = self.reglas
+        orden = self._orden_agenda
+        if candidatas is None:
+            agenda = [i for i in orden if activa(i)]
+        else:
+            agenda = []
+            base = 0
+            while candidatas:
+                for p in _BITS_BYTE[candidatas & 0xFF]:
+                    i = orden[base + p]
+                    if activa(i):
+                        agenda.append(i)
+                candidatas >>= 8
+                base += 8
+        validas = set(agenda)
+        declarados = set()
+        disparos = []
+        coincidentes, disparadas = len(agenda), 0
+
+        while agenda:
+            i = agenda.pop()
+            disparadas += 1
+            regla = reglas[i]
+            if not regla.hechos or not declara(i):
+                continue
+            invalidas = set()
+            for hecho in regla.hechos:
+                if hecho.clave in declarados:
+                    continue
+                declarados.add(hecho.clave)
+                disparos.append((i, hecho))
+                invalidas |= self._suprime[hecho.clave]
+            invalidas &= validas
+            for q in sorted(invalidas):
+                validas.discard(q)
+                self._quitar(agenda, q)
+
+        if conteos is not None:
+            conteos["reglas_coincidentes"] += coincidentes
+            conteos["activaciones_disparadas"] += disparadas
+        return disparos
+
+    def declarados(self, sintomas, conteos=None):
+        """HechoCompilado declarados para `sintomas`, en orden de declaración."""
+        m = self.mascara(sintomas)
+        reglas = self.reglas
+        disparos = self.disparar(lambda i: reglas[i].activacion.evaluar(m),
+                                 lambda i: reglas[i].declaracion.evaluar(m), conteos,
+                                 self._candidatas(m))
+        return [hecho for _, hecho in disparos]
+
+    def evaluar(self, sintomas, conteos=None):
+        """Devuelve los hechos declarados, en orden de declaración."""
+        # InitialFact ocupa f-0 y el Caso f-1
+        return [hecho.crear(i) for i, hecho in enumerate(self.declarados(sintomas, conteos), start=2)]
+
+
+_MATCHERS = {}
+_LOCK = threading.Lock()
+
+
+def obtener_matcher(clase_reglas, cultivo_key):
+    """
+    Devuelve el matcher compilado de un cultivo (se construye una sola vez por
+    proceso) o None si sus reglas no se pueden compilar.
+    """
+    clave = (clase_reglas, cultivo_key)
+    try:
+        return _MATCHERS[clave]
+    except KeyError:
+        pass
+    with _LOCK:
+        if clave not in _MATCHERS:
+            try:
+                _MATCHERS[clave] = MatcherCompilado(clase_reglas, cultivo_key)
+            except ReglasNoCompilables:
+                _MATCHERS[clave] = None
+        return _MATCHERS[clave]
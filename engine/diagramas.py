@@ -0,0 +1,324 @@
+import math
+import threading
+from itertools import product
+
+from engine.compilado import obtener_matcher
+from engine.tablas import firma_reglas
+
+# Combinaciones de hojas que se resuelven al construir (y tope de las que se
+# guardan después, a medida que aparecen)
+LIMITE_RESUELTOS = 1 << 15
+
+
+def _grupos(reglas):
+    """Reglas agrupadas por síntomas compartidos: (síntomas, índices de reglas)."""
+    padre = {}
+
+    def raiz(s):
+        while padre.setdefault(s, s) != s:
+            s = padre[s]
+        return s
+
+    for regla in reglas:
+        variables = regla.activacion.variables + regla.declaracion.variables
+        for s in variables:
+            padre[raiz(s)] = raiz(variables[0])
+
+    # Los síntomas, en orden de aparición recorriendo las reglas por nombre
+    # (el orden de `reglas` cambia entre procesos)
+    grupos = {}
+    for i, regla in sorted(enumerate(reglas), key=lambda par: par[1].nombre):
+        variables = regla.activacion.variables + regla.declaracion.variables
+        if variables:
+            sintomas, indices = grupos.setdefault(raiz(variables[0]), ([], []))
+            indices.append(i)
+            for s in variables:
+                if s not in sintomas:
+                    sintomas.append(s)
+    return [(sintomas, sorted(indices)) for sintomas, indices in grupos.values()]
+
+
+def _residuo(condicion, fijada, pendientes):
+    """Tabla de `condicion` sobre los bits aún sin fijar (o True/False si ya no depende de ellos)."""
+    valores = []
+    for sub in range(1 << len(pendientes)):
+        m = fijada
+        for j, b in enumerate(pendientes):
+            if sub >> j & 1:
+                m |= b
+        valores.append(bool(condicion.evaluar(m)))
+    if all(valores):
+        return True
+    if not any(valores):
+        return False
+    return tuple(valores)
+
+
+class _Constructor:
+    """Arma los nodos del diagrama de un grupo, compartiendo nodos y hojas iguales."""
+
+    def __init__(self, variables, bajo, alto, hojas, ids_hojas):
+        self.variables, self.bajo, self.alto = variables, bajo, alto
+        self.hojas, self.ids_hojas = hojas, ids_hojas
+        self.unicos = {}
+
+    def hoja(self, act, decl):
+        clave = (act, decl & act)
+        if clave not in self.ids_hojas:
+            self.ids_hojas[clave] = len(self.hojas)
+            self.hojas.append(clave)
+        return ~self.ids_hojas[clave]
+
+    def nodo(self, sintoma, bajo, alto):
+        if bajo == alto:
+            return bajo
+        clave = (sintoma, bajo, alto)
+        if clave not in self.unicos:
+            self.unicos[clave] = len(self.variables)
+            self.variables.append(sintoma)
+            self.bajo.append(bajo)
+            self.alto.append(alto)
+        return self.unicos[clave]
+
+    def grupo(self, matcher, orden, indices):
+        """Raíz del diagrama de las reglas `indices` con los síntomas en `orden`."""
+        bits = [matcher.indice[s] for s in orden]
+        condiciones = [(i, c) for i in indices
+                       for c in (matcher.reglas[i].activacion, matcher.reglas[i].declaracion)]
+        propios = [sum(c.bits) for _, c in condiciones]
+        # Lo que resta de una condición solo depende de sus propios síntomas ya fijados
+        residuos = {}
+        memo = {}
+
+        def residuo(k, nivel, m):
+            clave = (k, nivel, m & propios[k])
+            if clave not in residuos:
+                c = condiciones[k][1]
+                residuos[clave] = _residuo(c, clave[2], [b for b in bits[nivel:] if b in c.bits])
+            return residuos[clave]
+
+        def armar(nivel, m):
+            estado = tuple(residuo(k, nivel, m) for k in range(len(condiciones)))
+            clave = (nivel, estado)
+            if clave in memo:
+                return memo[clave]
+            if nivel == len(bits):
+                act = decl = 0
+                for k in range(0, len(estado), 2):
+                    i = condiciones[k][0]
+                    act |= estado[k] << i
+                    decl |= estado[k + 1] << i
+                memo[clave] = self.hoja(act, decl)
+            else:
+                memo[clave] = self.nodo(orden[nivel], armar(nivel + 1, m),
+                                        armar(nivel + 1, m | bits[nivel]))
+            return memo[clave]
+
+        return armar(0, 0)
+
+
+class DiagramaCultivo:
+    """
+    Reglas de un cultivo como diagramas de decisión reducidos y ordenados.
+
+    Hay un diagrama por grupo de reglas que comparten síntomas; cada nodo
+    pregunta por un síntoma (`variables[n]`) y sigue por `alto[n]` si está
+    o por `bajo[n]` si no, hasta una hoja (referencia negativa, `~hoja`) con
+    las reglas del grupo que se activan y las que declaran. Un caso recorre
+    solo los grupos de sus síntomas, con a lo sumo una pregunta por síntoma.
+
+    La agenda de experta relaciona a todas las reglas activas del cultivo
+    (supresiones por NOT y cómo se retiran activaciones), así que las hojas
+    de los grupos se combinan y esa combinación se resuelve una vez en
+    `resueltos`: hechos declarados y conteos del motor.
+    """
+
+    origen = "diagrama"
+
+    def __init__(self, matcher, firma, limite=LIMITE_RESUELTOS):
+        self.clase_reglas = matcher.clase_reglas
+        self.cultivo_key = matcher.cultivo_key
+        self.firma = firma
+        self.limite = limite
+        self._matcher = matcher
+        self.n_reglas = len(matcher.reglas)
+        self.variables, self.bajo, self.alto = [], [], []
+        self.hojas, ids_hojas = [], {}
+        constructor = _Constructor(self.variables, self.bajo, self.alto, self.hojas, ids_hojas)
+
+        # Reglas que no nombran síntomas: se activan (o no) siempre igual
+        self.fijas = 0
+        for i, regla in enumerate(matcher.reglas):
+            if not regla.activacion.variables and not regla.declaracion.variables:
+                if regla.activacion.evaluar(0):
+                    self.fijas |= 1 << i
+        self.fijas_decl = sum(1 << i for i, r in enumerate(matcher.reglas)
+                              if self.fijas >> i & 1 and r.declaracion.evaluar(0))
+
+        self.raices, self.mascaras, self.sintomas_grupo = [], [], []
+        for sintomas, indices in _grupos(matcher.reglas):
+            mejor = None
+            # Órdenes candidatos: aparición en las reglas, alfabético y los
+            # síntomas que más reglas nombran primero
+            usos = {s: sum(s in matcher.reglas[i].activacion.variables for i in indices)
+                    for s in sintomas}
+            for orden in (sintomas, sorted(sintomas), sorted(sintomas, key=lambda s: -usos[s])):
+                prueba = _Constructor([], [], [], self.hojas, ids_hojas)
+                raiz = prueba.grupo(matcher, orden, indices)
+                if mejor is None or len(prueba.variables) < len(mejor[1]):
+                    mejor = (orden, prueba.variables, raiz)
+            raiz = constructor.grupo(matcher, mejor[0], indices)
+            self.raices.append(raiz)
+            self.mascaras.append(sum(1 << i for i in indices))
+            self.sintomas_grupo.append(tuple(mejor[0]))
+        # Las pruebas de orden pudieron dejar hojas que ningún grupo usa
+        self._compactar_hojas()
+
+        self.grupo_de = {s: g for g, sintomas in enumerate(self.sintomas_grupo) for s in sintomas}
+        self.vocabulario = tuple(sorted(self.grupo_de))
+        # Caso sin síntomas: cada grupo en su hoja "nada presente"
+        self.base = self._recorrer_todos(frozenset())
+
+        self.resueltos = {}
+        hojas_por_grupo = [self._hojas_de(r) for r in self.raices]
+        if math.prod(len(h) for h in hojas_por_grupo) <= limite:
+            for combinacion in product(*hojas_por_grupo):
+                act, decl = self.fijas, self.fijas_decl
+                for a, d in combinacion:
+                    act |= a
+                    decl |= d
+                self._resolver(act, decl)
+
+    def _compactar_hojas(self):
+        usadas = sorted({~r for r in self.raices if r < 0}
+                        | {~h for h in self.bajo + self.alto if h < 0})
+        nuevo = {viejo: nuevo for nuevo, viejo in enumerate(usadas)}
+
+        def mover(ref):
+            return ~nuevo[~ref] if ref < 0 else ref
+
+        self.hojas[:] = [self.hojas[h] for h in usadas]
+        self.bajo[:] = [mover(r) for r in self.bajo]
+        self.alto[:] = [mover(r) for r in self.alto]
+        self.raices = [mover(r) for r in self.raices]
+
+    def _hojas_de(self, raiz):
+        vistas, pendientes = set(), [raiz]
+        while pendientes:
+            n = pendientes.pop()
+            if n < 0:
+                vistas.add(~n)
+            else:
+                pendientes += [self.bajo[n], self.alto[n]]
+        return [self.hojas[h] for h in sorted(vistas)]
+
+    def _hoja(self, raiz, s):
+        n = raiz
+        variables, bajo, alto = self.variables, self.bajo, self.alto
+        while n >= 0:
+            n = alto[n] if variables[n] in s else bajo[n]
+        return self.hojas[~n]
+
+    def _recorrer_todos(self, s):
+        act, decl = self.fijas, self.fijas_decl
+        for raiz in self.raices:
+            a, d = self._hoja(raiz, s)
+            act |= a
+            decl |= d
+        return act, decl
+
+    def _resolver(self, act, decl):
+        clave = act | (decl & act) << self.n_reglas
+        guardado = self.resueltos.get(clave)
+        if guardado is not None:
+            return guardado
+        conteos = {"reglas_coincidentes": 0, "activaciones_disparadas": 0}
+        disparos = self._matcher.disparar(lambda i: act >> i & 1, lambda i: decl >> i & 1, conteos)
+        resuelto = (tuple(hecho for _, hecho in disparos),
+                    conteos["reglas_coincidentes"], conteos["activaciones_disparadas"])
+        if len(self.resueltos) < self.limite:
+            self.resueltos[clave] = resuelto
+        return resuelto
+
+    def activadas(self, sintomas):
+        """(reglas activadas, reglas que declaran) como máscaras sobre el orden del matcher."""
+        s = sintomas if isinstance(sintomas, (set, frozenset)) else set(sintomas)
+        act, decl = self.base
+        grupo_de, raices, mascaras = self.grupo_de, self.raices, self.mascaras
+        vistos = set()
+        for sintoma in s:
+            g = grupo_de.get(sintoma)
+            if g is None or g in vistos:
+                continue
+            vistos.add(g)
+            a, d = self._hoja(raices[g], s)
+            act = act & ~mascaras[g] | a
+            decl = decl & ~mascaras[g] | d
+        return act, decl
+
+    def declarados(self, sintomas, conteos=None):
+        """HechoCompilado declarados para `sintomas`, en orden de declaración."""
+        hechos, coincidentes, disparadas = self._resolver(*self.activadas(sintomas))
+        if conteos is not None:
+            conteos["reglas_coincidentes"] += coincidentes
+            conteos["activaciones_disparadas"] += disparadas
+        return hechos
+
+    def hechos(self, sintomas):
+        """Hechos declarados para `sintomas`, como los devolvería el motor."""
+        # InitialFact ocupa f-0 y el Caso f-1
+        return [hecho.crear(i) for i, hecho in enumerate(self.declarados(sintomas), start=2)]
+
+    @property
+    def nodos(self):
+        return len(self.variables)
+
+    def _profundidad(self, n, memo):
+        if n < 0:
+            return 0
+        if n not in memo:
+            memo[n] = 1 + max(self._profundidad(self.bajo[n], memo),
+                              self._profundidad(self.alto[n], memo))
+        return memo[n]
+
+    def estadisticas(self):
+        memo = {}
+        return {
+            "sintomas": len(self.vocabulario),
+            "grupos": len(self.raices),
+            "nodos": self.nodos,
+            "hojas": len(self.hojas),
+            "resueltos": len(self.resueltos),
+            # Preguntas del peor caso, sumando todos los grupos
+            "camino_maximo": sum(self._profundidad(r, memo) for r in self.raices),
+        }
+
+
+def construir_diagrama(clase_reglas, cultivo_key, limite: int = LIMITE_RESUELTOS):
+    """Diagrama del cultivo, o None si sus reglas no se pueden compilar."""
+    matcher = obtener_matcher(clase_reglas, cultivo_key)
+    if matcher is None:
+        return None
+    firma = firma_reglas(clase_reglas, [r.nombre for r in matcher.reglas])
+    return DiagramaCultivo(matcher, firma, limite)
+
+
+_DIAGRAMAS = {}
+_LOCK = threading.Lock()
+
+
+def obtener_diagrama(clase_reglas, cultivo_key):
+    """
+    Diagrama del cultivo para este proceso (se arma una vez) o None si no
+    compila. Como las tablas, no se guarda en disco: `resueltos` sigue el
+    orden de disparo de experta de este proceso, que cambia en cada arranque.
+    """
+    clave = (clase_reglas, cultivo_key)
+    try:
+        return _DIAGRAMAS[clave]
+    except KeyError:
+        pass
+    with _LOCK:
+        if clave not in _DIAGRAMAS:
+            _DIAGRAMAS[clave] = construir_diagrama(clase_reglas, cultivo_key)
+        return _DIAGRAMAS[clave]
@@ -0,0 +1,302 @@
+"""
+Verificación diferencial: cada backend rápido contra experta.
+
+    python -m engine.equivalencia
+    python -m engine.equivalencia uva limon --backends compilado diagrama --muestras 200000
+
+Por cultivo recorre todas las combinaciones de síntomas que nombran sus
+reglas (los que declara el registro y los textos del código de las reglas,
+sin pasar por el compilador para no heredar sus puntos ciegos) cuando son
+pocas (hasta LIMITE_ENUMERAR síntomas) y si no una muestra: casos borde
+(vacío, todo, cada síntoma y cada par, las condiciones de cada regla con y
+sin uno de sus síntomas) más casos al azar. Cada trabajador diagnostica con experta y con los demás backends en
+su propio proceso (el orden de disparo de experta es el de ese proceso) y
+reduce cada diferencia a un contraejemplo mínimo. Sale con código 1 si
+algún backend difiere y con 2 si algún cultivo quedó sin verificar (sus
+reglas no compilan: los backends rápidos caen a experta).
+"""
+import argparse
+import ast
+import inspect
+import json
+import os
+import random
+import sys
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS, BACKENDS, POOL_MOTORES
+from engine.compilado import MatcherCompilado, ReglasNoCompilables, obtener_matcher
+from engine.registro import REGISTRO
+
+# Cultivos con hasta estos síntomas se verifican con todas sus combinaciones
+LIMITE_ENUMERAR = 18
+
+# Casos al azar por cultivo cuando no se enumeran
+MUESTRAS = 1_000_000
+
+TAMANO_TROZO = 2000
+
+# Síntoma que ninguna regla nombra, para casos con ruido
+DESCONOCIDO = "sintoma_desconocido"
+
+# Sistemas de cada proceso trabajador (los crea _iniciar_trabajador)
+_SISTEMAS = None
+
+
+def _iniciar_trabajador(backends):
+    global _SISTEMAS
+    _SISTEMAS = {b: SistemaExpertoPlagas(backend=b) for b in ("experta",) + tuple(backends)}
+    POOL_MOTORES.calentar()
+
+
+def casos_borde(vocabulario, reglas=()):
+    """Vacío, todo, cada síntoma, cada par y la condición de cada regla con y sin uno de sus síntomas."""
+    casos = [[], list(vocabulario), list(vocabulario) + [DESCONOCIDO]]
+    casos += [[s] for s in vocabulario]
+    casos += [list(par) for par in combinations(vocabulario, 2)]
+    for regla in reglas:
+        variables = list(regla.activacion.variables)
+        if variables:
+            casos.append(variables)
+            casos += [variables[:j] + variables[j + 1:] for j in range(len(variables))]
+    return casos
+
+
+def _muestras(vocabulario, semilla, n):
+    rng = random.Random(semilla)
+    total = len(vocabulario)
+    for _ in range(n):
+        tirada = rng.random()
+        if tirada < 0.7:
+            sintomas = rng.sample(vocabulario, rng.randint(1, min(8, total)))
+        elif tirada < 0.85:
+            sintomas = rng.sample(vocabulario, total - rng.randint(0, min(4, total)))
+        else:
+            sintomas = [s for s in vocabulario if rng.random() < 0.5]
+        if rng.random() < 0.1:
+            sintomas.append(DESCONOCIDO)
+        yield sintomas
+
+
+def _casos(vocabulario, trozo):
+    tipo, a, b = trozo
+    if tipo == "todas":
+        for m in range(a, b):
+            yield [s for i, s in enumerate(vocabulario) if m >> i & 1]
+    elif tipo == "muestras":
+        yield from _muestras(vocabulario, a, b)
+    else:
+        yield from a
+
+
+def _difieren(cultivo, backend, sintomas):
+    return (_SISTEMAS[backend].diagnosticar(cultivo, sintomas)
+            != _SISTEMAS["experta"].diagnosticar(cultivo, sintomas))
+
+
+def minimizar(cultivo, backend, sintomas):
+    """Quita síntomas de a uno mientras la diferencia siga: ninguno del resultado sobra."""
+    actual = list(dict.fromkeys(sintomas))
+    cambio = True
+    while cambio:
+        cambio = False
+        for s in list(actual):
+            prueba = [x for x in actual if x != s]
+            if _difieren(cultivo, backend, prueba):
+                actual = prueba
+                cambio = True
+    return actual
+
+
+def _divergencia(cultivo, backend, indice, sintomas):
+    minimo = minimizar(cultivo, backend, sintomas)
+    return {
+        "backend": backend,
+        "indice": indice,
+        "sintomas": list(sintomas),
+        "minimo": minimo,
+        "experta": _SISTEMAS["experta"].diagnosticar(cultivo, minimo)["reglas_activadas"],
+        "obtenido": _SISTEMAS[backend].diagnosticar(cultivo, minimo)["reglas_activadas"],
+    }
+
+
+def _comparar_trozo(cultivo, vocabulario, desde, trozo, maximo):
+    """Compara un trozo de casos; devuelve (casos, segundos, divergencias)."""
+    inicio = time.perf_counter()
+    experta = _SISTEMAS["experta"]
+    otros = [(b, s) for b, s in _SISTEMAS.items() if b != "experta"]
+    encontradas = {b: 0 for b, _ in otros}
+    divergencias = []
+    n = 0
+    for n, sintomas in enumerate(_casos(vocabulario, trozo), start=1):
+        esperado = experta.diagnosticar(cultivo, sintomas)
+        for backend, sistema in otros:
+            if encontradas[backend] < maximo and sistema.diagnosticar(cultivo, sintomas) != esperado:
+                encontradas[backend] += 1
+                divergencias.append(_divergencia(cultivo, backend, desde + n - 1, sintomas))
+    return n, time.perf_counter() - inicio, divergencias
+
+
+def _textos_de_reglas(clase):
+    """
+    Textos del código fuente de la clase de reglas y de las constantes del
+    módulo que nombra (p. ej. GRAVES = {...} usada en un TEST). Vacío si no
+    hay fuente, como en las clases generadas de las bases declarativas.
+    """
+    try:
+        arbol = ast.parse(textwrap.dedent(inspect.getsource(clase)))
+    except (OSError, TypeError, SyntaxError):
+        return set()
+    globales = vars(sys.modules[clase.__module__]) if clase.__module__ in sys.modules else {}
+    textos = set()
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Constant) and isinstance(nodo.value, str):
+            textos.add(nodo.value)
+        elif isinstance(nodo, ast.Name) and nodo.id in globales:
+            valor = globales[nodo.id]
+            if isinstance(valor, str):
+                textos.add(valor)
+            elif isinstance(valor, (set, frozenset, list, tuple)):
+                textos.update(v for v in valor if isinstance(v, str))
+    return textos
+
+
+def vocabulario_de(cultivo):
+    """
+    Síntomas a combinar para un cultivo, armados sin el compilador: los que
+    declara el registro más los textos de sus reglas con forma de síntoma
+    (identificador en minúsculas que no es el cultivo ni el nombre de una
+    regla), más los que reconoce el matcher compilado si lo hay.
+    """
+    clase = MAPA_CULTIVOS[cultivo]
+    propios = set(vars(clase)) | {cultivo}
+    vocabulario = set(REGISTRO.entrada(cultivo).sintomas or ())
+    vocabulario.update(t for t in _textos_de_reglas(clase)
+                       if t.isidentifier() and t == t.lower() and t not in propios)
+    matcher = obtener_matcher(clase, cultivo)
+    if matcher is not None:
+        vocabulario.update(matcher.vocabulario)
+    return sorted(vocabulario)
+
+
+def _motivo_sin_compilar(cultivo):
+    try:
+        MatcherCompilado(MAPA_CULTIVOS[cultivo], cultivo)
+    except ReglasNoCompilables as e:
+        return str(e)
+    return None
+
+
+def _plan(cultivo, muestras, limite, semilla, tamano):
+    """(modo, vocabulario, trozos) de un cultivo; cada trozo es (desde, descripción)."""
+    vocabulario = vocabulario_de(cultivo)
+    matcher = obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo)
+    if matcher is None:
+        return "sin_compilar", vocabulario, []
+    if len(vocabulario) <= limite:
+        total = 1 << len(vocabulario)
+        return "todas", vocabulario, [(a, ("todas", a, min(a + tamano, total)))
+                                      for a in range(0, total, tamano)]
+
+    borde = casos_borde(vocabulario, matcher.reglas)
+    trozos = [(a, ("lista", borde[a:a + tamano], None)) for a in range(0, len(borde), tamano)]
+    for k, a in enumerate(range(0, muestras, tamano)):
+        trozos.append((len(borde) + a, ("muestras", f"{semilla}-{cultivo}-{k}", min(tamano, muestras - a))))
+    return "muestras", vocabulario, trozos
+
+
+def verificar(cultivos=None, backends=None, procesos: int = None, muestras: int = MUESTRAS,
+              limite: int = LIMITE_ENUMERAR, semilla: int = 0, maximo: int = 3,
+              tamano_trozo: int = TAMANO_TROZO):
+    """
+    Corre la verificación y devuelve, por cultivo, el modo ("todas",
+    "muestras" o "sin_compilar"), si quedó verificado, los casos comparados,
+    los segundos de trabajo y las primeras `maximo` divergencias de cada
+    backend, en orden de caso. Un cultivo "sin_compilar" no se compara (sus
+    backends rápidos son experta) y lleva en `motivo` por qué no compila.
+    """
+    cultivos = [c for c in (cultivos or MAPA_CULTIVOS) if c in MAPA_CULTIVOS]
+    backends = tuple(backends or (b for b in BACKENDS if b != "experta"))
+    procesos = procesos or os.cpu_count() or 1
+
+    informe, tareas = {}, []
+    for cultivo in cultivos:
+        modo, vocabulario, trozos = _plan(cultivo, muestras, limite, semilla, tamano_trozo)
+        informe[cultivo] = {"modo": modo, "verificado": modo != "sin_compilar",
+                            "motivo": _motivo_sin_compilar(cultivo) if modo == "sin_compilar" else None,
+                            "sintomas": len(vocabulario), "casos": 0,
+                            "segundos": 0.0, "divergencias": []}
+        tareas += [(cultivo, vocabulario, desde, trozo, maximo) for desde, trozo in trozos]
+
+    def anotar(cultivo, resultado):
+        casos, segundos, divergencias = resultado
+        informe[cultivo]["casos"] += casos
+        informe[cultivo]["segundos"] += segundos
+        informe[cultivo]["divergencias"] += divergencias
+
+    inicio = time.perf_counter()
+    if procesos == 1:
+        _iniciar_trabajador(backends)
+        for tarea in tareas:
+            anotar(tarea[0], _comparar_trozo(*tarea))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(backends,)) as executor:
+            futuros = {executor.submit(_comparar_trozo, *tarea): tarea[0] for tarea in tareas}
+            for futuro in as_completed(futuros):
+                anotar(futuros[futuro], futuro.result())
+
+    for datos in informe.values():
+        primeras = []
+        for backend in backends:
+            propias = sorted((d for d in datos["divergencias"] if d["backend"] == backend),
+                             key=lambda d: d["indice"])
+            primeras += propias[:maximo]
+        datos["divergencias"] = primeras
+    return {"procesos": procesos, "backends": list(backends),
+            "segundos": time.perf_counter() - inicio, "cultivos": informe}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cultivos", nargs="*", help="por defecto, todos")
+    parser.add_argument("--backends", nargs="+", choices=[b for b in BACKENDS if b != "experta"])
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--muestras", type=int, default=MUESTRAS)
+    parser.add_argument("--limite", type=int, default=LIMITE_ENUMERAR,
+                        help="máximo de síntomas para probar todas las combinaciones")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--maximo", type=int, default=3, help="divergencias a informar por backend")
+    parser.add_argument("--salida", help="guarda el informe completo en JSON")
+    args = parser.parse_args(argv)
+
+    informe = verificar(args.cultivos, args.backends, args.procesos, args.muestras,
+                        args.limite, args.semilla, args.maximo)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, ensure_ascii=False, indent=2)
+
+    diferencias = sin_verificar = 0
+    for cultivo, datos in informe["cultivos"].items():
+        if not datos["verificado"]:
+            sin_verificar += 1
+            print(f"{cultivo}: SIN VERIFICAR, sus reglas no compilan ({datos['motivo']})")
+            continue
+        print(f"{cultivo}: {datos['casos']} casos ({datos['modo']}, {datos['sintomas']} síntomas), "
+              f"{datos['segundos']:.1f} s de trabajo, {len(datos['divergencias'])} divergencias")
+        for d in datos["divergencias"]:
+            diferencias += 1
+            print(f"  {d['backend']} difiere en el caso {d['indice']}: mínimo {d['minimo']}\n"
+                  f"    experta:  {d['experta']}\n    {d['backend']}: {d['obtenido']}")
+    print(f"{informe['segundos']:.1f} s con {informe['procesos']} procesos")
+    if diferencias:
+        return 1
+    return 2 if sin_verificar else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
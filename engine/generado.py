@@ -0,0 +1,314 @@
+import hashlib
+import importlib.util
+import inspect
+import os
+import re
+import sys
+import threading
+import types
+
+from engine.compilado import obtener_matcher
+
+# Cambia cuando cambia el código que se genera: invalida los módulos en disco
+VERSION_GENERADOR = 1
+
+# Directorio de los módulos generados (por defecto, __pycache__/generados en engine/)
+DIRECTORIO_GENERADOS = os.environ.get("PLAGAS_GENERADOS")
+
+
+def huella_reglas(clase_reglas, cultivo_key):
+    """Hash del archivo de reglas (la base de conocimiento) y de lo que se genera."""
+    try:
+        with open(inspect.getsourcefile(clase_reglas), "rb") as f:
+            contenido = f.read()
+    except (TypeError, OSError):
+        return None
+    h = hashlib.sha256(contenido)
+    h.update(f"\0{clase_reglas.__module__}:{clase_reglas.__qualname__}"
+             f"\0{cultivo_key}\0{VERSION_GENERADOR}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class _Constantes:
+    """frozensets del módulo generado, uno por conjunto distinto de síntomas."""
+
+    def __init__(self):
+        self.nombres = {}
+
+    def __call__(self, sintomas):
+        clave = tuple(sorted(sintomas))
+        if clave not in self.nombres:
+            self.nombres[clave] = f"_C{len(self.nombres)}"
+        return self.nombres[clave]
+
+    def lineas(self):
+        return [f"{nombre} = frozenset({{{', '.join(map(repr, clave))}}})"
+                for clave, nombre in self.nombres.items()]
+
+
+def _sintomas(matcher, mascara):
+    return [s for s in matcher.vocabulario if matcher.indice[s] & mascara]
+
+
+def _pruebas(matcher, condicion, constantes, tablas):
+    """
+    (síntoma guía, expresión) de una Condicion: la guía es un síntoma
+    requerido por el que conviene preguntar primero (None si no hay), y la
+    expresión lo que falta comprobar ("True" si nada).
+    """
+    if condicion.forma == "siempre":
+        return None, "True"
+    if condicion.forma == "tabla":
+        indice = " | ".join(f"({v!r} in s) << {j}" if j else f"({v!r} in s)"
+                            for j, v in enumerate(condicion.variables))
+        nombre = f"_T{len(tablas)}"
+        tablas.append(f"{nombre} = {tuple(bool(x) for x in condicion.tabla)!r}")
+        return None, f"{nombre}[{indice}]"
+
+    requeridos = _sintomas(matcher, condicion.requeridos)
+    grupo = _sintomas(matcher, condicion.grupo)
+    prohibidos = _sintomas(matcher, condicion.prohibidos)
+    guia = requeridos[0] if requeridos else None
+    partes = []
+    resto = requeridos[1:]
+    if len(resto) == 1:
+        partes.append(f"{resto[0]!r} in s")
+    elif resto:
+        partes.append(f"{constantes(resto)} <= s")
+    if grupo and condicion.minimo:
+        if condicion.minimo == 1:
+            partes.append(f"not s.isdisjoint({constantes(grupo)})")
+        else:
+            partes.append(f"len({constantes(grupo)} & s) >= {condicion.minimo}")
+    if len(prohibidos) == 1:
+        partes.append(f"{prohibidos[0]!r} not in s")
+    elif prohibidos:
+        partes.append(f"s.isdisjoint({constantes(prohibidos)})")
+    return guia, " and ".join(partes) or "True"
+
+
+def _orden_definicion(clase_reglas, matcher):
+    definidas = [n for n, v in vars(clase_reglas).items() if hasattr(v, "_wrapped")]
+    posicion = {n: i for i, n in enumerate(definidas)}
+    return sorted(matcher.reglas, key=lambda r: (posicion.get(r.nombre, len(posicion)), r.nombre))
+
+
+def generar_fuente(clase_reglas, cultivo_key, matcher=None, huella=None):
+    """
+    Código del módulo especializado de un cultivo.
+
+    `crear(bits)` recibe el bit de cada regla de REGLAS y devuelve
+    `activas(s)`, que con pruebas de conjuntos en línea calcula qué reglas
+    se activan y cuáles declaran sus hechos. Las reglas que comparten un
+    síntoma requerido quedan bajo un mismo `if` para cortar antes.
+    """
+    matcher = matcher or obtener_matcher(clase_reglas, cultivo_key)
+    reglas = _orden_definicion(clase_reglas, matcher)
+    constantes, tablas = _Constantes(), []
+
+    fijas_act, fijas_decl = [], []
+    por_guia, sueltas, declaraciones = {}, [], []
+    for j, regla in enumerate(reglas):
+        if regla.activacion.forma == "nunca":
+            continue
+        guia, expresion = _pruebas(matcher, regla.activacion, constantes, tablas)
+        if guia is None and expresion == "True":
+            fijas_act.append(j)
+        elif guia is None:
+            sueltas.append((expresion, j))
+        else:
+            por_guia.setdefault(guia, []).append((expresion, j))
+        if regla.declaracion.forma == "siempre":
+            fijas_decl.append(j)
+        elif regla.declaracion.forma != "nunca":
+            guia, expresion = _pruebas(matcher, regla.declaracion, constantes, tablas)
+            if guia is not None:
+                expresion = f"{guia!r} in s and {expresion}"
+            declaraciones.append((expresion, j))
+
+    def mascara(indices):
+        return " | ".join(f"b{j}" for j in indices) or "0"
+
+    cuerpo = []
+    for guia, pruebas in por_guia.items():
+        if len(pruebas) == 1:
+            expresion, j = pruebas[0]
+            condicion = f"{guia!r} in s" + ("" if expresion == "True" else f" and {expresion}")
+            cuerpo += [f"        if {condicion}:", f"            a |= b{j}"]
+            continue
+        cuerpo.append(f"        if {guia!r} in s:")
+        for expresion, j in pruebas:
+            if expresion == "True":
+                cuerpo.append(f"            a |= b{j}")
+            else:
+                cuerpo += [f"            if {expresion}:", f"                a |= b{j}"]
+    for expresion, j in sueltas:
+        cuerpo += [f"        if {expresion}:", f"            a |= b{j}"]
+    for expresion, j in declaraciones:
+        cuerpo += [f"        if {expresion}:", f"            d |= b{j}"]
+
+    nombres = ", ".join(f"b{j}" for j in range(len(reglas)))
+    lineas = [
+        f"# Generado por engine/generado.py desde {clase_reglas.__module__}:"
+        f"{clase_reglas.__qualname__}. No editar.",
+        f"# huella: {huella or huella_reglas(clase_reglas, cultivo_key)}",
+        "",
+        f"CULTIVO = {cultivo_key!r}",
+        f"REGLAS = {tuple(r.nombre for r in reglas)!r}",
+        "",
+        *constantes.lineas(),
+        *tablas,
+        "",
+        "",
+        "def crear(bits):",
+        f"    ({nombres},) = bits",
+        f"    fijas = {mascara(fijas_act)}",
+        f"    declaran = {mascara(fijas_decl)}",
+        "",
+        "    def activas(s):",
+        "        a = fijas",
+        "        d = declaran",
+        *cuerpo,
+        "        return a, d",
+        "",
+        "    return activas",
+    ]
+    return "\n".join(lineas) + "\n"
+
+
+class MatcherGenerado:
+    """
+    Matcher de un cultivo que decide qué reglas se activan con el módulo
+    generado y resuelve la agenda (orden de disparo, NOT) con el
+    MatcherCompilado del proceso. Devuelve lo mismo que `motor.run()`.
+    """
+
+    origen = "generado"
+
+    def __init__(self, matcher, modulo):
+        self.matcher = matcher
+        self.modulo = modulo
+        self.vocabulario = matcher.vocabulario
+        # Bit de cada regla = su posición en la agenda de este proceso
+        posicion = {matcher.reglas[i].nombre: p for p, i in enumerate(matcher._orden_agenda)}
+        self._posicion = tuple(posicion[r.nombre] for r in matcher.reglas)
+        self.activas = modulo.crear(tuple(1 << posicion[nombre] for nombre in modulo.REGLAS))
+
+    def declarados(self, sintomas, conteos=None):
+        """HechoCompilado declarados para `sintomas`, en orden de declaración."""
+        s = sintomas if isinstance(sintomas, (set, frozenset)) else set(sintomas)
+        activadas, declaran = self.activas(s)
+        posicion = self._posicion
+        disparos = self.matcher.disparar(_SIEMPRE, lambda i: declaran >> posicion[i] & 1,
+                                         conteos, activadas)
+        return [hecho for _, hecho in disparos]
+
+    def evaluar(self, sintomas, conteos=None):
+        # InitialFact ocupa f-0 y el Caso f-1
+        return [hecho.crear(i) for i, hecho in enumerate(self.declarados(sintomas, conteos), start=2)]
+
+
+def _SIEMPRE(i):
+    return True
+
+
+def _ruta(directorio, clase_reglas, huella):
+    directorio = directorio or DIRECTORIO_GENERADOS or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "__pycache__", "generados")
+    nombre = re.sub(r"[^a-z0-9_]", "_", clase_reglas.__name__.lower())
+    return os.path.join(directorio, f"{nombre}_{huella[:16]}.py")
+
+
+def _importar(ruta, nombre_modulo):
+    spec = importlib.util.spec_from_file_location(nombre_modulo, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def _desde_fuente(fuente, nombre_modulo):
+    modulo = types.ModuleType(nombre_modulo)
+    exec(compile(fuente, f"<{nombre_modulo}>", "exec"), modulo.__dict__)
+    return modulo
+
+
+def cargar_modulo(clase_reglas, cultivo_key, matcher, directorio=None):
+    """
+    Módulo generado del cultivo: se importa de disco si ya existe para esta
+    huella; si no, se genera, se guarda y se importa (o, si no se puede
+    escribir, se ejecuta en memoria).
+    """
+    huella = huella_reglas(clase_reglas, cultivo_key)
+    nombre_modulo = f"_plagas_generado_{re.sub(r'[^a-z0-9_]', '_', cultivo_key.lower())}"
+    if huella is None:
+        return _desde_fuente(generar_fuente(clase_reglas, cultivo_key, matcher), nombre_modulo)
+
+    ruta = _ruta(directorio, clase_reglas, huella)
+    nombres = {r.nombre for r in matcher.reglas}
+    if os.path.exists(ruta):
+        try:
+            modulo = _importar(ruta, nombre_modulo)
+            if set(modulo.REGLAS) == nombres and modulo.CULTIVO == cultivo_key:
+                return modulo
+        except Exception:
+            pass  # archivo dañado o de otra versión: se vuelve a generar
+
+    fuente = generar_fuente(clase_reglas, cultivo_key, matcher, huella)
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(fuente)
+        os.replace(temporal, ruta)
+        return _importar(ruta, nombre_modulo)
+    except OSError:
+        return _desde_fuente(fuente, nombre_modulo)
+
+
+_GENERADOS = {}
+_LOCK = threading.Lock()
+
+
+def obtener_generado(clase_reglas, cultivo_key, directorio: str = None):
+    """
+    MatcherGenerado del cultivo (uno por proceso) o None si sus reglas no
+    se pueden compilar; en ese caso se usa experta.
+    """
+    clave = (clase_reglas, cultivo_key)
+    try:
+        return _GENERADOS[clave]
+    except KeyError:
+        pass
+    with _LOCK:
+        if clave not in _GENERADOS:
+            matcher = obtener_matcher(clase_reglas, cultivo_key)
+            _GENERADOS[clave] = None if matcher is None else MatcherGenerado(
+                matcher, cargar_modulo(clase_reglas, cultivo_key, matcher, directorio))
+        return _GENERADOS[clave]
+
+
+def main(argv=None):
+    import argparse
+    from engine.motor import MAPA_CULTIVOS
+
+    parser = argparse.ArgumentParser(description="Genera los módulos especializados de los cultivos.")
+    parser.add_argument("cultivos", nargs="*", help="por defecto, todos")
+    parser.add_argument("--directorio", default=DIRECTORIO_GENERADOS)
+    parser.add_argument("--mostrar", action="store_true", help="imprime el código en vez de guardarlo")
+    args = parser.parse_args(argv)
+
+    for cultivo_key in args.cultivos or list(MAPA_CULTIVOS):
+        clase = MAPA_CULTIVOS[cultivo_key]
+        matcher = obtener_matcher(clase, cultivo_key)
+        if matcher is None:
+            print(f"{cultivo_key}: reglas no compilables, se usará experta", file=sys.stderr)
+            continue
+        if args.mostrar:
+            print(generar_fuente(clase, cultivo_key, matcher))
+            continue
+        modulo = cargar_modulo(clase, cultivo_key, matcher, args.directorio)
+        print(f"{cultivo_key}: {getattr(modulo, '__file__', '(en memoria)')}")
+
+
+if __name__ == "__main__":
+    main()
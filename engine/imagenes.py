@@ -0,0 +1,344 @@
+"""
+Imágenes de los diagnósticos: índice de images/ y miniaturas en caché.
+
+    python -m engine.imagenes              # valida las referencias de las reglas
+    python -m engine.imagenes --miniaturas # y genera las miniaturas de antemano
+
+El índice se arma una vez al arrancar: cada archivo de images/ queda bajo
+su ruta relativa normalizada (NFC y sin mayúsculas, así 'escoba_bruja.jpg'
+encuentra 'escoba_bruja.JPG'), y también sin extensión, para que
+'aranita_roja.jpg' encuentre 'aranita_roja.webp' si falta la primera.
+Las rutas que no existen se anotan en `faltantes` y se informan una sola
+vez; después se devuelven como None sin volver a mirar el disco.
+
+Las miniaturas (ancho máximo, WebP por omisión) se generan en el primer
+pedido con Pillow, se guardan en disco con el mtime y el tamaño del
+original en la clave y se sirven desde una LRU en memoria. Sin Pillow se
+sirven los bytes del original.
+"""
+import argparse
+import hashlib
+import io
+import os
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from engine.compilado import obtener_matcher
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+# Carpeta de imágenes (por defecto, images/ en la raíz del proyecto)
+DIRECTORIO_IMAGENES = os.environ.get(
+    "PLAGAS_IMAGENES", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images"))
+
+# Directorio de las miniaturas (por defecto, __pycache__/miniaturas en engine/)
+DIRECTORIO_MINIATURAS = os.environ.get("PLAGAS_MINIATURAS")
+
+ANCHO_MINIATURA = 640
+CALIDAD = 80
+
+# Formato pedido -> formato de Pillow y extensión del archivo en disco
+FORMATOS = {"webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg"), "png": ("PNG", ".png")}
+
+EXTENSIONES = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+# Carpeta de images/ contra la que se resuelve el campo `imagen` de cada
+# cultivo (papa guarda 'papa/acaros.jpg', que está en images/papa/papa/)
+BASES = {"papa": "papa"}
+
+
+_SIN_PILLOW_AVISADO = False
+
+
+def _avisar_sin_pillow():
+    global _SIN_PILLOW_AVISADO
+    if not _SIN_PILLOW_AVISADO:
+        _SIN_PILLOW_AVISADO = True
+        print("Pillow no está instalado: se sirven las imágenes originales, sin miniaturas "
+              "(pip install Pillow)", file=sys.stderr)
+
+
+def _normalizar(ruta):
+    ruta = unicodedata.normalize("NFC", ruta.replace("\\", "/")).strip("/")
+    if ruta.casefold().startswith("images/"):
+        ruta = ruta[len("images/"):]
+    return ruta.casefold()
+
+
+def _sin_extension(clave):
+    raiz, extension = os.path.splitext(clave)
+    return raiz if extension in EXTENSIONES else None
+
+
+class Imagen:
+    """Un archivo del índice."""
+
+    __slots__ = ("ruta", "archivo", "mtime_ns", "tamano")
+
+    def __init__(self, ruta, archivo, mtime_ns, tamano):
+        self.ruta = ruta
+        self.archivo = archivo
+        self.mtime_ns = mtime_ns
+        self.tamano = tamano
+
+    def __repr__(self):
+        return f"Imagen({self.ruta!r})"
+
+
+class ManifiestoImagenes:
+    """
+    Índice de las imágenes de un directorio con caché de miniaturas.
+
+    `obtener` y `miniatura` devuelven bytes listos para st.image, o None si
+    la imagen no existe (anotada en `faltantes` la primera vez).
+    """
+
+    def __init__(self, directorio: str = None, directorio_miniaturas: str = None,
+                 max_bytes: int = 32 * 1024 * 1024):
+        self.directorio = os.path.abspath(directorio or DIRECTORIO_IMAGENES)
+        self.directorio_miniaturas = (directorio_miniaturas or DIRECTORIO_MINIATURAS or
+                                      os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   "__pycache__", "miniaturas"))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._indice = {}
+        self._sin_extension = {}
+        self._memoria = OrderedDict()
+        self._bytes = 0
+        # Ruta pedida -> quién la pidió, en el orden en que se detectaron
+        self.faltantes = {}
+        self._stats = {"aciertos": 0, "fallos": 0, "generadas": 0, "expulsados": 0}
+        self.escanear()
+
+    def escanear(self):
+        """Vuelve a recorrer el directorio (imágenes agregadas o cambiadas)."""
+        indice, sin_extension = {}, {}
+        for raiz, carpetas, archivos in os.walk(self.directorio):
+            carpetas.sort()
+            for nombre in sorted(archivos):
+                if not nombre.lower().endswith(EXTENSIONES):
+                    continue
+                archivo = os.path.join(raiz, nombre)
+                try:
+                    st = os.stat(archivo)
+                except OSError:
+                    continue
+                ruta = os.path.relpath(archivo, self.directorio).replace(os.sep, "/")
+                clave = _normalizar(ruta)
+                indice[clave] = Imagen(ruta, archivo, st.st_mtime_ns, st.st_size)
+                sin_extension.setdefault(_sin_extension(clave), clave)
+        with self._lock:
+            self._indice, self._sin_extension = indice, sin_extension
+            self.faltantes.clear()
+
+    def __len__(self):
+        return len(self._indice)
+
+    def __iter__(self):
+        return iter(self._indice.values())
+
+    def resolver(self, ruta: str, origen: str = None):
+        """Imagen de `ruta` (relativa a images/, con o sin el prefijo) o None."""
+        clave = _normalizar(ruta)
+        imagen = self._indice.get(clave)
+        if imagen is None:
+            alternativa = self._sin_extension.get(_sin_extension(clave))
+            imagen = self._indice.get(alternativa) if alternativa else None
+        if imagen is None:
+            with self._lock:
+                if ruta not in self.faltantes:
+                    self.faltantes[ruta] = origen
+                    print(f"imagen no encontrada: {ruta}" + (f" ({origen})" if origen else ""),
+                          file=sys.stderr)
+        return imagen
+
+    def _recordar(self, clave, datos):
+        with self._lock:
+            if clave in self._memoria:
+                self._bytes -= len(self._memoria.pop(clave))
+            if len(datos) > self.max_bytes:
+                return
+            self._memoria[clave] = datos
+            self._bytes += len(datos)
+            while self._bytes > self.max_bytes:
+                _, viejo = self._memoria.popitem(last=False)
+                self._bytes -= len(viejo)
+                self._stats["expulsados"] += 1
+
+    def _en_memoria(self, clave):
+        with self._lock:
+            datos = self._memoria.get(clave)
+            if datos is not None:
+                self._memoria.move_to_end(clave)
+                self._stats["aciertos"] += 1
+            else:
+                self._stats["fallos"] += 1
+            return datos
+
+    def obtener(self, ruta: str, origen: str = None):
+        """Bytes del archivo original."""
+        imagen = self.resolver(ruta, origen)
+        if imagen is None:
+            return None
+        clave = (imagen.ruta, imagen.mtime_ns, imagen.tamano, None, None)
+        datos = self._en_memoria(clave)
+        if datos is None:
+            with open(imagen.archivo, "rb") as f:
+                datos = f.read()
+            self._recordar(clave, datos)
+        return datos
+
+    def _ruta_miniatura(self, clave):
+        h = hashlib.sha1(repr(clave).encode("utf-8")).hexdigest()
+        return os.path.join(self.directorio_miniaturas, h[:2], h + FORMATOS[clave[4]][1])
+
+    def miniatura(self, ruta: str, ancho: int = ANCHO_MINIATURA, formato: str = "webp",
+                  origen: str = None):
+        """
+        Bytes de la imagen reducida a `ancho` píxeles como máximo, en `formato`.
+        Sin Pillow devuelve el original (y lo avisa una vez por proceso).
+        """
+        if Image is None:
+            _avisar_sin_pillow()
+            return self.obtener(ruta, origen)
+        imagen = self.resolver(ruta, origen)
+        if imagen is None:
+            return None
+        clave = (imagen.ruta, imagen.mtime_ns, imagen.tamano, ancho, formato)
+        datos = self._en_memoria(clave)
+        if datos is not None:
+            return datos
+
+        archivo = self._ruta_miniatura(clave)
+        try:
+            with open(archivo, "rb") as f:
+                datos = f.read()
+        except OSError:
+            datos = _reducir(imagen.archivo, ancho, formato)
+            _escribir(archivo, datos)
+            with self._lock:
+                self._stats["generadas"] += 1
+        self._recordar(clave, datos)
+        return datos
+
+    def validar(self, mapa_cultivos):
+        """
+        Revisa el campo `imagen` de los diagnósticos de cada cultivo.
+        Devuelve {cultivo: [imagenes que faltan]} (solo los que tienen faltantes).
+        """
+        faltan = {}
+        for cultivo_key, ruta in referencias(mapa_cultivos):
+            if self.resolver(ruta, cultivo_key) is None:
+                faltan.setdefault(cultivo_key, []).append(ruta)
+        return faltan
+
+    def limpiar(self):
+        with self._lock:
+            self._memoria.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self._stats["aciertos"] + self._stats["fallos"]
+            return dict(
+                self._stats,
+                imagenes=len(self._indice),
+                faltantes=len(self.faltantes),
+                entradas=len(self._memoria),
+                bytes=self._bytes,
+                tasa_aciertos=self._stats["aciertos"] / consultas if consultas else 0.0,
+            )
+
+
+def referencias(mapa_cultivos):
+    """
+    (cultivo, ruta relativa a images/) de cada `imagen` que declaran las
+    reglas, sacadas de los hechos del matcher compilado. Los cultivos cuyas
+    reglas no se compilan no se revisan.
+    """
+    vistas = set()
+    for cultivo_key, clase in mapa_cultivos.items():
+        matcher = obtener_matcher(clase, cultivo_key)
+        if matcher is None:
+            continue
+        base = BASES.get(cultivo_key)
+        for regla in matcher.reglas:
+            for hecho in regla.hechos:
+                imagen = hecho.diagnostico.get("imagen") if hecho.diagnostico is not None else None
+                if not imagen:
+                    continue
+                ruta = f"{base}/{imagen}" if base else imagen
+                if (cultivo_key, ruta) not in vistas:
+                    vistas.add((cultivo_key, ruta))
+                    yield cultivo_key, ruta
+
+
+def ruta_cultivo(cultivo_key: str, imagen: str):
+    """Ruta relativa a images/ del campo `imagen` de un diagnóstico."""
+    base = BASES.get(cultivo_key)
+    return f"{base}/{imagen}" if base else imagen
+
+
+def _reducir(archivo, ancho, formato):
+    formato_pil, _ = FORMATOS[formato]
+    with Image.open(archivo) as original:
+        imagen = ImageOps.exif_transpose(original)
+        if imagen.width > ancho:
+            imagen = imagen.resize((ancho, max(1, round(imagen.height * ancho / imagen.width))),
+                                   Image.LANCZOS)
+        if formato_pil == "JPEG" and imagen.mode != "RGB":
+            imagen = imagen.convert("RGB")
+        elif imagen.mode not in ("RGB", "RGBA", "L"):
+            imagen = imagen.convert("RGBA")
+        salida = io.BytesIO()
+        imagen.save(salida, formato_pil, quality=CALIDAD)
+    return salida.getvalue()
+
+
+def _escribir(archivo, datos):
+    """Escritura atómica; si el directorio no se puede escribir, la miniatura queda solo en memoria."""
+    try:
+        os.makedirs(os.path.dirname(archivo), exist_ok=True)
+        temporal = f"{archivo}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(datos)
+        os.replace(temporal, archivo)
+    except OSError:
+        pass
+
+
+def main(argv=None):
+    from engine.motor import MAPA_CULTIVOS
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directorio", default=None)
+    parser.add_argument("--miniaturas", action="store_true",
+                        help="genera las miniaturas de todas las imágenes")
+    parser.add_argument("--ancho", type=int, default=ANCHO_MINIATURA)
+    parser.add_argument("--formato", choices=list(FORMATOS), default="webp")
+    args = parser.parse_args(argv)
+
+    manifiesto = ManifiestoImagenes(args.directorio)
+    faltan = manifiesto.validar(MAPA_CULTIVOS)
+    print(f"{len(manifiesto)} imágenes en {manifiesto.directorio}")
+    for cultivo_key, rutas in faltan.items():
+        print(f"{cultivo_key}: faltan {len(rutas)}: {', '.join(rutas)}")
+    if args.miniaturas:
+        if Image is None:
+            print("hace falta Pillow para generar miniaturas", file=sys.stderr)
+            return 1
+        for imagen in manifiesto:
+            manifiesto.miniatura(imagen.ruta, args.ancho, args.formato)
+        e = manifiesto.estadisticas()
+        print(f"{e['generadas']} miniaturas generadas en {manifiesto.directorio_miniaturas}")
+    return 1 if faltan else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
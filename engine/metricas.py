@@ -0,0 +1,131 @@
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Límites (en ms) de las cubetas de los histogramas de duración
+LIMITES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Histograma:
+    """Histograma acumulativo con límites fijos (al estilo Prometheus)."""
+
+    __slots__ = ("limites", "cubetas", "suma", "cuenta")
+
+    def __init__(self, limites=LIMITES_MS):
+        self.limites = tuple(limites)
+        self.cubetas = [0] * (len(self.limites) + 1)
+        self.suma = 0.0
+        self.cuenta = 0
+
+    def observar(self, valor):
+        self.cubetas[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.cuenta += 1
+
+    def como_dict(self):
+        acumulado, cubetas = 0, {}
+        for limite, n in zip(self.limites + (float("inf"),), self.cubetas):
+            acumulado += n
+            cubetas["+Inf" if limite == float("inf") else str(limite)] = acumulado
+        return {"cuenta": self.cuenta, "suma": self.suma, "cubetas": cubetas}
+
+
+class MetricasProceso:
+    """
+    Contadores e histogramas de todos los diagnósticos instrumentados del
+    proceso, por cultivo y por fase. Se leen con `volcar()` o en formato de
+    texto de Prometheus con `texto_prometheus()`.
+    """
+
+    def __init__(self, limites=LIMITES_MS):
+        self.limites = tuple(limites)
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self._diagnosticos = {}
+            self._conteos = {}
+            self._fases = {}
+            self._total = {}
+
+    def registrar(self, cultivo_key, origen, fases_ms, total_ms, conteos):
+        with self._lock:
+            clave = (cultivo_key, origen)
+            self._diagnosticos[clave] = self._diagnosticos.get(clave, 0) + 1
+            for nombre, valor in conteos.items():
+                self._conteos[(cultivo_key, nombre)] = self._conteos.get((cultivo_key, nombre), 0) + valor
+            for fase, ms in fases_ms.items():
+                histograma = self._fases.get((cultivo_key, fase))
+                if histograma is None:
+                    histograma = self._fases[(cultivo_key, fase)] = Histograma(self.limites)
+                histograma.observar(ms)
+            histograma = self._total.get(cultivo_key)
+            if histograma is None:
+                histograma = self._total[cultivo_key] = Histograma(self.limites)
+            histograma.observar(total_ms)
+
+    def volcar(self):
+        """Copia de todas las métricas como diccionarios anidados por cultivo."""
+        with self._lock:
+            resultado = {}
+            for (cultivo, origen), n in self._diagnosticos.items():
+                resultado.setdefault(cultivo, {}).setdefault("diagnosticos", {})[origen] = n
+            for (cultivo, nombre), n in self._conteos.items():
+                resultado.setdefault(cultivo, {}).setdefault("conteos", {})[nombre] = n
+            for (cultivo, fase), histograma in self._fases.items():
+                resultado.setdefault(cultivo, {}).setdefault("fases_ms", {})[fase] = histograma.como_dict()
+            for cultivo, histograma in self._total.items():
+                resultado.setdefault(cultivo, {})["total_ms"] = histograma.como_dict()
+            return resultado
+
+    def texto_prometheus(self, prefijo="plagas"):
+        lineas = []
+        for cultivo, datos in sorted(self.volcar().items()):
+            for origen, n in sorted(datos.get("diagnosticos", {}).items()):
+                lineas.append(f'{prefijo}_diagnosticos_total{{cultivo="{cultivo}",origen="{origen}"}} {n}')
+            for nombre, n in sorted(datos.get("conteos", {}).items()):
+                lineas.append(f'{prefijo}_{nombre}_total{{cultivo="{cultivo}"}} {n}')
+            histogramas = [(f'cultivo="{cultivo}",fase="{fase}"', h)
+                           for fase, h in sorted(datos.get("fases_ms", {}).items())]
+            if "total_ms" in datos:
+                histogramas.append((f'cultivo="{cultivo}",fase="total"', datos["total_ms"]))
+            for etiquetas, h in histogramas:
+                for limite, n in h["cubetas"].items():
+                    lineas.append(f'{prefijo}_fase_ms_bucket{{{etiquetas},le="{limite}"}} {n}')
+                lineas.append(f'{prefijo}_fase_ms_sum{{{etiquetas}}} {h["suma"]}')
+                lineas.append(f'{prefijo}_fase_ms_count{{{etiquetas}}} {h["cuenta"]}')
+        return "\n".join(lineas) + "\n"
+
+
+# Métricas de todo el proceso
+METRICAS = MetricasProceso()
+
+
+@contextmanager
+def contar_activaciones(motor, conteos):
+    """
+    Cuenta, en un motor experta, las activaciones que entran a la agenda
+    (`reglas_coincidentes`) y las que se disparan (`activaciones_disparadas`).
+    Envuelve la estrategia y la agenda de esa instancia y las restaura al salir.
+    """
+    estrategia, agenda = motor.strategy, motor.agenda
+    actualizar, siguiente = estrategia.update_agenda, agenda.get_next
+
+    def actualizar_contando(agenda_, agregadas, quitadas):
+        conteos["reglas_coincidentes"] += len(agregadas)
+        return actualizar(agenda_, agregadas, quitadas)
+
+    def siguiente_contando():
+        activacion = siguiente()
+        if activacion is not None:
+            conteos["activaciones_disparadas"] += 1
+        return activacion
+
+    estrategia.update_agenda = actualizar_contando
+    agenda.get_next = siguiente_contando
+    try:
+        yield
+    finally:
+        del estrategia.update_agenda
+        del agenda.get_next
@@ -10,49 +10,236 @@ collections.Iterator = collections.abc.Iterator
 collections.MutableSet = collections.abc.MutableSet
 collections.Callable = collections.abc.Callable
 
+import time
+
 from experta import KnowledgeEngine
 from knowledge.hechos import Caso
+from engine.compilado import HechoCompilado, obtener_matcher
+from engine.pool import PoolMotores
+from engine.cache import CacheDiagnosticos
+from engine.metricas import METRICAS, contar_activaciones
+from engine.resultado import DiagnosticoItem, ResultadoDiagnostico
+
+from engine.registro import REGISTRO
+
+# Cultivo -> clase de reglas. Es el registro de engine/registro.py: cada
+# módulo de reglas se importa la primera vez que se usa su cultivo.
+MAPA_CULTIVOS = REGISTRO
+
+# Motores compartidos por todo el proceso: cada SistemaExpertoPlagas los
+# reutiliza en vez de construir la red Rete en cada diagnóstico.
+POOL_MOTORES = PoolMotores(MAPA_CULTIVOS)
+
+# "experta" ejecuta el KnowledgeEngine; "compilado" evalúa las mismas reglas
+# con máscaras de bits (ver engine/compilado.py) y vuelve a experta si el
+# cultivo no se puede compilar; "tabla" responde con una búsqueda en la tabla
+# precalculada del cultivo (engine/tablas.py) y, si el cultivo es demasiado
+# grande para tabularlo, se comporta como "compilado"; "generado" decide qué
+# reglas se activan con un módulo de Python generado para el cultivo
+# (engine/generado.py) y también vuelve a experta si no se puede compilar;
+# "diagrama" recorre los diagramas de decisión del cultivo (engine/diagramas.py).
+BACKENDS = ("experta", "compilado", "tabla", "generado", "diagrama")
+
+
+def _certeza(item):
+    return item.certeza or 0
+
+
+def armar_resultado(hechos):
+    """
+    Resultado a partir de hechos de experta o HechoCompilado (estos ya traen
+    su DiagnosticoItem armado), ordenado por certeza de mayor a menor.
+    """
+    diagnosticos = []
+    for hecho in hechos:
+        if isinstance(hecho, HechoCompilado):
+            if hecho.diagnostico is not None:
+                diagnosticos.append(hecho.diagnostico)
+        elif isinstance(hecho, dict) and 'plaga' in hecho:
+            diagnosticos.append(DiagnosticoItem.desde_hecho(hecho))
+    diagnosticos.sort(key=_certeza, reverse=True)
+    return ResultadoDiagnostico(diagnosticos)
+
+
+def _error_cultivo(cultivo):
+    return ResultadoDiagnostico(error=f"Cultivo '{cultivo}' no soportado aún.")
+
+
+def _correr_motor(motor, cultivo_key, sintomas):
+    motor.reset()
+    motor.declare(Caso(cultivo=cultivo_key, sintomas=set(sintomas)))
+    motor.run()
+    return armar_resultado(motor.facts.values())
 
-from knowledge.reglas_uva import ReglasUva
-from knowledge.reglas_limon import ReglasLimon
-from knowledge.reglas_paltas import ReglasPalta
-from knowledge.reglas_cafe import ReglasCafe
-from knowledge.reglas_cacao import ReglasCacao
-from knowledge.reglas_papa import ReglasPapa
-
-MAPA_CULTIVOS = {
-    "uva": ReglasUva,
-    "limon": ReglasLimon,
-    "palta": ReglasPalta,
-    "café": ReglasCafe,
-    "cacao": ReglasCacao,
-    "papa": ReglasPapa
-}
 
 class SistemaExpertoPlagas:
-    def diagnosticar(self, cultivo: str, sintomas: list):
+    def __init__(self, backend: str = "experta", pool: PoolMotores = None,
+                 cache: CacheDiagnosticos = None, instrumentar: bool = False):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend '{backend}' desconocido. Opciones: {', '.join(BACKENDS)}")
+        self.backend = backend
+        self.pool = pool if pool is not None else POOL_MOTORES
+        self.cache = cache
+        # Si es True, todos los diagnósticos se miden y suman a METRICAS
+        self.instrumentar = instrumentar
+
+    def _matcher(self, cultivo_key):
+        if self.backend == "experta":
+            return None
+        if self.backend == "generado":
+            from engine.generado import obtener_generado
+            return obtener_generado(MAPA_CULTIVOS[cultivo_key], cultivo_key)
+        if self.backend == "diagrama":
+            from engine.diagramas import obtener_diagrama
+            return obtener_diagrama(MAPA_CULTIVOS[cultivo_key], cultivo_key)
+        return obtener_matcher(MAPA_CULTIVOS[cultivo_key], cultivo_key)
+
+    def _tabla(self, cultivo_key):
+        if self.backend != "tabla":
+            return None
+        from engine.tablas import obtener_tabla
+        return obtener_tabla(MAPA_CULTIVOS[cultivo_key], cultivo_key)
+
+    def diagnosticar(self, cultivo: str, sintomas: list, metricas: bool = False):
+        """
+        Diagnostica un caso. Con `metricas=True` el resultado trae además la
+        clave "metricas" (duración de cada fase y conteos del motor).
+        """
         cultivo_key = cultivo.lower()
         if cultivo_key not in MAPA_CULTIVOS:
-            return {
-                "error": f"Cultivo '{cultivo}' no soportado aún.",
-                "diagnosticos": [],
-                "reglas_activadas": []
-            }
+            return _error_cultivo(cultivo)
+        if metricas or self.instrumentar:
+            return self._diagnosticar_medido(cultivo_key, sintomas, metricas)
+
+        if self.cache is not None:
+            resultado = self.cache.obtener(cultivo_key, sintomas)
+            if resultado is not None:
+                return resultado
 
         #set: conjunto en pyhton
-        clase_reglas = MAPA_CULTIVOS[cultivo_key]
-        motor = clase_reglas()
-        motor.reset()
-        motor.declare(Caso(cultivo=cultivo_key, sintomas=set(sintomas)))
-        motor.run()
-
-        diagnosticos = [
-            fact for fact in motor.facts.values()
-            if isinstance(fact, dict) and 'plaga' in fact
-        ]
-        diagnosticos.sort(key=lambda x: x.get('certeza', 0), reverse=True)
+        tabla = self._tabla(cultivo_key)
+        matcher = self._matcher(cultivo_key) if tabla is None else None
+        if tabla is not None:
+            resultado = armar_resultado(tabla.declarados(sintomas))
+        elif matcher is not None:
+            resultado = armar_resultado(matcher.declarados(set(sintomas)))
+        else:
+            with self.pool.motor(cultivo_key) as motor:
+                resultado = _correr_motor(motor, cultivo_key, sintomas)
+
+        if self.cache is not None:
+            self.cache.guardar(cultivo_key, sintomas, resultado)
+        return resultado
+
+    def _diagnosticar_medido(self, cultivo_key, sintomas, incluir):
+        """Igual que diagnosticar, midiendo cada fase y registrándola en METRICAS."""
+        reloj = time.perf_counter
+        fases = {}
+        conteos = {"reglas_coincidentes": 0, "activaciones_disparadas": 0, "hechos": 0}
+        inicio = marca = reloj()
+
+        def fase(nombre):
+            nonlocal marca
+            ahora = reloj()
+            fases[nombre] = (ahora - marca) * 1000
+            marca = ahora
+
+        resultado = None
+        origen = "cache"
+        if self.cache is not None:
+            resultado = self.cache.obtener(cultivo_key, sintomas)
+            fase("cache")
+
+        if resultado is None:
+            tabla = self._tabla(cultivo_key)
+            matcher = self._matcher(cultivo_key) if tabla is None else None
+            if tabla is not None:
+                origen = "tabla"
+                fase("tabla")
+                hechos = tabla.declarados(sintomas)
+                fase("buscar")
+                conteos["hechos"] = len(hechos) + 2
+            elif matcher is not None:
+                origen = matcher.origen
+                fase("matcher")
+                hechos = matcher.declarados(set(sintomas), conteos)
+                fase("evaluar")
+                # InitialFact y Caso también están en la memoria de trabajo
+                conteos["hechos"] = len(hechos) + 2
+            else:
+                origen = "experta"
+                with self.pool.motor(cultivo_key) as motor:
+                    fase("motor")
+                    motor.reset()
+                    fase("reset")
+                    with contar_activaciones(motor, conteos):
+                        motor.declare(Caso(cultivo=cultivo_key, sintomas=set(sintomas)))
+                        fase("declare")
+                        motor.run()
+                    fase("run")
+                    hechos = list(motor.facts.values())
+                conteos["hechos"] = len(hechos)
+            resultado = armar_resultado(hechos)
+            fase("resultado")
+            if self.cache is not None:
+                self.cache.guardar(cultivo_key, sintomas, resultado)
+                fase("cache_guardar")
+
+        total = (reloj() - inicio) * 1000
+        METRICAS.registrar(cultivo_key, origen, fases, total, conteos)
+        if incluir:
+            resultado.metricas = dict(conteos, origen=origen, fases_ms=fases, total_ms=total)
+        return resultado
+
+    def _diagnosticar_grupo(self, cultivo_key, conjuntos):
+        """Diagnostica varios conjuntos de síntomas de un mismo cultivo con un solo motor."""
+        tabla = self._tabla(cultivo_key)
+        if tabla is not None:
+            for sintomas in conjuntos:
+                yield sintomas, armar_resultado(tabla.declarados(sintomas))
+            return
+
+        matcher = self._matcher(cultivo_key)
+        if matcher is not None:
+            for sintomas in conjuntos:
+                yield sintomas, armar_resultado(matcher.declarados(sintomas))
+            return
+
+        with self.pool.motor(cultivo_key) as motor:
+            for sintomas in conjuntos:
+                yield sintomas, _correr_motor(motor, cultivo_key, sintomas)
+
+    def diagnosticar_lote(self, casos):
+        """
+        Diagnostica muchos casos (pares cultivo, síntomas) de una vez.
+
+        Agrupa por cultivo, usa un único motor (o matcher compilado) por
+        cultivo y calcula una sola vez cada conjunto de síntomas repetido.
+        Los resultados vuelven en el mismo orden que los casos.
+        """
+        inicio = time.perf_counter()
+        resultados = []
+        grupos = {}
+        for i, (cultivo, sintomas) in enumerate(casos):
+            resultados.append(None)
+            cultivo_key = cultivo.lower()
+            if cultivo_key not in MAPA_CULTIVOS:
+                resultados[i] = _error_cultivo(cultivo)
+                continue
+            grupos.setdefault(cultivo_key, {}).setdefault(frozenset(sintomas), []).append(i)
+
+        for cultivo_key, por_sintomas in grupos.items():
+            for sintomas, resultado in self._diagnosticar_grupo(cultivo_key, por_sintomas):
+                indices = por_sintomas[sintomas]
+                resultados[indices[0]] = resultado
+                for i in indices[1:]:
+                    resultados[i] = resultado.copia()
 
+        segundos = time.perf_counter() - inicio
         return {
-            "diagnosticos": diagnosticos,
-            "reglas_activadas": [d.get("regla_activada") for d in diagnosticos]
+            "resultados": resultados,
+            "casos": len(resultados),
+            "unicos": sum(len(por_sintomas) for por_sintomas in grupos.values()),
+            "segundos": segundos,
+            "casos_por_segundo": len(resultados) / segundos if segundos > 0 else float("inf")
         }
@@ -0,0 +1,180 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS, POOL_MOTORES
+
+# Sistema de cada proceso trabajador (lo crea _iniciar_trabajador)
+_SISTEMA = None
+
+
+def _iniciar_trabajador(backend):
+    """Deja al trabajador con motores ya construidos para todos los cultivos."""
+    global _SISTEMA
+    _SISTEMA = SistemaExpertoPlagas(backend=backend)
+    POOL_MOTORES.calentar()
+
+
+def _diagnosticar_trozo(indices, casos):
+    lote = _SISTEMA.diagnosticar_lote(casos)
+    return indices, lote["resultados"]
+
+
+class DiagnosticoParalelo:
+    """
+    Reparte lotes de diagnósticos entre varios procesos.
+
+    Cada trabajador mantiene sus propios motores (uno por cultivo, ya
+    calentados) y recibe trozos de `tamano_trozo` casos que resuelve con
+    diagnosticar_lote. Si un trabajador muere se rehace el pool y se reenvían
+    sus trozos; si un trozo falla igual, se diagnostica en este proceso.
+
+    El orden en que experta dispara reglas con igual salience (y con él qué
+    diagnósticos parciales sobreviven) depende de la semilla de hash y de la
+    identidad de los objetos de cada red, así que solo se arranca con
+    "fork" (el valor por omisión donde existe): antes de crear los
+    trabajadores se calientan en este proceso los motores y matchers de
+    todos los cultivos, y cada trabajador los hereda tal cual. Con "spawn" o
+    "forkserver" cada trabajador armaría los suyos, y un lote podría dar
+    otro resultado que diagnosticar_lote en serie: se rechazan.
+    """
+
+    def __init__(self, procesos: int = None, tamano_trozo: int = None,
+                 backend: str = "experta", mp_context=None, reintentos: int = 1):
+        if mp_context is None:
+            if "fork" not in multiprocessing.get_all_start_methods():
+                raise RuntimeError("DiagnosticoParalelo necesita el método de arranque 'fork'")
+            mp_context = multiprocessing.get_context("fork")
+        elif mp_context.get_start_method() != "fork":
+            raise ValueError(f"Con '{mp_context.get_start_method()}' los trabajadores no disparan las "
+                             "reglas en el mismo orden que este proceso; use 'fork'")
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tamano_trozo = tamano_trozo
+        self.backend = backend
+        self.mp_context = mp_context
+        self.reintentos = reintentos
+        self._local = SistemaExpertoPlagas(backend=backend)
+        self._executor = None
+        self._stats = {"trozos": 0, "reintentos": 0, "en_local": 0, "reinicios": 0}
+
+    def __enter__(self):
+        self._arrancar()
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _arrancar(self):
+        if self._executor is None:
+            # Lo que se arme aquí antes del fork es lo que heredan los trabajadores
+            POOL_MOTORES.calentar()
+            self._local.diagnosticar_lote([(cultivo, []) for cultivo in MAPA_CULTIVOS])
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.procesos, mp_context=self.mp_context,
+                initializer=_iniciar_trabajador, initargs=(self.backend,))
+        return self._executor
+
+    def _reiniciar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._stats["reinicios"] += 1
+        return self._arrancar()
+
+    def cerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _tamano_trozo(self, n_casos):
+        if self.tamano_trozo:
+            return self.tamano_trozo
+        # ~4 trozos por proceso: reparte la carga sin pagar demasiado IPC
+        return max(1, min(2000, -(-n_casos // (self.procesos * 4))))
+
+    def _trozos(self, casos):
+        casos = list(casos)
+        tamano = self._tamano_trozo(len(casos))
+        for desde in range(0, len(casos), tamano):
+            trozo = casos[desde:desde + tamano]
+            yield list(range(desde, desde + len(trozo))), trozo
+
+    def iterar(self, casos, ordenado: bool = True):
+        """
+        Genera pares (indice, resultado) a medida que terminan los trozos.
+
+        Con `ordenado=True` los pares salen en el orden de `casos`.
+        """
+        pendientes = {}
+        for indices, trozo in self._trozos(casos):
+            futuro = self._arrancar().submit(_diagnosticar_trozo, indices, trozo)
+            pendientes[futuro] = (indices, trozo, 0)
+            self._stats["trozos"] += 1
+
+        listos = {}
+        siguiente = 0
+        while pendientes:
+            hechos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                if futuro not in pendientes:
+                    continue  # ya reenviado tras reiniciar el pool
+                indices, trozo, intentos = pendientes.pop(futuro)
+                try:
+                    _, resultados = futuro.result()
+                except BrokenProcessPool:
+                    if intentos < self.reintentos:
+                        self._stats["reintentos"] += 1
+                        pendientes = self._reenviar(pendientes)
+                        nuevo = self._arrancar().submit(_diagnosticar_trozo, indices, trozo)
+                        pendientes[nuevo] = (indices, trozo, intentos + 1)
+                        continue
+                    resultados = self._en_local(trozo)
+                except Exception:
+                    resultados = self._en_local(trozo)
+
+                if not ordenado:
+                    yield from zip(indices, resultados)
+                    continue
+                listos.update(zip(indices, resultados))
+                while siguiente in listos:
+                    yield siguiente, listos.pop(siguiente)
+                    siguiente += 1
+
+    def _reenviar(self, pendientes):
+        """Tras la caída de un trabajador, rehace el pool y reenvía lo que no terminó."""
+        if self._executor is not None and not getattr(self._executor, "_broken", False):
+            return pendientes
+        executor = self._reiniciar()
+        reenviados = {}
+        for futuro, (indices, trozo, intentos) in pendientes.items():
+            if futuro.done() and not futuro.cancelled() and futuro.exception() is None:
+                reenviados[futuro] = (indices, trozo, intentos)
+            else:
+                reenviados[executor.submit(_diagnosticar_trozo, indices, trozo)] = (
+                    indices, trozo, intentos + 1)
+        return reenviados
+
+    def _en_local(self, trozo):
+        self._stats["en_local"] += 1
+        return self._local.diagnosticar_lote(trozo)["resultados"]
+
+    def diagnosticar_lote(self, casos):
+        """Igual que SistemaExpertoPlagas.diagnosticar_lote, repartido entre procesos."""
+        casos = list(casos)
+        inicio = time.perf_counter()
+        resultados = [None] * len(casos)
+        for i, resultado in self.iterar(casos, ordenado=False):
+            resultados[i] = resultado
+        segundos = time.perf_counter() - inicio
+        return {
+            "resultados": resultados,
+            "casos": len(resultados),
+            "procesos": self.procesos,
+            "segundos": segundos,
+            "casos_por_segundo": len(resultados) / segundos if segundos > 0 else float("inf")
+        }
+
+    def estadisticas(self):
+        return dict(self._stats)
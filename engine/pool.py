@@ -0,0 +1,126 @@
+import threading
+from contextlib import contextmanager
+
+
+class PoolMotores:
+    """
+    Reserva de motores experta ya construidos, por cultivo.
+
+    Construir un KnowledgeEngine arma toda su red Rete; aquí se construye una
+    vez y se reutiliza: cada diagnóstico toma un motor libre, lo usa (el
+    llamador hace reset/declare/run) y lo devuelve. Si todos los motores de un
+    cultivo están ocupados y ya se llegó a `tamano`, el llamador espera.
+    """
+
+    def __init__(self, mapa_cultivos, tamano: int = 4):
+        if tamano < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1.")
+        self.mapa_cultivos = mapa_cultivos
+        self.tamano = tamano
+        self._cond = threading.Condition()
+        self._libres = {}
+        self._construidos = {}
+        self._stats = {}
+
+    def _stats_de(self, cultivo_key):
+        return self._stats.setdefault(
+            cultivo_key, {"construidos": 0, "aciertos": 0, "esperas": 0, "descartados": 0})
+
+    def _construir(self, cultivo_key):
+        motor = self.mapa_cultivos[cultivo_key]()
+        with self._cond:
+            self._stats_de(cultivo_key)["construidos"] += 1
+        return motor
+
+    def tomar(self, cultivo_key: str, timeout=None):
+        """Saca un motor del pool (lo construye si aún hay cupo)."""
+        if cultivo_key not in self.mapa_cultivos:
+            raise KeyError(cultivo_key)
+        clase = self.mapa_cultivos[cultivo_key]
+
+        with self._cond:
+            libres = self._libres.setdefault(cultivo_key, [])
+            stats = self._stats_de(cultivo_key)
+            hay_cupo = lambda: libres or self._construidos.get(cultivo_key, 0) < self.tamano
+            if not hay_cupo():
+                stats["esperas"] += 1
+                if not self._cond.wait_for(hay_cupo, timeout=timeout):
+                    raise TimeoutError(f"No hay motores libres para '{cultivo_key}'.")
+            while libres:
+                motor = libres.pop()
+                if type(motor) is clase:
+                    stats["aciertos"] += 1
+                    return motor
+                # El cultivo se volvió a registrar con otras reglas: el motor viejo no sirve
+                self._construidos[cultivo_key] -= 1
+                stats["descartados"] += 1
+            # Se reserva el cupo antes de construir fuera del lock
+            self._construidos[cultivo_key] = self._construidos.get(cultivo_key, 0) + 1
+
+        try:
+            return self._construir(cultivo_key)
+        except BaseException:
+            with self._cond:
+                self._construidos[cultivo_key] -= 1
+                self._cond.notify_all()
+            raise
+
+    def devolver(self, cultivo_key: str, motor):
+        with self._cond:
+            self._libres.setdefault(cultivo_key, []).append(motor)
+            self._cond.notify()
+
+    def descartar(self, cultivo_key: str):
+        """Libera el cupo de un motor que quedó en estado dudoso."""
+        with self._cond:
+            self._construidos[cultivo_key] -= 1
+            self._stats_de(cultivo_key)["descartados"] += 1
+            self._cond.notify()
+
+    @contextmanager
+    def motor(self, cultivo_key: str, timeout=None):
+        """`with pool.motor("uva") as motor: ...` — si el bloque falla, el motor se descarta."""
+        motor = self.tomar(cultivo_key, timeout=timeout)
+        try:
+            yield motor
+        except BaseException:
+            self.descartar(cultivo_key)
+            raise
+        else:
+            self.devolver(cultivo_key, motor)
+
+    def calentar(self, cultivos=None, cantidad: int = 1):
+        """Deja al menos `cantidad` motores construidos por cultivo."""
+        cantidad = min(cantidad, self.tamano)
+        for cultivo_key in (cultivos or self.mapa_cultivos):
+            while True:
+                with self._cond:
+                    if self._construidos.get(cultivo_key, 0) >= cantidad:
+                        break
+                    self._construidos[cultivo_key] = self._construidos.get(cultivo_key, 0) + 1
+                try:
+                    motor = self._construir(cultivo_key)
+                except BaseException:
+                    with self._cond:
+                        self._construidos[cultivo_key] -= 1
+                    raise
+                self.devolver(cultivo_key, motor)
+
+    def calentar_en_segundo_plano(self, cultivos=None, cantidad: int = 1):
+        hilo = threading.Thread(target=self.calentar, args=(cultivos, cantidad),
+                                name="calentar-motores", daemon=True)
+        hilo.start()
+        return hilo
+
+    def estadisticas(self):
+        """Contadores por cultivo: construidos, aciertos, esperas, descartados, libres, en_uso."""
+        with self._cond:
+            resultado = {}
+            for cultivo_key, stats in self._stats.items():
+                libres = len(self._libres.get(cultivo_key, []))
+                resultado[cultivo_key] = dict(
+                    stats,
+                    libres=libres,
+                    en_uso=self._construidos.get(cultivo_key, 0) - libres,
+                )
+            return resultado
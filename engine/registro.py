@@ -0,0 +1,161 @@
+import collections.abc
+import importlib
+import os
+import threading
+
+
+# Extensiones de las bases declarativas (knowledge/declarativo.py)
+EXTENSIONES_BASE = (".json", ".toml", ".yaml", ".yml")
+
+
+def _importar(ruta):
+    """
+    'paquete.modulo:Atributo' -> objeto (importa el módulo si hace falta).
+    La ruta de una base declarativa devuelve su clase de reglas compilada.
+    """
+    if not isinstance(ruta, str):
+        return ruta
+    if ruta.lower().endswith(EXTENSIONES_BASE):
+        from knowledge.declarativo import cargar_base
+        return cargar_base(ruta).clase
+    modulo, _, atributo = ruta.partition(":")
+    if not atributo:
+        modulo, _, atributo = ruta.rpartition(".")
+    return getattr(importlib.import_module(modulo), atributo)
+
+
+class _Entrada:
+    __slots__ = ("clave", "nombre", "reglas", "interfaz", "sintomas", "descripcion")
+
+    def __init__(self, clave, nombre, reglas, interfaz, sintomas, descripcion):
+        self.clave = clave
+        self.nombre = nombre
+        self.reglas = reglas
+        self.interfaz = interfaz
+        self.sintomas = sintomas
+        self.descripcion = descripcion
+
+
+class RegistroCultivos(collections.abc.Mapping):
+    """
+    Cultivos soportados: clave -> clase de reglas, cargada en el primer uso.
+
+    Se comporta como el dict MAPA_CULTIVOS de antes (`registro["uva"]`,
+    `"uva" in registro`, `items()`...), pero las reglas y la interfaz de cada
+    cultivo se registran por ruta ('knowledge.reglas_uva:ReglasUva') y solo
+    se importan cuando alguien las pide.
+    """
+
+    def __init__(self):
+        self._entradas = {}
+        self._lock = threading.RLock()
+
+    def registrar(self, clave: str, reglas, interfaz=None, nombre: str = None,
+                  sintomas=None, descripcion: str = ""):
+        """
+        Agrega (o reemplaza) un cultivo.
+
+        `reglas` e `interfaz` pueden ser el objeto o su ruta 'modulo:Atributo'.
+        `nombre` es el que se muestra en la interfaz; `sintomas` y
+        `descripcion` sirven a los cultivos que la interfaz aún no conoce.
+        """
+        clave = clave.lower()
+        with self._lock:
+            self._entradas[clave] = _Entrada(
+                clave, nombre or clave.capitalize(), reglas, interfaz,
+                list(sintomas) if sintomas is not None else None, descripcion)
+
+    def registrar_base(self, ruta: str, interfaz=None):
+        """
+        Agrega el cultivo de una base declarativa. Solo se leen ahora su
+        clave, nombre, síntomas y descripción; las reglas se compilan (o se
+        toman de la caché en disco) en el primer diagnóstico. Devuelve la clave.
+        """
+        from knowledge.declarativo import leer_datos, validar
+        datos = validar(leer_datos(ruta))
+        self.registrar(datos["cultivo"], os.path.abspath(ruta), interfaz, datos["nombre"],
+                       datos["sintomas"], datos["descripcion"])
+        return datos["cultivo"]
+
+    def registrar_directorio(self, directorio: str, interfaz=None):
+        """Registra todas las bases declarativas de `directorio`. Devuelve sus claves."""
+        return [self.registrar_base(os.path.join(directorio, nombre), interfaz)
+                for nombre in sorted(os.listdir(directorio))
+                if nombre.lower().endswith(EXTENSIONES_BASE)]
+
+    def quitar(self, clave: str):
+        with self._lock:
+            del self._entradas[clave.lower()]
+
+    def _cargar(self, clave, campo):
+        entrada = self._entradas[clave]
+        valor = getattr(entrada, campo)
+        if isinstance(valor, str):
+            with self._lock:
+                valor = getattr(entrada, campo)
+                if isinstance(valor, str):
+                    valor = _importar(valor)
+                    setattr(entrada, campo, valor)
+        return valor
+
+    def __getitem__(self, clave):
+        return self._cargar(clave, "reglas")
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def __iter__(self):
+        return iter(list(self._entradas))
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def interfaz(self, clave: str):
+        """
+        Interfaz del cultivo, o None si no tiene: los datos de su vista
+        (ui/vistas/) o una función propia que lo dibuja en Streamlit.
+        """
+        if self._entradas[clave].interfaz is None:
+            return None
+        return self._cargar(clave, "interfaz")
+
+    def entrada(self, clave: str):
+        return self._entradas[clave]
+
+    def por_nombre(self, nombre: str):
+        """Clave del cultivo que se muestra como `nombre` (o None)."""
+        for entrada in list(self._entradas.values()):
+            if entrada.nombre == nombre:
+                return entrada.clave
+        return None
+
+    def cargado(self, clave: str, campo: str = "reglas"):
+        return not isinstance(getattr(self._entradas[clave], campo), str)
+
+    def precargar(self, claves=None, interfaz: bool = False):
+        """Importa ya las reglas (y opcionalmente la interfaz) de los cultivos indicados."""
+        for clave in (claves if claves is not None else list(self)):
+            self[clave]
+            if interfaz:
+                self.interfaz(clave)
+
+    def precargar_en_segundo_plano(self, claves=None, interfaz: bool = False):
+        hilo = threading.Thread(target=self.precargar, args=(claves, interfaz),
+                                name="precargar-cultivos", daemon=True)
+        hilo.start()
+        return hilo
+
+
+REGISTRO = RegistroCultivos()
+REGISTRO.registrar("uva", "knowledge.reglas_uva:ReglasUva",
+                   "ui.vistas.uva:VISTA", nombre="Uva")
+REGISTRO.registrar("limon", "knowledge.reglas_limon:ReglasLimon",
+                   "ui.vistas.limon:VISTA", nombre="Limon")
+REGISTRO.registrar("palta", "knowledge.reglas_paltas:ReglasPalta",
+                   "ui.vistas.palta:VISTA", nombre="Palta")
+REGISTRO.registrar("café", "knowledge.reglas_cafe:ReglasCafe",
+                   "ui.vistas.cafe:VISTA", nombre="Café")
+REGISTRO.registrar("cacao", "knowledge.reglas_cacao:ReglasCacao",
+                   "ui.vistas.cacao:VISTA", nombre="Cacao")
+REGISTRO.registrar("papa", "knowledge.reglas_papa:ReglasPapa",
+                   "ui.vistas.papa:VISTA", nombre="Papa")
@@ -0,0 +1,182 @@
+import collections.abc
+
+# Parche para compatibilidad con Python 3.10+
+collections.Mapping = collections.abc.Mapping
+collections.MutableMapping = collections.abc.MutableMapping
+collections.MutableSequence = collections.abc.MutableSequence
+collections.Sequence = collections.abc.Sequence
+collections.Iterable = collections.abc.Iterable
+collections.Iterator = collections.abc.Iterator
+collections.MutableSet = collections.abc.MutableSet
+collections.Callable = collections.abc.Callable
+
+import json
+
+from experta import Fact
+
+from knowledge.hechos import CAMPOS_HECHO, Ficha
+
+
+class DiagnosticoItem(collections.abc.Mapping):
+    """
+    Un diagnóstico: plaga, certeza y regla en atributos, y el resto de los
+    campos en su Ficha compartida (no se copia). Se lee como diccionario
+    (`d["plaga"]`, `d.get("umbral")`) y no se puede modificar.
+    """
+
+    __slots__ = ("plaga", "certeza", "regla_activada", "ficha", "_json")
+
+    def __init__(self, plaga, certeza=None, regla_activada=None, ficha=None):
+        object.__setattr__(self, "plaga", plaga)
+        object.__setattr__(self, "certeza", certeza)
+        object.__setattr__(self, "regla_activada", regla_activada)
+        object.__setattr__(self, "ficha", ficha)
+        object.__setattr__(self, "_json", None)
+
+    @classmethod
+    def desde_hecho(cls, hecho):
+        """Item a partir de un hecho Diagnostico (con o sin ficha precalculada)."""
+        ficha = dict.get(hecho, "ficha")
+        if not isinstance(ficha, Ficha):
+            resto = {k: v for k, v in dict.items(hecho)
+                     if k not in CAMPOS_HECHO and not Fact.is_special(k)}
+            ficha = Ficha.interna(resto) if resto else None
+        return cls(dict.get(hecho, "plaga"), dict.get(hecho, "certeza"),
+                   dict.get(hecho, "regla_activada"), ficha)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"{type(self).__name__} es de solo lectura")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, clave):
+        if clave in CAMPOS_HECHO:
+            valor = getattr(self, clave)
+            if valor is not None:
+                return valor
+        elif self.ficha is not None and clave in self.ficha:
+            return self.ficha[clave]
+        raise KeyError(clave)
+
+    def __iter__(self):
+        for clave in CAMPOS_HECHO:
+            if getattr(self, clave) is not None:
+                yield clave
+        if self.ficha is not None:
+            yield from self.ficha
+
+    def __len__(self):
+        propios = sum(getattr(self, clave) is not None for clave in CAMPOS_HECHO)
+        return propios + (len(self.ficha) if self.ficha is not None else 0)
+
+    def _tupla(self):
+        return (self.plaga, self.certeza, self.regla_activada, self.ficha)
+
+    def __eq__(self, otro):
+        if isinstance(otro, DiagnosticoItem):
+            return self is otro or self._tupla() == otro._tupla()
+        return super().__eq__(otro)
+
+    def __hash__(self):
+        return hash(self._tupla())
+
+    def __reduce__(self):
+        return (DiagnosticoItem, self._tupla())
+
+    def __repr__(self):
+        campos = ", ".join(f"{k}={v!r}" for k, v in self.items())
+        return f"DiagnosticoItem({campos})"
+
+    def como_dict(self):
+        resultado = {clave: getattr(self, clave) for clave in CAMPOS_HECHO
+                     if getattr(self, clave) is not None}
+        if self.ficha is not None:
+            resultado.update(self.ficha.como_dict())
+        return resultado
+
+    def como_json(self):
+        # El item es inmutable: se codifica una vez, reutilizando la ficha ya codificada
+        if self._json is None:
+            partes = [f'"{clave}": {json.dumps(getattr(self, clave), ensure_ascii=False)}'
+                      for clave in CAMPOS_HECHO if getattr(self, clave) is not None]
+            if self.ficha is not None and len(self.ficha):
+                partes.append(self.ficha.json())
+            object.__setattr__(self, "_json", "{" + ", ".join(partes) + "}")
+        return self._json
+
+
+class ResultadoDiagnostico(collections.abc.Mapping):
+    """
+    Resultado de diagnosticar. Se usa como el diccionario de siempre
+    (`r["diagnosticos"]`, `r["reglas_activadas"]`, `"error" in r`);
+    `reglas_activadas` se calcula al pedirlo y `como_dict()`/`como_json()`
+    convierten solo cuando hace falta.
+    """
+
+    __slots__ = ("diagnosticos", "error", "metricas")
+
+    def __init__(self, diagnosticos=None, error=None, metricas=None):
+        self.diagnosticos = diagnosticos if diagnosticos is not None else []
+        self.error = error
+        self.metricas = metricas
+
+    @property
+    def reglas_activadas(self):
+        return [d.regla_activada for d in self.diagnosticos]
+
+    def _claves(self):
+        if self.error is not None:
+            yield "error"
+        yield "diagnosticos"
+        yield "reglas_activadas"
+        if self.metricas is not None:
+            yield "metricas"
+
+    def __getitem__(self, clave):
+        if clave == "diagnosticos":
+            return self.diagnosticos
+        if clave == "reglas_activadas":
+            return self.reglas_activadas
+        if clave in ("error", "metricas"):
+            valor = getattr(self, clave)
+            if valor is not None:
+                return valor
+        raise KeyError(clave)
+
+    def __iter__(self):
+        return self._claves()
+
+    def __len__(self):
+        return 2 + (self.error is not None) + (self.metricas is not None)
+
+    def __eq__(self, otro):
+        if isinstance(otro, ResultadoDiagnostico):
+            return (self.diagnosticos == otro.diagnosticos and self.error == otro.error
+                    and self.metricas == otro.metricas)
+        return super().__eq__(otro)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ResultadoDiagnostico({dict(self.items())!r})"
+
+    def copia(self):
+        """Resultado nuevo con su propia lista; los items se comparten."""
+        return ResultadoDiagnostico(list(self.diagnosticos), self.error,
+                                    dict(self.metricas) if self.metricas is not None else None)
+
+    def como_dict(self):
+        resultado = {clave: self[clave] for clave in self}
+        resultado["diagnosticos"] = [d.como_dict() for d in self.diagnosticos]
+        return resultado
+
+    def como_json(self):
+        partes = []
+        if self.error is not None:
+            partes.append(f'"error": {json.dumps(self.error, ensure_ascii=False)}')
+        partes.append(f'"diagnosticos": [{", ".join(d.como_json() for d in self.diagnosticos)}]')
+        partes.append(f'"reglas_activadas": {json.dumps(self.reglas_activadas, ensure_ascii=False)}')
+        if self.metricas is not None:
+            partes.append(f'"metricas": {json.dumps(self.metricas, ensure_ascii=False)}')
+        return "{" + ", ".join(partes) + "}"
+
@@ -0,0 +1,133 @@
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS, armar_resultado, _error_cultivo
+from engine.compilado import obtener_matcher
+
+
+def _siempre(i):
+    return True
+
+
+class SesionDiagnostico:
+    """
+    Diagnóstico de un caso que se actualiza síntoma por síntoma.
+
+    Guarda la máscara del caso y qué reglas del matcher compilado están
+    activadas; al agregar o quitar un síntoma solo se reevalúan las reglas
+    que lo nombran (el índice síntoma -> reglas del matcher) y luego se
+    vuelve a correr la agenda con las activadas. Así un diagnóstico cuyas
+    condiciones dejan de cumplirse desaparece y las reglas "sospecha" que
+    suprimía con NOT(Diagnostico(...)) vuelven. El resultado es el mismo que
+    daría `diagnosticar` con los síntomas actuales.
+
+    Si las reglas del cultivo no se pueden compilar, cada cambio vuelve a
+    diagnosticar el caso completo con experta.
+    """
+
+    def __init__(self, cultivo: str, sintomas=(), sistema: SistemaExpertoPlagas = None):
+        self.cultivo = cultivo
+        self.cultivo_key = cultivo.lower()
+        self.sistema = sistema if sistema is not None else SistemaExpertoPlagas()
+        self._sintomas = set()
+        self._hechos = None
+        self._resultado = None
+        self._matcher = None
+        # Reglas reevaluadas desde que empezó la sesión
+        self.evaluaciones = 0
+        # Reglas cuyo diagnóstico apareció / desapareció con el último cambio
+        self.agregadas, self.quitadas = [], []
+
+        self._soportado = self.cultivo_key in MAPA_CULTIVOS
+        if not self._soportado:
+            self._resultado = _error_cultivo(cultivo)
+            return
+        self._matcher = obtener_matcher(MAPA_CULTIVOS[self.cultivo_key], self.cultivo_key)
+        if self._matcher is not None:
+            self._m = 0
+            # Sin síntomas solo están activadas las reglas fijas (p. ej. sin_diagnostico)
+            self._activadas = self._matcher._fijas
+        for s in sintomas:
+            self._cambiar(s, True)
+        self._resolver()
+
+    @property
+    def sintomas(self):
+        return frozenset(self._sintomas)
+
+    @property
+    def resultado(self):
+        return self._resultado
+
+    def _cambiar(self, sintoma, presente):
+        if (sintoma in self._sintomas) == presente:
+            return False
+        if presente:
+            self._sintomas.add(sintoma)
+        else:
+            self._sintomas.discard(sintoma)
+        matcher = self._matcher
+        if matcher is None:
+            return True
+        bit = matcher.indice.get(sintoma)
+        if bit is None:
+            return True  # ninguna regla lo nombra
+        self._m ^= bit
+        m, reglas, orden = self._m, matcher.reglas, matcher._orden_agenda
+        afectadas = matcher._por_sintoma[bit.bit_length() - 1]
+        while afectadas:
+            p = afectadas & -afectadas
+            afectadas ^= p
+            self.evaluaciones += 1
+            if reglas[orden[p.bit_length() - 1]].activacion.evaluar(m):
+                self._activadas |= p
+            else:
+                self._activadas &= ~p
+        return True
+
+    def _resolver(self):
+        if not self._soportado:
+            return self._resultado
+        if self._matcher is None:
+            resultado = self.sistema.diagnosticar(self.cultivo_key, list(self._sintomas))
+            hechos = resultado["diagnosticos"]
+        else:
+            m, reglas = self._m, self._matcher.reglas
+            disparos = self._matcher.disparar(_siempre, lambda i: reglas[i].declaracion.evaluar(m),
+                                              None, self._activadas)
+            hechos = [hecho for _, hecho in disparos]
+            if hechos == self._hechos:
+                self.agregadas, self.quitadas = [], []
+                return self._resultado
+            resultado = armar_resultado(hechos)
+
+        antes = set(self._resultado["reglas_activadas"]) if self._resultado is not None else set()
+        ahora = resultado["reglas_activadas"]
+        self.agregadas = [r for r in ahora if r not in antes]
+        self.quitadas = sorted(antes.difference(ahora), key=str)
+        self._hechos, self._resultado = hechos, resultado
+        return resultado
+
+    def agregar_sintoma(self, sintoma: str):
+        """Agrega un síntoma y devuelve el diagnóstico actualizado."""
+        if self._cambiar(sintoma, True):
+            return self._resolver()
+        self.agregadas, self.quitadas = [], []
+        return self._resultado
+
+    def quitar_sintoma(self, sintoma: str):
+        """Quita un síntoma y devuelve el diagnóstico actualizado."""
+        if self._cambiar(sintoma, False):
+            return self._resolver()
+        self.agregadas, self.quitadas = [], []
+        return self._resultado
+
+    def actualizar(self, sintomas):
+        """Deja la sesión con exactamente `sintomas` (p. ej. las casillas marcadas) y diagnostica una vez."""
+        nuevos = set(sintomas)
+        cambio = False
+        for s in self._sintomas - nuevos:
+            cambio |= self._cambiar(s, False)
+        for s in nuevos - self._sintomas:
+            cambio |= self._cambiar(s, True)
+        if cambio:
+            return self._resolver()
+        self.agregadas, self.quitadas = [], []
+        return self._resultado
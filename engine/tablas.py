@@ -0,0 +1,147 @@
+import hashlib
+import inspect
+import threading
+from array import array
+
+from engine.compilado import HechoCompilado, obtener_matcher
+
+# Cultivos con más síntomas referenciados que esto no se tabulan (2^n entradas)
+LIMITE_TABLA = 18
+
+
+def firma_reglas(clase_reglas, orden):
+    """
+    Para qué reglas se armó una tabla: el archivo de reglas y el orden en
+    que la red de experta de este proceso dispara reglas con igual salience
+    (de él depende qué diagnósticos parciales sobreviven).
+    """
+    try:
+        with open(inspect.getsourcefile(clase_reglas), "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+    except (TypeError, OSError):
+        digest = None
+    return (clase_reglas.__module__, clase_reglas.__qualname__, digest, tuple(orden))
+
+
+class TablaCultivo:
+    """
+    Resultado de cada combinación de síntomas de un cultivo, precalculado.
+
+    `indices[m]` es el resultado de la máscara m (bit i = `vocabulario[i]`)
+    dentro de `resultados`, donde cada resultado distinto aparece una vez
+    como la secuencia de hechos que se declaran.
+    """
+
+    def __init__(self, cultivo_key, vocabulario, indices, resultados, firma):
+        self.cultivo_key = cultivo_key
+        self.vocabulario = tuple(vocabulario)
+        self.indice = {s: 1 << i for i, s in enumerate(self.vocabulario)}
+        self.indices = indices
+        self.resultados = resultados
+        self.firma = firma
+
+    def mascara(self, sintomas):
+        m = 0
+        indice = self.indice
+        for s in sintomas:
+            m |= indice.get(s, 0)
+        return m
+
+    def declarados(self, sintomas):
+        """HechoCompilado declarados para `sintomas` (la tupla guardada, sin copiar)."""
+        return self.resultados[self.indices[self.mascara(sintomas)]]
+
+    def hechos(self, sintomas):
+        """Hechos declarados para `sintomas`, como los devolvería el motor."""
+        # InitialFact ocupa f-0 y el Caso f-1
+        return [hecho.crear(i) for i, hecho in enumerate(self.declarados(sintomas), start=2)]
+
+    def bytes(self):
+        return self.indices.itemsize * len(self.indices)
+
+
+def _tabular(cultivo_key, vocabulario, resultado_de, firma):
+    ids = {}
+    resultados = []
+    indices = array("H", bytes(2 << len(vocabulario)))
+    for m in range(1 << len(vocabulario)):
+        hechos = resultado_de(m)
+        clave = tuple(h.clave for h in hechos)
+        i = ids.get(clave)
+        if i is None:
+            i = ids[clave] = len(resultados)
+            resultados.append(tuple(hechos))
+            if i > 0xFFFF:
+                indices = array("I", indices)
+        indices[m] = i
+    return TablaCultivo(cultivo_key, vocabulario, indices, resultados, firma)
+
+
+def construir_tabla(clase_reglas, cultivo_key, fuente: str = "compilado",
+                    limite: int = LIMITE_TABLA):
+    """
+    Tabula el cultivo completo, o devuelve None si sus reglas no se pueden
+    compilar o nombran más de `limite` síntomas.
+
+    Con fuente="experta" cada combinación se corre en el motor real (lento:
+    minutos para 2^18); con "compilado" se usa el matcher equivalente.
+    """
+    matcher = obtener_matcher(clase_reglas, cultivo_key)
+    if matcher is None or len(matcher.vocabulario) > limite:
+        return None
+    vocabulario = matcher.vocabulario
+
+    if fuente == "compilado":
+        reglas = matcher.reglas
+
+        def resultado_de(m):
+            disparos = matcher.disparar(lambda i: reglas[i].activacion.evaluar(m),
+                                        lambda i: reglas[i].declaracion.evaluar(m))
+            return [hecho for _, hecho in disparos]
+
+        orden = [r.nombre for r in reglas]
+    elif fuente == "experta":
+        from knowledge.hechos import Caso
+
+        motor = clase_reglas()
+        orden = [nodo.rule.__name__ for nodo in motor.matcher._get_conflict_set_nodes()]
+
+        def resultado_de(m):
+            motor.reset()
+            motor.declare(Caso(cultivo=cultivo_key,
+                               sintomas={s for i, s in enumerate(vocabulario) if m >> i & 1}))
+            motor.run()
+            # InitialFact (f-0) y Caso (f-1) no son parte del resultado
+            declarados = sorted((h for h in motor.facts.values() if h.__factid__ >= 2),
+                                key=lambda h: h.__factid__)
+            return [HechoCompilado(h) for h in declarados]
+    else:
+        raise ValueError(f"Fuente '{fuente}' desconocida. Opciones: compilado, experta")
+
+    return _tabular(cultivo_key, vocabulario, resultado_de, firma_reglas(clase_reglas, orden))
+
+
+_TABLAS = {}
+_LOCK = threading.Lock()
+
+
+def obtener_tabla(clase_reglas, cultivo_key):
+    """
+    Tabla del cultivo para este proceso (se arma una vez, con el matcher
+    compilado) o None si el cultivo es demasiado grande o no compila.
+
+    No se guarda en disco: el orden de disparo de experta cambia de un
+    proceso a otro (aun con PYTHONHASHSEED fijo, porque también depende de
+    la identidad de los objetos) y con él los resultados, así que una tabla
+    de otro proceso casi nunca serviría.
+    """
+    clave = (clase_reglas, cultivo_key)
+    try:
+        return _TABLAS[clave]
+    except KeyError:
+        pass
+    with _LOCK:
+        if clave not in _TABLAS:
+            _TABLAS[clave] = construir_tabla(clase_reglas, cultivo_key)
+        return _TABLAS[clave]
+
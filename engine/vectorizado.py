@@ -0,0 +1,207 @@
+import threading
+
+import numpy as np
+
+from engine.compilado import obtener_matcher
+from engine.motor import armar_resultado
+
+
+def _patrones(bits):
+    """
+    Filas distintas de una matriz booleana y, para cada fila, cuál le toca.
+
+    Las filas se empaquetan en palabras de 64 bits para que np.unique ordene
+    enteros en vez de comparar filas completas.
+    """
+    empaquetado = np.packbits(bits, axis=1)
+    relleno = -empaquetado.shape[1] % 8
+    if relleno:
+        empaquetado = np.pad(empaquetado, ((0, 0), (0, relleno)))
+    palabras = np.ascontiguousarray(empaquetado).view(np.uint64)
+    if palabras.shape[1] == 1:
+        patrones, fila_patron = np.unique(palabras[:, 0], return_inverse=True)
+        patrones = patrones[:, None]
+    else:
+        patrones, fila_patron = np.unique(palabras, axis=0, return_inverse=True)
+    return patrones, fila_patron.reshape(-1)
+
+
+class _MatrizCondiciones:
+    """
+    Las condiciones de todas las reglas de un cultivo como matrices R x V.
+
+    Una regla cumple si tiene todos sus síntomas requeridos, ninguno prohibido
+    y al menos `minimo` del grupo. Las condiciones que no encajan en esa forma
+    se evalúan por su tabla de verdad.
+    """
+
+    def __init__(self, condiciones, n_sintomas):
+        n = len(condiciones)
+        self.requeridos = np.zeros((n, n_sintomas), dtype=np.float32)
+        self.prohibidos = np.zeros((n, n_sintomas), dtype=np.float32)
+        self.grupo = np.zeros((n, n_sintomas), dtype=np.float32)
+        self.minimo = np.zeros(n, dtype=np.float32)
+        self.por_tabla = []
+
+        for r, condicion in enumerate(condiciones):
+            forma = condicion.forma
+            if forma == "nunca":
+                self.minimo[r] = n_sintomas + 1
+            elif forma == "tabla":
+                columnas = np.array([b.bit_length() - 1 for b in condicion.bits])
+                self.por_tabla.append((r, columnas, np.array(condicion.tabla, dtype=bool)))
+            elif forma == "mascara":
+                for matriz, mascara in ((self.requeridos, condicion.requeridos),
+                                        (self.prohibidos, condicion.prohibidos),
+                                        (self.grupo, condicion.grupo)):
+                    for j in range(n_sintomas):
+                        if mascara >> j & 1:
+                            matriz[r, j] = 1
+                self.minimo[r] = condicion.minimo
+        self.n_requeridos = self.requeridos.sum(axis=1)
+        # Las tres pruebas en un solo producto de matrices
+        self._pesos = np.concatenate([self.requeridos, self.prohibidos, self.grupo]).T
+
+    def evaluar(self, observaciones):
+        n = len(self.minimo)
+        conteos = observaciones.astype(np.float32) @ self._pesos
+        cumple = ((conteos[:, :n] == self.n_requeridos)
+                  & (conteos[:, n:2 * n] == 0)
+                  & (conteos[:, 2 * n:] >= self.minimo))
+        for r, columnas, tabla in self.por_tabla:
+            pesos = 1 << np.arange(len(columnas))
+            cumple[:, r] = tabla[observaciones[:, columnas].astype(np.int64) @ pesos]
+        return cumple
+
+
+class ResultadoVectorizado:
+    """
+    Diagnósticos de N observaciones en forma de arreglos.
+
+    Los disparos de la observación i ocupan `inicio[i]:inicio[i + 1]` en
+    `reglas` (índice en `matriz.reglas`), `hechos` (índice en `matriz.hechos`)
+    y `certezas`, en orden de declaración. `resultado[i]` arma el diccionario
+    habitual de diagnosticar solo cuando se pide.
+    """
+
+    def __init__(self, matriz, inicio, reglas, hechos, certezas):
+        self.matriz = matriz
+        self.inicio = inicio
+        self.reglas = reglas
+        self.hechos = hechos
+        self.certezas = certezas
+
+    def __len__(self):
+        return len(self.inicio) - 1
+
+    def disparos(self, i):
+        """Pares (nombre de regla, certeza) de la observación i."""
+        desde, hasta = self.inicio[i], self.inicio[i + 1]
+        return [(self.matriz.reglas[r].nombre, float(c))
+                for r, c in zip(self.reglas[desde:hasta], self.certezas[desde:hasta])]
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i %= len(self)
+        desde, hasta = self.inicio[i], self.inicio[i + 1]
+        return armar_resultado([self.matriz.hechos[h] for h in self.hechos[desde:hasta]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class MatrizReglas:
+    """
+    Evalúa las reglas de un cultivo sobre una matriz N x V de observaciones.
+
+    Las condiciones de activación se calculan para todas las filas a la vez;
+    la agenda (orden de disparo y supresión por NOT) se resuelve una sola vez
+    por cada combinación distinta de reglas activadas, con el mismo algoritmo
+    que MatcherCompilado, y se reparte a las filas que la comparten.
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.vocabulario = matcher.vocabulario
+        self.columna = {s: j for j, s in enumerate(self.vocabulario)}
+        self.reglas = matcher.reglas
+
+        self.hechos = []
+        self._id_hecho = {}
+        for regla in self.reglas:
+            for hecho in regla.hechos:
+                if hecho.clave not in self._id_hecho:
+                    self._id_hecho[hecho.clave] = len(self.hechos)
+                    self.hechos.append(hecho)
+
+        n_sintomas = len(self.vocabulario)
+        self._activacion = _MatrizCondiciones([r.activacion for r in self.reglas], n_sintomas)
+        self._declaracion = _MatrizCondiciones([r.declaracion for r in self.reglas], n_sintomas)
+        self._con_hechos = np.array([bool(r.hechos) for r in self.reglas])
+        self._certeza = np.array([float(h.campos.get("certeza", 0)) for h in self.hechos])
+
+    def codificar(self, conjuntos):
+        """Listas de síntomas -> matriz booleana N x V (se ignoran síntomas desconocidos)."""
+        conjuntos = list(conjuntos)
+        observaciones = np.zeros((len(conjuntos), len(self.vocabulario)), dtype=bool)
+        columna = self.columna
+        for i, sintomas in enumerate(conjuntos):
+            for s in sintomas:
+                j = columna.get(s)
+                if j is not None:
+                    observaciones[i, j] = True
+        return observaciones
+
+    def evaluar(self, observaciones):
+        """Evalúa una matriz N x V (columnas en el orden de `vocabulario`)."""
+        observaciones = np.asarray(observaciones, dtype=bool)
+        if observaciones.ndim != 2 or observaciones.shape[1] != len(self.vocabulario):
+            raise ValueError(
+                f"Se esperaba una matriz N x {len(self.vocabulario)} de observaciones.")
+        n_reglas = len(self.reglas)
+
+        activas = self._activacion.evaluar(observaciones)
+        declaran = self._declaracion.evaluar(observaciones) & activas & self._con_hechos
+        patrones, fila_patron = _patrones(np.concatenate([activas, declaran], axis=1))
+
+        # Secuencia de disparos de cada patrón distinto, rellenada a lo ancho
+        secuencias = []
+        for patron in patrones:
+            bits = np.unpackbits(patron.view(np.uint8))[:2 * n_reglas].astype(bool)
+            act, decl = bits[:n_reglas], bits[n_reglas:]
+            secuencias.append(self.matcher.disparar(lambda i: act[i], lambda i: decl[i]))
+        ancho = max((len(s) for s in secuencias), default=0)
+        largo = np.array([len(s) for s in secuencias], dtype=np.int64)
+        tabla_reglas = np.zeros((len(secuencias), ancho), dtype=np.int64)
+        tabla_hechos = np.zeros((len(secuencias), ancho), dtype=np.int64)
+        for u, secuencia in enumerate(secuencias):
+            for k, (r, hecho) in enumerate(secuencia):
+                tabla_reglas[u, k] = r
+                tabla_hechos[u, k] = self._id_hecho[hecho.clave]
+
+        largo_fila = largo[fila_patron]
+        inicio = np.zeros(len(observaciones) + 1, dtype=np.int64)
+        np.cumsum(largo_fila, out=inicio[1:])
+        ocupado = np.arange(ancho) < largo_fila[:, None]
+        reglas = tabla_reglas[fila_patron][ocupado]
+        hechos = tabla_hechos[fila_patron][ocupado]
+        return ResultadoVectorizado(self, inicio, reglas, hechos, self._certeza[hechos])
+
+    def evaluar_conjuntos(self, conjuntos):
+        return self.evaluar(self.codificar(conjuntos))
+
+
+_MATRICES = {}
+_LOCK = threading.Lock()
+
+
+def obtener_matriz(clase_reglas, cultivo_key):
+    """Matriz de reglas del cultivo (una por proceso) o None si no se puede compilar."""
+    clave = (clase_reglas, cultivo_key)
+    with _LOCK:
+        if clave not in _MATRICES:
+            matcher = obtener_matcher(clase_reglas, cultivo_key)
+            _MATRICES[clave] = MatrizReglas(matcher) if matcher is not None else None
+        return _MATRICES[clave]
@@ -0,0 +1,490 @@
+"""
+Bases de conocimiento declarativas: un cultivo descrito en JSON (o TOML, o
+YAML si está PyYAML) se compila a una clase de reglas de experta igual a
+las escritas a mano en reglas_*.py, de la que salen también el matcher
+compilado y las tablas.
+
+    {
+      "cultivo": "mango",
+      "nombre": "Mango",
+      "descripcion": "Guía técnica de ...",
+      "reglas": [
+        {"nombre": "antracnosis_completa",
+         "requiere": ["manchas_negras_frutos", "lesiones_hundidas"],
+         "diagnostico": {"plaga": "Antracnosis", "certeza": 1.0,
+                         "umbral": "5%", "recomendaciones": ["..."]}},
+        {"nombre": "antracnosis_parcial",
+         "grupos": [{"sintomas": ["manchas_negras_frutos", "lesiones_hundidas",
+                                  "caida_flores"], "minimo": 2}],
+         "excluye": ["frutos_sanos"],
+         "suprimida_por": ["Antracnosis"],
+         "diagnostico": {"plaga": "Antracnosis – sospecha", "certeza": 0.6}},
+        {"nombre": "sin_diagnostico", "sin_otro_diagnostico": true, "salience": -1,
+         "diagnostico": {"plaga": "Sin plaga identificada", "certeza": 0.0}}
+      ]
+    }
+
+`requiere`: todos presentes; `grupos`: de cada lista, al menos `minimo`
+(1 por omisión) y como mucho `maximo` (todos por omisión);
+`excluye`: ninguno presente; `suprimida_por`: no dispara si ya hay un
+Diagnostico con esa plaga (NOT(Diagnostico(plaga=...)); a las reglas que
+la declaran se les sube la `salience` por encima de la de esta, para que
+disparen antes en cualquier proceso); `sin_otro_diagnostico`:
+solo si no hay ningún Diagnostico (con `salience` negativa se asegura que
+corra después de las demás). `regla_activada` vale el nombre de la regla si
+no se indica.
+
+La compilación se guarda en disco (por defecto en __pycache__ junto al
+archivo) con el hash del contenido como clave, así que volver a cargar una
+base que no cambió no vuelve a leer ni generar nada.
+"""
+import collections.abc
+
+# Parche para compatibilidad con Python 3.10+
+collections.Mapping = collections.abc.Mapping
+collections.MutableMapping = collections.abc.MutableMapping
+collections.MutableSequence = collections.abc.MutableSequence
+collections.Sequence = collections.abc.Sequence
+collections.Iterable = collections.abc.Iterable
+collections.Iterator = collections.abc.Iterator
+collections.MutableSet = collections.abc.MutableSet
+collections.Callable = collections.abc.Callable
+
+import hashlib
+import importlib.util
+import json
+import keyword
+import marshal
+import math
+import os
+import sys
+import threading
+import types
+
+# Cambia cuando cambia el código que se genera: invalida las cachés en disco
+VERSION_FORMATO = 2
+
+# Directorio de la caché compilada (por defecto, __pycache__ junto a la base)
+DIRECTORIO_CACHE = os.environ.get("PLAGAS_CACHE_BASES")
+
+_CLAVES_BASE = {"cultivo", "nombre", "descripcion", "clase", "sintomas", "reglas"}
+_CLAVES_REGLA = {"nombre", "requiere", "grupos", "excluye", "suprimida_por",
+                 "sin_otro_diagnostico", "salience", "diagnostico"}
+
+
+class BaseInvalida(ValueError):
+    """El archivo no describe una base de conocimiento válida."""
+    pass
+
+
+def leer_datos(ruta):
+    """Contenido de la base según la extensión (.json, .toml, .yaml/.yml)."""
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    return _parsear(contenido, extension, ruta)
+
+
+def _parsear(contenido, extension, ruta):
+    try:
+        if extension == ".json":
+            return json.loads(contenido.decode("utf-8"))
+        if extension == ".toml":
+            import tomllib
+            return tomllib.loads(contenido.decode("utf-8"))
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise BaseInvalida(f"{ruta}: hace falta PyYAML para leer bases YAML") from None
+            return yaml.safe_load(contenido)
+    except BaseInvalida:
+        raise
+    except Exception as exc:
+        raise BaseInvalida(f"{ruta}: {exc}") from exc
+    raise BaseInvalida(f"{ruta}: formato '{extension}' no soportado (json, toml, yaml)")
+
+
+def _lista_sintomas(regla, campo, valor):
+    if not isinstance(valor, list) or not all(isinstance(s, str) and s for s in valor):
+        raise BaseInvalida(f"Regla '{regla}': '{campo}' debe ser una lista de síntomas")
+    return sorted(set(valor))
+
+
+def _identificador(texto):
+    """Nombre que puede ir tal cual en el código generado."""
+    return isinstance(texto, str) and texto.isidentifier() and not keyword.iskeyword(texto)
+
+
+def _escalar(valor):
+    """Valor que `repr` escribe como literal de Python (sin nan, inf ni fechas)."""
+    if valor is None or isinstance(valor, (str, bool, int)):
+        return True
+    return isinstance(valor, float) and math.isfinite(valor)
+
+
+def _literal(valor):
+    return _escalar(valor) or (isinstance(valor, (list, tuple)) and all(map(_escalar, valor)))
+
+
+def _ordenar_supresiones(reglas):
+    """
+    Sube la salience de las reglas que declaran una plaga de `suprimida_por`
+    por encima de la de las reglas que esa plaga suprime: con salience igual,
+    cuál dispara primero depende del orden de la agenda en cada proceso.
+    """
+    declarantes = {}
+    for regla in reglas:
+        declarantes.setdefault(regla["diagnostico"]["plaga"], []).append(regla)
+    for _ in range(len(reglas) + 1):
+        cambio = False
+        for regla in reglas:
+            for plaga in regla["suprimida_por"]:
+                for otra in declarantes.get(plaga, ()):
+                    if otra is not regla and otra["salience"] <= regla["salience"]:
+                        otra["salience"] = regla["salience"] + 1
+                        cambio = True
+        if not cambio:
+            return
+    ciclo = sorted(r["nombre"] for r in reglas if r["suprimida_por"])
+    raise BaseInvalida(f"'suprimida_por' forma un ciclo entre reglas: {', '.join(ciclo)}")
+
+
+def validar(datos):
+    """Revisa la base y devuelve una copia normalizada (o lanza BaseInvalida)."""
+    if not isinstance(datos, dict):
+        raise BaseInvalida("La base debe ser un objeto con 'cultivo' y 'reglas'")
+    desconocidas = set(datos) - _CLAVES_BASE
+    if desconocidas:
+        raise BaseInvalida(f"Claves desconocidas: {', '.join(sorted(desconocidas))}")
+    cultivo = datos.get("cultivo")
+    if not isinstance(cultivo, str) or not cultivo:
+        raise BaseInvalida("Falta 'cultivo'")
+    cultivo = cultivo.lower()
+    clase = datos.get("clase") or "Reglas" + "".join(
+        p.capitalize() for p in cultivo.replace("-", "_").split("_") if p)
+    if not _identificador(clase):
+        raise BaseInvalida(f"{clase!r} no sirve como nombre de clase")
+    if not isinstance(datos.get("reglas"), list) or not datos["reglas"]:
+        raise BaseInvalida("'reglas' debe ser una lista no vacía")
+
+    reglas, nombres, usados = [], set(), set()
+    for regla in datos["reglas"]:
+        if not isinstance(regla, dict):
+            raise BaseInvalida("Cada regla debe ser un objeto")
+        nombre = regla.get("nombre")
+        if not _identificador(nombre) or nombre.startswith("_"):
+            raise BaseInvalida(f"Nombre de regla inválido: {nombre!r}")
+        if nombre in nombres:
+            raise BaseInvalida(f"Regla '{nombre}' repetida")
+        nombres.add(nombre)
+        desconocidas = set(regla) - _CLAVES_REGLA
+        if desconocidas:
+            raise BaseInvalida(f"Regla '{nombre}': claves desconocidas: {', '.join(sorted(desconocidas))}")
+
+        requiere = _lista_sintomas(nombre, "requiere", regla.get("requiere", []))
+        excluye = _lista_sintomas(nombre, "excluye", regla.get("excluye", []))
+        grupos = []
+        for grupo in regla.get("grupos", []):
+            if not isinstance(grupo, dict) or "sintomas" not in grupo:
+                raise BaseInvalida(f"Regla '{nombre}': cada grupo necesita 'sintomas'")
+            sintomas = _lista_sintomas(nombre, "grupos", grupo["sintomas"])
+            maximo = grupo.get("maximo", len(sintomas))
+            minimo = grupo.get("minimo", 1 if "maximo" not in grupo else 0)
+            if (not isinstance(minimo, int) or not isinstance(maximo, int)
+                    or not 0 <= minimo <= maximo <= len(sintomas)):
+                raise BaseInvalida(f"Regla '{nombre}': se necesita 0 <= minimo <= maximo <= {len(sintomas)}")
+            grupos.append({"sintomas": sintomas, "minimo": minimo, "maximo": maximo})
+        if set(requiere) & set(excluye):
+            raise BaseInvalida(f"Regla '{nombre}': un síntoma no puede ser requerido y excluido")
+        usados.update(requiere, excluye, *(g["sintomas"] for g in grupos))
+
+        suprimida_por = regla.get("suprimida_por", [])
+        if not isinstance(suprimida_por, list) or not all(isinstance(p, str) for p in suprimida_por):
+            raise BaseInvalida(f"Regla '{nombre}': 'suprimida_por' debe ser una lista de plagas")
+        salience = regla.get("salience", 0)
+        if not isinstance(salience, int) or isinstance(salience, bool):
+            raise BaseInvalida(f"Regla '{nombre}': 'salience' debe ser un entero")
+
+        diagnostico = regla.get("diagnostico")
+        if not isinstance(diagnostico, dict) or not isinstance(diagnostico.get("plaga"), str):
+            raise BaseInvalida(f"Regla '{nombre}': falta 'diagnostico' con 'plaga'")
+        invalidos = [repr(k) for k in diagnostico if not _identificador(k)]
+        if invalidos:
+            raise BaseInvalida(f"Regla '{nombre}': campos de diagnóstico inválidos: {', '.join(invalidos)}")
+        for campo, valor in diagnostico.items():
+            if not _literal(valor):
+                raise BaseInvalida(f"Regla '{nombre}': '{campo}' debe ser texto, número finito, "
+                                   f"booleano, nulo o una lista de ellos (no {valor!r})")
+        certeza = diagnostico.get("certeza", 1.0)
+        if not isinstance(certeza, (int, float)) or isinstance(certeza, bool) or not 0 <= certeza <= 1:
+            raise BaseInvalida(f"Regla '{nombre}': 'certeza' debe estar entre 0 y 1")
+        diagnostico = dict(diagnostico, certeza=float(certeza))
+        diagnostico.setdefault("regla_activada", nombre)
+
+        reglas.append({
+            "nombre": nombre, "requiere": requiere, "grupos": grupos, "excluye": excluye,
+            "suprimida_por": list(dict.fromkeys(suprimida_por)),
+            "sin_otro_diagnostico": bool(regla.get("sin_otro_diagnostico", False)),
+            "salience": salience, "diagnostico": diagnostico,
+        })
+    _ordenar_supresiones(reglas)
+
+    sintomas = datos.get("sintomas")
+    if sintomas is None:
+        sintomas = sorted(usados)
+    elif not isinstance(sintomas, list):
+        raise BaseInvalida("'sintomas' debe ser una lista")
+    return {
+        "cultivo": cultivo,
+        "nombre": datos.get("nombre") or cultivo.capitalize(),
+        "descripcion": datos.get("descripcion", ""),
+        "clase": clase,
+        "sintomas": list(sintomas),
+        "reglas": reglas,
+    }
+
+
+def _conjunto(sintomas):
+    return "{" + ", ".join(repr(s) for s in sintomas) + "}"
+
+
+def _condicion(regla):
+    partes = []
+    if regla["requiere"]:
+        partes.append(f"{_conjunto(regla['requiere'])}.issubset(s)")
+    for grupo in regla["grupos"]:
+        conjunto, minimo, maximo = _conjunto(grupo["sintomas"]), grupo["minimo"], grupo["maximo"]
+        if maximo < len(grupo["sintomas"]):
+            partes.append(f"{minimo} <= len({conjunto} & s) <= {maximo}")
+        elif minimo:
+            partes.append(f"len({conjunto} & s) >= {minimo}")
+    if regla["excluye"]:
+        partes.append(f"not ({_conjunto(regla['excluye'])} & s)")
+    return " and ".join(partes)
+
+
+def generar_fuente(datos):
+    """
+    Código Python de la clase de reglas, con la misma forma que reglas_*.py
+    (las condiciones quedan como literales, que el matcher compilado entiende).
+    """
+    base = validar(datos)
+    lineas = [
+        "from knowledge.hechos import Caso, Diagnostico, precalcular_diagnosticos",
+        "from experta import KnowledgeEngine, Rule, TEST, MATCH, NOT",
+        "",
+        f"CULTIVO = {base['cultivo']!r}",
+        f"NOMBRE = {base['nombre']!r}",
+        f"DESCRIPCION = {base['descripcion']!r}",
+        f"SINTOMAS = {base['sintomas']!r}",
+        "",
+        "",
+        "@precalcular_diagnosticos",
+        f"class {base['clase']}(KnowledgeEngine):",
+        f"    {('Reglas de ' + base['nombre'] + ' generadas desde una base declarativa')!r}",
+    ]
+    for regla in base["reglas"]:
+        patrones = [f"Caso(cultivo={base['cultivo']!r}, sintomas=MATCH.s)"]
+        condicion = _condicion(regla)
+        if condicion:
+            patrones.append(f"TEST(lambda s: {condicion})")
+        patrones += [f"NOT(Diagnostico(plaga={plaga!r}))" for plaga in regla["suprimida_por"]]
+        if regla["sin_otro_diagnostico"]:
+            patrones.append("NOT(Diagnostico())")
+        if regla["salience"]:
+            patrones.append(f"salience={regla['salience']}")
+        lineas += [
+            "",
+            "    @Rule(",
+            *(f"        {p}," for p in patrones),
+            "    )",
+            f"    def {regla['nombre']}(self):",
+            # Los campos van como un dict literal: ningún texto de la base llega al código tal cual
+            f"        self.declare(Diagnostico(**{regla['diagnostico']!r}))",
+        ]
+    return "\n".join(lineas) + "\n"
+
+
+class BaseConocimiento:
+    """Una base declarativa ya compilada: clase de reglas y datos del cultivo."""
+
+    __slots__ = ("ruta", "digest", "clave", "nombre", "descripcion", "sintomas", "clase")
+
+    def __init__(self, ruta, digest, modulo):
+        self.ruta = ruta
+        self.digest = digest
+        self.clave = modulo.CULTIVO
+        self.nombre = modulo.NOMBRE
+        self.descripcion = modulo.DESCRIPCION
+        self.sintomas = list(modulo.SINTOMAS)
+        self.clase = next(v for v in vars(modulo).values()
+                          if isinstance(v, type) and v.__module__ == modulo.__name__)
+
+    def matcher(self):
+        """Matcher compilado del cultivo (None si no compila)."""
+        from engine.compilado import obtener_matcher
+        return obtener_matcher(self.clase, self.clave)
+
+    def tabla(self):
+        from engine.tablas import obtener_tabla
+        return obtener_tabla(self.clase, self.clave)
+
+
+def _ruta_cache(ruta, digest, directorio):
+    directorio = directorio or DIRECTORIO_CACHE or os.path.join(os.path.dirname(ruta), "__pycache__")
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return os.path.join(directorio, f"{nombre}.{digest[:20]}.base")
+
+
+def _cabecera():
+    return importlib.util.MAGIC_NUMBER + VERSION_FORMATO.to_bytes(4, "little")
+
+
+def _leer_cache(ruta_cache):
+    try:
+        with open(ruta_cache, "rb") as f:
+            contenido = f.read()
+    except OSError:
+        return None
+    cabecera = _cabecera()
+    if not contenido.startswith(cabecera):
+        return None
+    try:
+        return marshal.loads(contenido[len(cabecera):])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _escribir_cache(ruta_cache, codigo):
+    try:
+        os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+        temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(_cabecera() + marshal.dumps(codigo))
+        os.replace(temporal, ruta_cache)
+    except OSError:
+        pass  # sin caché en disco: la próxima vez se vuelve a compilar
+
+
+_BASES = {}
+_LOCK = threading.Lock()
+
+
+def cargar_base(ruta, directorio_cache: str = None):
+    """
+    Compila (o recupera de la caché en disco) la base de `ruta`.
+
+    Dentro del proceso se devuelve siempre la misma BaseConocimiento mientras
+    el archivo no cambie, de modo que su clase, matcher y tablas se reutilizan.
+    """
+    ruta = os.path.abspath(ruta)
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    digest = hashlib.sha256(contenido).hexdigest()
+    with _LOCK:
+        base = _BASES.get(ruta)
+        if base is not None and base.digest == digest:
+            return base
+
+        ruta_cache = _ruta_cache(ruta, digest, directorio_cache)
+        codigo = _leer_cache(ruta_cache)
+        if codigo is None:
+            datos = _parsear(contenido, os.path.splitext(ruta)[1].lower(), ruta)
+            codigo = compile(generar_fuente(datos), ruta, "exec")
+            _escribir_cache(ruta_cache, codigo)
+
+        nombre_modulo = f"knowledge.bases.{os.path.splitext(os.path.basename(ruta))[0]}_{digest[:12]}"
+        modulo = types.ModuleType(nombre_modulo)
+        # El archivo de la base hace de "fuente": su contenido firma tablas y caché
+        modulo.__file__ = ruta
+        sys.modules[nombre_modulo] = modulo
+        exec(codigo, modulo.__dict__)
+        base = _BASES[ruta] = BaseConocimiento(ruta, digest, modulo)
+        return base
+
+
+def _condicion_de(condicion):
+    """
+    requiere / grupos / excluye equivalentes a una Condicion del matcher
+    compilado, o None si su tabla de verdad no depende solo de cuántos
+    síntomas libres hay.
+    """
+    variables, tabla = condicion.variables, condicion.tabla
+    verdaderas = [i for i, valor in enumerate(tabla) if valor]
+    n = len(variables)
+    siempre = [j for j in range(n) if all(i >> j & 1 for i in verdaderas)]
+    nunca = [j for j in range(n) if not any(i >> j & 1 for i in verdaderas)]
+    libres = [j for j in range(n) if j not in siempre and j not in nunca]
+    cuentas = sorted({sum(i >> j & 1 for j in libres) for i in verdaderas})
+    if not cuentas:
+        return None
+    minimo, maximo = cuentas[0], cuentas[-1]
+    for i in range(len(tabla)):
+        esperado = (all(i >> j & 1 for j in siempre) and not any(i >> j & 1 for j in nunca)
+                    and minimo <= sum(i >> j & 1 for j in libres) <= maximo)
+        if bool(tabla[i]) != esperado:
+            return None
+
+    datos = {}
+    if siempre:
+        datos["requiere"] = sorted(variables[j] for j in siempre)
+    if libres and (minimo > 0 or maximo < len(libres)):
+        grupo = {"sintomas": sorted(variables[j] for j in libres), "minimo": minimo}
+        if maximo < len(libres):
+            grupo["maximo"] = maximo
+        datos["grupos"] = [grupo]
+    if nunca:
+        datos["excluye"] = sorted(variables[j] for j in nunca)
+    return datos
+
+
+def exportar_base(clase_reglas, cultivo_key: str, nombre: str = None, descripcion: str = ""):
+    """
+    Convierte una clase de reglas escrita a mano en datos de una base
+    declarativa (para migrar cultivos). Usa el análisis del matcher
+    compilado; lanza BaseInvalida si alguna regla no cabe en el formato
+    (también si su condición nunca se cumple: no se pierde en silencio).
+    """
+    from engine.compilado import MatcherCompilado, ReglasNoCompilables
+
+    try:
+        matcher = MatcherCompilado(clase_reglas, cultivo_key)
+    except ReglasNoCompilables as exc:
+        raise BaseInvalida(str(exc)) from exc
+
+    orden = {nombre_regla: i for i, nombre_regla in enumerate(
+        n for n, v in vars(clase_reglas).items() if hasattr(v, "_wrapped"))}
+    reglas = []
+    for regla in sorted(matcher.reglas, key=lambda r: orden.get(r.nombre, len(orden))):
+        activacion = regla.activacion
+        if activacion.forma == "nunca":
+            raise BaseInvalida(f"Regla '{regla.nombre}': su condición nunca se cumple")
+        condicion = _condicion_de(activacion)
+        if condicion is None or regla.declaracion.forma != "siempre":
+            raise BaseInvalida(f"Regla '{regla.nombre}': la condición no se puede expresar")
+        if len(regla.hechos) != 1 or regla.hechos[0].diagnostico is None:
+            raise BaseInvalida(f"Regla '{regla.nombre}': debe declarar un solo Diagnostico")
+        datos = dict({"nombre": regla.nombre}, **condicion)
+        suprimida_por = []
+        for clase, campos in regla.negaciones:
+            if clase.__name__ != "Diagnostico":
+                raise BaseInvalida(f"Regla '{regla.nombre}': NOT de {clase.__name__}")
+            if not campos:
+                datos["sin_otro_diagnostico"] = True
+            elif set(campos) == {"plaga"}:
+                suprimida_por.append(campos["plaga"])
+            else:
+                raise BaseInvalida(f"Regla '{regla.nombre}': NOT con campos {sorted(campos)}")
+        if suprimida_por:
+            datos["suprimida_por"] = suprimida_por
+        if regla.salience:
+            datos["salience"] = regla.salience
+        diagnostico = regla.hechos[0].diagnostico.como_dict()
+        if diagnostico.get("regla_activada") == regla.nombre:
+            del diagnostico["regla_activada"]
+        datos["diagnostico"] = diagnostico
+        reglas.append(datos)
+
+    return {"cultivo": cultivo_key, "nombre": nombre or cultivo_key.capitalize(),
+            "descripcion": descripcion, "clase": clase_reglas.__name__, "reglas": reglas}
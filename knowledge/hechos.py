@@ -10,7 +10,12 @@ collections.Iterator = collections.abc.Iterator
 collections.MutableSet = collections.abc.MutableSet
 collections.Callable = collections.abc.Callable
 
-from experta import Fact
+import functools
+import inspect
+import json
+import sys
+
+from experta import Fact, Rule
 
 class Caso(Fact):
     """Entrada del usuario: cultivo, síntomas observados, conteo (si aplica)."""
@@ -19,3 +24,123 @@ class Caso(Fact):
 class Diagnostico(Fact):
     """Resultado del motor: plaga, certeza, recomendaciones, ACB, umbral."""
     pass
+
+
+# Campos que quedan en el propio hecho: los NOT(Diagnostico(plaga=...)) de las
+# reglas, el orden por certeza y reglas_activadas los necesitan ahí. El resto
+# (umbral, recomendaciones, imagen...) va a una Ficha compartida.
+CAMPOS_HECHO = ("plaga", "certeza", "regla_activada")
+
+_FICHAS = {}
+
+
+def _inmutable(valor):
+    if isinstance(valor, str):
+        return sys.intern(valor)
+    if isinstance(valor, (list, tuple)):
+        return tuple(_inmutable(v) for v in valor)
+    if isinstance(valor, collections.abc.Mapping):
+        return Ficha.interna(valor)
+    return valor
+
+
+def _mutable(valor):
+    if isinstance(valor, tuple):
+        return [_mutable(v) for v in valor]
+    if isinstance(valor, Ficha):
+        return valor.como_dict()
+    return valor
+
+
+class Ficha(collections.abc.Mapping):
+    """Datos fijos de un diagnóstico: inmutables e internados (una instancia por contenido)."""
+
+    __slots__ = ("_campos", "_hash", "_json")
+
+    def __init__(self, campos):
+        self._campos = {sys.intern(k): _inmutable(v) for k, v in campos.items()}
+        self._hash = hash(frozenset(self._campos.items()))
+        self._json = None
+
+    @classmethod
+    def interna(cls, campos):
+        ficha = cls(campos)
+        return _FICHAS.setdefault(ficha, ficha)
+
+    def __getitem__(self, clave):
+        return self._campos[clave]
+
+    def __iter__(self):
+        return iter(self._campos)
+
+    def __len__(self):
+        return len(self._campos)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, otra):
+        if isinstance(otra, Ficha):
+            return self is otra or (self._hash == otra._hash and self._campos == otra._campos)
+        return super().__eq__(otra)
+
+    def __repr__(self):
+        return f"Ficha({self._campos!r})"
+
+    def como_dict(self):
+        """Copia mutable (listas y dicts comunes), lista para serializar."""
+        return {k: _mutable(v) for k, v in self._campos.items()}
+
+    def json(self):
+        """Campos en JSON sin las llaves exteriores; se codifica una sola vez."""
+        if self._json is None:
+            self._json = json.dumps(self.como_dict(), ensure_ascii=False)[1:-1]
+        return self._json
+
+    def __reduce__(self):
+        return (Ficha.interna, (self._campos,))
+
+
+class _Grabador:
+    """
+    Sustituye al motor al ejecutar el cuerpo de una regla fuera de experta
+    (aquí y en engine/compilado.py): solo guarda lo que se declara.
+    """
+
+    def __init__(self):
+        self.declarados = []
+
+    def declare(self, *hechos):
+        self.declarados.extend(hechos)
+
+
+def _plantilla(hecho):
+    propios = {k: v for k, v in hecho.items() if k in CAMPOS_HECHO}
+    resto = {k: v for k, v in hecho.items() if k not in CAMPOS_HECHO}
+    if resto:
+        propios["ficha"] = Ficha.interna(resto)
+    return type(hecho), propios
+
+
+def precalcular_diagnosticos(clase_reglas):
+    """
+    Decorador de clase: las reglas cuyo cuerpo siempre declara lo mismo
+    (no reciben variables del caso) se ejecutan una vez al cargar la clase;
+    desde entonces cada disparo declara hechos chicos que apuntan a la Ficha
+    ya construida, sin volver a armar listas ni cadenas.
+    """
+    for regla in vars(clase_reglas).values():
+        if not isinstance(regla, Rule) or regla._wrapped is None:
+            continue
+        cuerpo = regla._wrapped
+        if list(inspect.signature(cuerpo).parameters) != ["self"]:
+            continue
+        grabador = _Grabador()
+        cuerpo(grabador)
+        plantillas = tuple(_plantilla(h) for h in grabador.declarados)
+
+        def declarar(self, _plantillas=plantillas):
+            self.declare(*(clase(**campos) for clase, campos in _plantillas))
+
+        regla._wrapped = functools.update_wrapper(declarar, cuerpo)
+    return clase_reglas
@@ -11,8 +11,9 @@ collections.MutableSet = collections.abc.MutableSet
 collections.Callable = collections.abc.Callable
 
 from experta import KnowledgeEngine, Rule, TEST, MATCH, NOT
-from knowledge.hechos import Caso, Diagnostico
+from knowledge.hechos import Caso, Diagnostico, precalcular_diagnosticos
 
+@precalcular_diagnosticos
 class ReglasCacao(KnowledgeEngine):
     """
     Sistema experto para diagnóstico de plagas en cacao (Theobroma cacao)
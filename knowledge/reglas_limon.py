@@ -12,8 +12,9 @@ collections.Callable = collections.abc.Callable
 
 
 from experta import KnowledgeEngine, Rule, TEST, MATCH, NOT
-from .hechos import Caso, Diagnostico
+from .hechos import Caso, Diagnostico, precalcular_diagnosticos
 
+@precalcular_diagnosticos
 class ReglasLimon(KnowledgeEngine):
 
     # PLAGAS DEL LIMÓN (10 PLAGAS CON 20 REGLAS)
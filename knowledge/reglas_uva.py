@@ -12,8 +12,9 @@ collections.Callable = collections.abc.Callable
 
 
 from experta import KnowledgeEngine, Rule, TEST, MATCH, NOT
-from .hechos import Caso, Diagnostico
+from .hechos import Caso, Diagnostico, precalcular_diagnosticos
 
+@precalcular_diagnosticos
 class ReglasUva(KnowledgeEngine):
     # --- FILÓXERA ---
     @Rule(
@@ -0,0 +1,144 @@
+import pytest
+import asyncio
+import sys
+import time
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas
+from engine.asincrono import DiagnosticoAsincrono, agrupador, diagnosticar_async
+
+CASOS = [
+    ("uva", ["verrugas_hojas", "nudosidades_raices"]),
+    ("limon", ["mielada", "fumagina", "hojas_amarillentas"]),
+    ("café", ["frutos_perforados", "granos_dañados", "cerezas_caidas"]),
+    ("papa", ["hojas_enrolladas", "hojas_amarillentas"]),
+    ("mango", ["x"]),
+]
+
+
+def correr(corrutina):
+    return asyncio.run(corrutina)
+
+
+class TestDiagnosticoAsincrono:
+    """Verifica el agrupado en micro-lotes."""
+
+    def test_mismos_resultados(self):
+        sistema = SistemaExpertoPlagas()
+
+        async def principal():
+            agrupador = DiagnosticoAsincrono(sistema, ventana=0.01)
+            return await asyncio.gather(*(agrupador.diagnosticar(c, s) for c, s in CASOS))
+
+        assert correr(principal()) == [sistema.diagnosticar(c, s) for c, s in CASOS]
+
+    def test_peticiones_concurrentes_van_en_un_lote(self):
+        async def principal():
+            agrupador = DiagnosticoAsincrono(ventana=0.05)
+            await asyncio.gather(*(agrupador.diagnosticar(c, s) for c, s in CASOS * 4))
+            return agrupador.estadisticas()
+
+        stats = correr(principal())
+        assert stats["peticiones"] == 20
+        assert stats["lotes"] == 1
+        assert stats["hist_tamano_lote"] == {16: 1}
+        assert stats["profundidad_maxima"] == 20
+        assert stats["profundidad"] == 0
+
+    def test_max_lote(self):
+        async def principal():
+            agrupador = DiagnosticoAsincrono(ventana=10, max_lote=5)
+            await asyncio.gather(*(agrupador.diagnosticar(c, s) for c, s in CASOS * 3))
+            return agrupador.estadisticas()
+
+        stats = correr(principal())
+        assert stats["lotes"] == 3
+        assert stats["tamano_medio"] == 5
+
+    def test_error_llega_a_cada_llamador(self):
+        class SistemaRoto:
+            def diagnosticar_lote(self, casos):
+                raise RuntimeError("motor caído")
+
+        async def principal():
+            agrupador = DiagnosticoAsincrono(SistemaRoto(), ventana=0)
+            return await asyncio.gather(*(agrupador.diagnosticar(c, s) for c, s in CASOS),
+                                        return_exceptions=True)
+
+        errores = correr(principal())
+        assert all(isinstance(e, RuntimeError) for e in errores)
+
+    def test_caso_invalido_no_tumba_al_lote(self):
+        sistema = SistemaExpertoPlagas()
+
+        async def principal():
+            agrupador = DiagnosticoAsincrono(sistema, ventana=0.01)
+            return await asyncio.gather(agrupador.diagnosticar("uva", ["x"]),
+                                        agrupador.diagnosticar("uva", [["no", "hash"]]),
+                                        agrupador.diagnosticar(None, ["x"]),
+                                        return_exceptions=True)
+
+        bueno, sintoma_malo, cultivo_malo = correr(principal())
+        assert bueno == sistema.diagnosticar("uva", ["x"])
+        assert isinstance(sintoma_malo, TypeError) and isinstance(cultivo_malo, TypeError)
+
+    def test_error_de_un_caso_solo_le_llega_a_ese(self):
+        class SistemaQuisquilloso:
+            def diagnosticar_lote(self, casos):
+                if any(cultivo == "roto" for cultivo, _ in casos):
+                    raise RuntimeError("caso roto")
+                return {"resultados": [{"cultivo": cultivo} for cultivo, _ in casos]}
+
+        async def principal():
+            agrupador = DiagnosticoAsincrono(SistemaQuisquilloso(), ventana=0.01)
+            resultados = await asyncio.gather(agrupador.diagnosticar("uva", []),
+                                              agrupador.diagnosticar("roto", []),
+                                              agrupador.diagnosticar("papa", []),
+                                              return_exceptions=True)
+            return resultados, agrupador.estadisticas()["lotes"]
+
+        (uva, roto, papa), lotes = correr(principal())
+        assert lotes == 1
+        assert uva == {"cultivo": "uva"} and papa == {"cultivo": "papa"}
+        assert isinstance(roto, RuntimeError)
+
+    def test_lote_cancelado_cancela_a_los_llamadores(self):
+        class SistemaLento:
+            def diagnosticar_lote(self, casos):
+                time.sleep(0.2)
+                return {"resultados": [{} for _ in casos]}
+
+        async def principal():
+            agrupador = DiagnosticoAsincrono(SistemaLento(), ventana=0)
+            llamadas = [asyncio.ensure_future(agrupador.diagnosticar(c, s)) for c, s in CASOS]
+            await asyncio.sleep(0.05)
+            for tarea in agrupador._tareas:
+                tarea.cancel()
+            return await asyncio.wait_for(asyncio.gather(*llamadas, return_exceptions=True), 1)
+
+        resultados = correr(principal())
+        assert all(isinstance(r, asyncio.CancelledError) for r in resultados)
+
+    def test_parametros_invalidos(self):
+        with pytest.raises(ValueError):
+            DiagnosticoAsincrono(ventana=-1)
+        with pytest.raises(ValueError):
+            DiagnosticoAsincrono(max_lote=0)
+
+    def test_agrupador_con_otras_opciones(self):
+        async def principal():
+            primero = agrupador(ventana=0.01)
+            assert agrupador() is primero and agrupador(ventana=0.01) is primero
+            with pytest.raises(ValueError, match="ventana"):
+                agrupador(ventana=0.5)
+
+        correr(principal())
+
+    def test_diagnosticar_async(self):
+        async def principal():
+            return await diagnosticar_async("uva", ["verrugas_hojas"])
+
+        resultado = correr(principal())
+        assert resultado == SistemaExpertoPlagas().diagnosticar("uva", ["verrugas_hojas"])
@@ -0,0 +1,80 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import MAPA_CULTIVOS
+from benchmarks.casos import casos_reales, casos_sinteticos, vocabularios
+from benchmarks.suite import correr, comparar, main
+from benchmarks.indice import medir as medir_indice
+from benchmarks.diagrama import medir as medir_diagrama
+
+
+@pytest.fixture(scope="module")
+def resultado():
+    return correr(sinteticos=3, cultivos=["cacao", "papa"], repeticiones=1)
+
+
+class TestCasos:
+    """Casos que alimentan los benchmarks."""
+
+    def test_casos_reales_de_las_pruebas(self):
+        casos = casos_reales()
+        cultivos = {c for c, _ in casos}
+        assert {"uva", "café", "palta", "papa"} <= cultivos
+        assert ("uva", ["verrugas_hojas", "nudosidades_raices"]) in casos
+
+    def test_vocabularios_de_la_interfaz(self):
+        assert set(vocabularios()) == set(MAPA_CULTIVOS)
+
+    def test_sinteticos_reproducibles(self):
+        assert casos_sinteticos(5, semilla=3) == casos_sinteticos(5, semilla=3)
+        casos = casos_sinteticos(5, cultivos=["cacao"])
+        assert len(casos) == 5 and all(c == "cacao" for c, _ in casos)
+
+
+class TestSuite:
+    """Medición y comparación con la línea base."""
+
+    def test_metricas_por_cultivo(self, resultado):
+        assert set(resultado["cultivos"]) == {"cacao", "papa"}
+        metricas = resultado["cultivos"]["papa"]
+        assert metricas["casos"] > 3
+        assert metricas["p50_ms"] <= metricas["p90_ms"] <= metricas["p99_ms"] <= metricas["max_ms"]
+        assert metricas["casos_por_segundo"] > 0
+
+    def test_comparar(self, resultado):
+        assert comparar(resultado, resultado) == []
+        peor = {"cultivos": {"cacao": dict(resultado["cultivos"]["cacao"])}}
+        peor["cultivos"]["cacao"]["p50_ms"] *= 2
+        peor["cultivos"]["cacao"]["casos_por_segundo"] /= 2
+        regresiones = comparar(peor, resultado, umbral=0.2)
+        assert {r[1] for r in regresiones} == {"p50_ms", "casos_por_segundo"}
+        assert comparar(peor, resultado, umbral=1.5) == []
+
+    def test_linea_base_en_disco(self, tmp_path):
+        base = tmp_path / "base.json"
+        argumentos = ["--sinteticos", "1", "--repeticiones", "1", "--cultivos", "cacao"]
+        assert main(argumentos + ["--guardar-base", str(base)]) == 0
+        assert main(argumentos + ["--linea-base", str(base), "--umbral", "100"]) == 0
+
+
+class TestIndice:
+    """Benchmark del índice síntoma -> reglas."""
+
+    def test_menos_candidatas_que_reglas(self):
+        metricas = medir_indice(60, casos=50)
+        assert metricas["reglas"] == 61
+        assert metricas["candidatas_por_caso"] < metricas["reglas"] / 2
+        assert metricas["sin_indice_us"] > 0 and metricas["con_indice_us"] > 0
+
+
+class TestDiagrama:
+    """Benchmark de los diagramas de decisión."""
+
+    def test_uva(self):
+        metricas = medir_diagrama("uva", [["verrugas_hojas"], ["racimos_consumidos", "madrigueras"]],
+                                  repeticiones=1)
+        assert metricas["nodos"] > 0 and metricas["camino_maximo"] <= metricas["sintomas"]
+        assert metricas["experta_us"] > 0 and metricas["diagrama_us"] > 0
@@ -0,0 +1,97 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.cache import CacheDiagnosticos
+
+
+@pytest.fixture
+def cache():
+    return CacheDiagnosticos(MAPA_CULTIVOS)
+
+
+@pytest.fixture
+def sistema(cache):
+    return SistemaExpertoPlagas(cache=cache)
+
+
+class TestCacheDiagnosticos:
+    """Verifica la memoización de diagnósticos."""
+
+    def test_acierto_devuelve_lo_mismo(self, sistema, cache):
+        sintomas = ["frutos_perforados", "granos_dañados", "cerezas_caidas"]
+        primero = sistema.diagnosticar("café", sintomas)
+        segundo = sistema.diagnosticar("café", list(reversed(sintomas)))
+        assert primero == segundo
+        stats = cache.estadisticas()
+        assert stats["aciertos"] == 1 and stats["fallos"] == 1
+        assert stats["tasa_aciertos"] == 0.5
+
+    def test_sintomas_irrelevantes_comparten_entrada(self, sistema, cache):
+        sistema.diagnosticar("uva", ["verrugas_hojas"])
+        sistema.diagnosticar("uva", ["verrugas_hojas", "ruido", "otro_ruido"])
+        assert cache.estadisticas()["entradas"] == 1
+        assert cache.estadisticas()["aciertos"] == 1
+
+    def test_resultado_cacheado_no_se_corrompe(self, sistema):
+        resultado = sistema.diagnosticar("cacao", ["brotes_anormales"])
+        esperado = sistema.diagnosticar("cacao", ["brotes_anormales"])
+        with pytest.raises(TypeError):
+            resultado["diagnosticos"][0]["plaga"] = "otra"
+        resultado["diagnosticos"].clear()
+        resultado["reglas_activadas"].append("falsa")
+        esperado["diagnosticos"].pop()
+        de_nuevo = sistema.diagnosticar("cacao", ["brotes_anormales"])
+        assert "Escoba de bruja" in de_nuevo["diagnosticos"][0]["plaga"]
+        assert "falsa" not in de_nuevo["reglas_activadas"]
+
+    def test_limite_de_entradas(self):
+        cache = CacheDiagnosticos(MAPA_CULTIVOS, max_entradas=2)
+        sistema = SistemaExpertoPlagas(cache=cache)
+        for sintoma in ["verrugas_hojas", "tejido_araña", "moho_gris"]:
+            sistema.diagnosticar("uva", [sintoma])
+        stats = cache.estadisticas()
+        assert stats["entradas"] == 2 and stats["expulsados"] == 1
+        # la más antigua salió
+        sistema.diagnosticar("uva", ["verrugas_hojas"])
+        assert cache.estadisticas()["aciertos"] == 0
+
+    def test_limite_de_bytes(self):
+        cache = CacheDiagnosticos(MAPA_CULTIVOS, max_bytes=1)
+        SistemaExpertoPlagas(cache=cache).diagnosticar("uva", ["verrugas_hojas"])
+        assert cache.estadisticas()["entradas"] == 0
+        assert cache.estadisticas()["bytes"] == 0
+
+    def test_ttl(self):
+        cache = CacheDiagnosticos(MAPA_CULTIVOS, ttl=-1)
+        sistema = SistemaExpertoPlagas(cache=cache)
+        sistema.diagnosticar("uva", ["verrugas_hojas"])
+        sistema.diagnosticar("uva", ["verrugas_hojas"])
+        assert cache.estadisticas()["expirados"] == 1
+
+    def test_invalida_si_cambian_las_reglas(self):
+        mapa = dict(MAPA_CULTIVOS)
+        cache = CacheDiagnosticos(mapa)
+        sistema = SistemaExpertoPlagas(cache=cache)
+        sistema.diagnosticar("uva", ["verrugas_hojas"])
+
+        class ReglasUvaNuevas(MAPA_CULTIVOS["uva"]):
+            pass
+
+        mapa["uva"] = ReglasUvaNuevas
+        assert cache.obtener("uva", ["verrugas_hojas"]) is None
+        assert cache.estadisticas()["invalidaciones"] == 1
+
+    def test_invalida_si_cambia_el_archivo(self, cache, tmp_path):
+        sistema = SistemaExpertoPlagas(cache=cache)
+        sistema.diagnosticar("uva", ["verrugas_hojas"])
+        huella = cache._huellas["uva"]
+        copia = tmp_path / "reglas_uva.py"
+        copia.write_text(open(huella.archivo, encoding="utf-8").read() + "\n# cambio\n", encoding="utf-8")
+        huella.archivo = str(copia)
+        cache.intervalo_verificacion = 0
+        assert cache.obtener("uva", ["verrugas_hojas"]) is None
+        assert cache.estadisticas()["invalidaciones"] == 1
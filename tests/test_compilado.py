@@ -0,0 +1,181 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import obtener_matcher, MatcherCompilado, ReglasNoCompilables
+from experta import KnowledgeEngine, Rule, MATCH, TEST
+from knowledge.hechos import Caso, Diagnostico
+
+
+# Casos tomados de test_inferencia_*, test_borde_* y test_explicacion_*
+CASOS = [
+    ("uva", ["verrugas_hojas", "nudosidades_raices"]),
+    ("uva", ["nudosidades_raices"]),
+    ("uva", ["hojas_abarquilladas"]),
+    ("uva", ["racimos_consumidos"]),
+    ("uva", ["picaduras_racimos", "avispa_presencia", "bayas_vacias"]),
+    ("limon", ["hojas_con_minas_serpentinas", "hojas_enrolladas", "hojas_plateadas"]),
+    ("limon", ["mielada", "fumagina", "hojas_amarillentas"]),
+    ("palta", ["raspado_frutos", "rugosidad_frutos", "bronceado_frutos"]),
+    ("palta", ["raspado_frutos", "rugosidad_frutos"]),
+    ("palta", ["hojas_amarillas", "defoliacion", "raices_necrosadas", "frutos_pequenos"]),
+    ("café", ["frutos_perforados", "granos_dañados", "cerezas_caidas"]),
+    ("café", ["hormigas_cuello_tallo", "marchitez_plantas"]),
+    ("cacao", ["alta_humedad_ambiente", "temperatura_optima", "brotes_anormales"]),
+    ("cacao", ["manchas_negras_mazorca", "lluvia_reciente"]),
+    ("papa", ["hojas_enrolladas", "hojas_amarillentas",
+              "tallos_perforados", "tuberculos_danados",
+              "hojas_manchas_negras", "clima_humedo"]),
+    ("papa", ["sintoma_inexistente", "otro_falso"]),
+    ("papa", []),
+    ("Café", ["epoca_seca", "hojas_bronceadas"]),
+]
+
+# Constante de módulo que un TEST no debería consultar
+GRAVES = {"a", "b"}
+
+
+@pytest.fixture
+def experta():
+    return SistemaExpertoPlagas()
+
+
+@pytest.fixture
+def compilado():
+    return SistemaExpertoPlagas(backend="compilado")
+
+
+class TestEquivalencia:
+    """El backend compilado debe devolver exactamente lo mismo que experta."""
+
+    @pytest.mark.parametrize("cultivo,sintomas", CASOS)
+    def test_casos_conocidos(self, experta, compilado, cultivo, sintomas):
+        assert compilado.diagnosticar(cultivo, sintomas) == experta.diagnosticar(cultivo, sintomas)
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_casos_aleatorios(self, experta, compilado, cultivo):
+        rng = random.Random(cultivo)
+        vocabulario = list(obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo).vocabulario)
+        for _ in range(25):
+            sintomas = rng.sample(vocabulario, rng.randint(0, 6)) + ["ruido"]
+            assert compilado.diagnosticar(cultivo, sintomas) == experta.diagnosticar(cultivo, sintomas)
+
+    def test_cultivo_no_soportado(self, experta, compilado):
+        assert compilado.diagnosticar("mango", ["x"]) == experta.diagnosticar("mango", ["x"])
+
+
+class TestCompilacion:
+    """Verifica la traducción de reglas a máscaras de bits."""
+
+    def test_todos_los_cultivos_compilan(self):
+        for cultivo, clase in MAPA_CULTIVOS.items():
+            assert obtener_matcher(clase, cultivo) is not None, cultivo
+
+    def test_matcher_se_construye_una_vez(self):
+        clase = MAPA_CULTIVOS["cacao"]
+        assert obtener_matcher(clase, "cacao") is obtener_matcher(clase, "cacao")
+
+    def test_minimo_de_sintomas_como_popcount(self):
+        matcher = obtener_matcher(MAPA_CULTIVOS["limon"], "limon")
+        regla = next(r for r in matcher.reglas if r.nombre == "minador_hojas_parcial")
+        assert regla.activacion.forma == "mascara"
+        assert regla.activacion.minimo == 2
+        assert len(regla.activacion.variables) == 4
+
+    def test_condicion_en_el_cuerpo(self):
+        class ReglasEnCuerpo(KnowledgeEngine):
+            @Rule(Caso(cultivo="papa", sintomas=MATCH.sintomas))
+            def plaga_pulgon(self, sintomas):
+                if "hojas_enrolladas" in sintomas and "hojas_amarillentas" in sintomas:
+                    self.declare(Diagnostico(plaga="Pulgón", certeza=0.9,
+                                             regla_activada="plaga_pulgon"))
+
+        matcher = MatcherCompilado(ReglasEnCuerpo, "papa")
+        regla = matcher.reglas[0]
+        assert regla.activacion.forma == "siempre"
+        assert set(regla.declaracion.variables) == {"hojas_enrolladas", "hojas_amarillentas"}
+        assert matcher.evaluar({"hojas_enrolladas"}) == []
+        assert len(matcher.evaluar({"hojas_enrolladas", "hojas_amarillentas"})) == 1
+
+    def test_papa_condiciones_en_el_test(self):
+        matcher = obtener_matcher(MAPA_CULTIVOS["papa"], "papa")
+        regla = next(r for r in matcher.reglas if r.nombre == "plaga_pulgon")
+        assert regla.activacion.requeridos == (matcher.indice["hojas_enrolladas"]
+                                               | matcher.indice["hojas_amarillentas"])
+        assert regla.declaracion.forma == "siempre"
+
+    def test_sintoma_negado(self):
+        matcher = obtener_matcher(MAPA_CULTIVOS["uva"], "uva")
+        regla = next(r for r in matcher.reglas if r.nombre == "acaro_hialino_parcial")
+        assert regla.activacion.prohibidos == matcher.indice["brotacion_lenta"]
+
+    def test_regla_no_compilable_vuelve_a_experta(self):
+        class ReglasRaras(KnowledgeEngine):
+            @Rule(Caso(cultivo="raro", sintomas=MATCH.s))
+            def regla(self, s):
+                self.declare(Diagnostico(plaga="Rara", certeza=len(s) / 10, regla_activada="regla"))
+
+        with pytest.raises(ReglasNoCompilables):
+            MatcherCompilado(ReglasRaras, "raro")
+        assert obtener_matcher(ReglasRaras, "raro") is None
+
+    @pytest.mark.parametrize("prueba", [
+        lambda s: GRAVES <= s,
+        lambda s, graves=frozenset(GRAVES): graves <= s,
+        (lambda graves: lambda s: graves <= s)(GRAVES),
+        lambda s: len(s) > 3,
+    ])
+    def test_test_con_valores_ocultos_no_compila(self, prueba):
+        """Síntomas que no están en el código del TEST no se tabulan como 'nunca'"""
+        class ReglasOcultas(KnowledgeEngine):
+            @Rule(Caso(cultivo="oculto", sintomas=MATCH.s), TEST(prueba))
+            def regla(self):
+                self.declare(Diagnostico(plaga="Oculta", certeza=1.0, regla_activada="regla"))
+
+        with pytest.raises(ReglasNoCompilables):
+            MatcherCompilado(ReglasOcultas, "oculto")
+
+
+class TestIndiceSintomas:
+    """El índice síntoma -> reglas solo descarta reglas que no pueden activarse."""
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_igual_que_sin_indice(self, cultivo):
+        matcher = obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo)
+        reglas = matcher.reglas
+        rng = random.Random(cultivo)
+        vocabulario = list(matcher.vocabulario)
+        for _ in range(200):
+            sintomas = set(rng.sample(vocabulario, rng.randint(0, 5)))
+            m = matcher.mascara(sintomas)
+            completo = matcher.disparar(lambda i: reglas[i].activacion.evaluar(m),
+                                        lambda i: reglas[i].declaracion.evaluar(m))
+            assert matcher.declarados(sintomas) == [h for _, h in completo]
+            activas = {r.nombre for r in reglas if r.activacion.evaluar(m)}
+            assert activas <= set(matcher.candidatas(sintomas))
+
+    def test_introspeccion(self):
+        matcher = obtener_matcher(MAPA_CULTIVOS["uva"], "uva")
+        indice = matcher.indice_reglas
+        assert set(indice) == set(matcher.vocabulario)
+        assert "filoxera_completa" in indice["nudosidades_raices"]
+        assert matcher.reglas_fijas == ["sin_diagnostico"]
+        candidatas = matcher.candidatas(["nudosidades_raices"])
+        assert "sin_diagnostico" in candidatas
+        assert len(candidatas) < len(matcher.reglas)
+        assert matcher.candidatas(["ruido"]) == ["sin_diagnostico"]
+
+
+class TestBackend:
+    """Selección del backend por instancia."""
+
+    def test_backend_por_defecto(self):
+        assert SistemaExpertoPlagas().backend == "experta"
+
+    def test_backend_desconocido(self):
+        with pytest.raises(ValueError):
+            SistemaExpertoPlagas(backend="rapido")
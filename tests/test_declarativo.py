@@ -0,0 +1,256 @@
+import json
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import MatcherCompilado
+from engine.registro import REGISTRO
+from experta import KnowledgeEngine, Rule, MATCH, TEST
+from knowledge.hechos import Caso, Diagnostico
+from knowledge import declarativo
+from knowledge.declarativo import (BaseInvalida, cargar_base, exportar_base,
+                                   generar_fuente, validar)
+
+MANGO = {
+    "cultivo": "mango",
+    "nombre": "Mango",
+    "descripcion": "Base de prueba",
+    "reglas": [
+        {"nombre": "antracnosis_completa",
+         "requiere": ["manchas_negras_frutos", "lesiones_hundidas"],
+         "diagnostico": {"plaga": "Antracnosis", "certeza": 1.0, "umbral": "5%",
+                         "recomendaciones": ["Podar", "Aplicar cobre"]}},
+        {"nombre": "antracnosis_parcial",
+         "grupos": [{"sintomas": ["manchas_negras_frutos", "lesiones_hundidas", "caida_flores"],
+                     "minimo": 1, "maximo": 2}],
+         "excluye": ["frutos_sanos"],
+         "suprimida_por": ["Antracnosis"],
+         "diagnostico": {"plaga": "Antracnosis – sospecha", "certeza": 0.6}},
+        {"nombre": "mosca_fruta",
+         "grupos": [{"sintomas": ["larvas_pulpa", "picaduras_frutos", "frutos_caidos"],
+                     "minimo": 2}],
+         "diagnostico": {"plaga": "Mosca de la fruta", "certeza": 0.8}},
+        {"nombre": "sin_diagnostico", "sin_otro_diagnostico": True, "salience": -1,
+         "diagnostico": {"plaga": "Sin plaga identificada", "certeza": 0.0}},
+    ],
+}
+
+
+@pytest.fixture
+def ruta_mango(tmp_path):
+    ruta = tmp_path / "mango.json"
+    ruta.write_text(json.dumps(MANGO, ensure_ascii=False), encoding="utf-8")
+    return str(ruta)
+
+
+@pytest.fixture
+def con_mango(ruta_mango):
+    REGISTRO.registrar_base(ruta_mango)
+    yield
+    REGISTRO.quitar("mango")
+
+
+class TestFormato:
+    """Validación de las bases declarativas"""
+
+    def test_normaliza(self):
+        base = validar(MANGO)
+        assert base["clase"] == "ReglasMango"
+        assert base["reglas"][0]["diagnostico"]["regla_activada"] == "antracnosis_completa"
+        assert "frutos_sanos" in base["sintomas"]
+
+    def test_salience_de_supresiones(self):
+        # La regla que declara la plaga supresora dispara antes, sin pedirlo en la base
+        saliences = {r["nombre"]: r["salience"] for r in validar(MANGO)["reglas"]}
+        assert saliences["antracnosis_completa"] > saliences["antracnosis_parcial"]
+
+        cadena = dict(MANGO, reglas=[
+            {"nombre": "c", "suprimida_por": ["B"], "diagnostico": {"plaga": "C"}},
+            {"nombre": "b", "suprimida_por": ["A"], "diagnostico": {"plaga": "B"}},
+            {"nombre": "a", "diagnostico": {"plaga": "A"}},
+        ])
+        saliences = {r["nombre"]: r["salience"] for r in validar(cadena)["reglas"]}
+        assert saliences["a"] > saliences["b"] > saliences["c"]
+
+    def test_supresiones_en_ciclo(self):
+        ciclo = dict(MANGO, reglas=[
+            {"nombre": "a", "suprimida_por": ["B"], "diagnostico": {"plaga": "A"}},
+            {"nombre": "b", "suprimida_por": ["A"], "diagnostico": {"plaga": "B"}},
+        ])
+        with pytest.raises(BaseInvalida, match="ciclo"):
+            validar(ciclo)
+
+    @pytest.mark.parametrize("regla", [
+        {"nombre": "r", "diagnostico": {"plaga": "P", "x=__import__('os').system('id'),y": 1}},
+        {"nombre": "r", "diagnostico": {"plaga": "P", "lambda": 1}},
+        {"nombre": "r", "diagnostico": {"plaga": "P", 1: "uno"}},
+        {"nombre": "class", "diagnostico": {"plaga": "P"}},
+    ])
+    def test_nombres_que_no_van_al_codigo(self, regla):
+        with pytest.raises(BaseInvalida):
+            validar(dict(MANGO, reglas=[regla]))
+
+    @pytest.mark.parametrize("clase", ["None", "class", 3, "Reglas Mango"])
+    def test_clase_invalida(self, clase):
+        with pytest.raises(BaseInvalida):
+            validar(dict(MANGO, clase=clase))
+
+    @pytest.mark.parametrize("cambio", [
+        {"cultivo": ""},
+        {"reglas": []},
+        {"extra": 1},
+        {"reglas": [{"nombre": "x y", "diagnostico": {"plaga": "P"}}]},
+        {"reglas": [{"nombre": "r", "diagnostico": {"plaga": "P", "certeza": 2}}]},
+        {"reglas": [{"nombre": "r", "requiere": "a", "diagnostico": {"plaga": "P"}}]},
+        {"reglas": [{"nombre": "r", "grupos": [{"sintomas": ["a"], "minimo": 3}],
+                     "diagnostico": {"plaga": "P"}}]},
+        {"reglas": [{"nombre": "r", "requiere": ["a"], "excluye": ["a"],
+                     "diagnostico": {"plaga": "P"}}]},
+        {"reglas": [{"nombre": "r", "diagnostico": {"plaga": "P"}},
+                    {"nombre": "r", "diagnostico": {"plaga": "Q"}}]},
+    ])
+    def test_bases_invalidas(self, cambio):
+        with pytest.raises(BaseInvalida):
+            validar(dict(MANGO, **cambio))
+
+    def test_toml(self, tmp_path):
+        ruta = tmp_path / "pera.toml"
+        ruta.write_text('cultivo = "pera"\n\n[[reglas]]\nnombre = "psila"\n'
+                        'requiere = ["mielada"]\n\n[reglas.diagnostico]\n'
+                        'plaga = "Psila del peral"\ncerteza = 0.9\n', encoding="utf-8")
+        base = cargar_base(str(ruta))
+        assert base.clave == "pera" and base.clase.__name__ == "ReglasPera"
+
+    def test_valores_que_no_son_literales(self, tmp_path):
+        ruta = tmp_path / "mango.json"
+        ruta.write_text('{"cultivo": "mango", "reglas": [{"nombre": "r", '
+                        '"diagnostico": {"plaga": "P", "umbral": NaN}}]}', encoding="utf-8")
+        with pytest.raises(BaseInvalida, match="'r': 'umbral'"):
+            cargar_base(str(ruta))
+
+        ruta = tmp_path / "pera.toml"
+        ruta.write_text('cultivo = "pera"\n\n[[reglas]]\nnombre = "psila"\n\n'
+                        '[reglas.diagnostico]\nplaga = "Psila"\nfecha = 1979-05-27\n', encoding="utf-8")
+        with pytest.raises(BaseInvalida, match="'psila': 'fecha'"):
+            cargar_base(str(ruta))
+
+    def test_formato_desconocido(self, tmp_path):
+        ruta = tmp_path / "pera.xml"
+        ruta.write_text("<base/>")
+        with pytest.raises(BaseInvalida):
+            cargar_base(str(ruta))
+
+
+class TestCompilacion:
+    """De la base a la clase de reglas y al matcher compilado"""
+
+    def test_diagnostico(self, ruta_mango):
+        base = cargar_base(ruta_mango)
+        assert base.nombre == "Mango" and base.clave == "mango"
+        sistema = SistemaExpertoPlagas()
+        REGISTRO.registrar("mango", base.clase)
+        try:
+            completo = sistema.diagnosticar("mango", ["manchas_negras_frutos", "lesiones_hundidas"])
+            parcial = sistema.diagnosticar("mango", ["caida_flores"])
+            excluido = sistema.diagnosticar("mango", ["caida_flores", "frutos_sanos"])
+        finally:
+            REGISTRO.quitar("mango")
+        assert completo["reglas_activadas"] == ["antracnosis_completa"]
+        assert completo["diagnosticos"][0]["recomendaciones"] == ("Podar", "Aplicar cobre")
+        assert parcial["reglas_activadas"] == ["antracnosis_parcial"]
+        assert excluido["reglas_activadas"] == ["sin_diagnostico"]
+
+    def test_backends_equivalentes(self, con_mango):
+        experta = SistemaExpertoPlagas()
+        compilado = SistemaExpertoPlagas(backend="compilado")
+        vocabulario = validar(MANGO)["sintomas"]
+        rng = random.Random(0)
+        for _ in range(40):
+            sintomas = rng.sample(vocabulario, rng.randint(0, 4))
+            assert compilado.diagnosticar("mango", sintomas) == experta.diagnosticar("mango", sintomas)
+
+    def test_misma_clase_si_no_cambia(self, ruta_mango):
+        assert cargar_base(ruta_mango) is cargar_base(ruta_mango)
+        assert cargar_base(ruta_mango).matcher() is not None
+
+    def test_cache_en_disco(self, ruta_mango, monkeypatch):
+        digest = cargar_base(ruta_mango).digest
+        assert any(digest[:20] in nombre for nombre in
+                   os.listdir(os.path.join(os.path.dirname(ruta_mango), "__pycache__")))
+
+        # Otro "proceso": sin bases en memoria y sin poder generar código
+        monkeypatch.setattr(declarativo, "_BASES", {})
+
+        def sin_generar(datos):
+            raise AssertionError("debió salir de la caché")
+
+        monkeypatch.setattr(declarativo, "generar_fuente", sin_generar)
+        assert cargar_base(ruta_mango).clase.__name__ == "ReglasMango"
+
+        # Si el archivo cambia, se vuelve a compilar
+        otro = dict(MANGO, nombre="Mango criollo")
+        with open(ruta_mango, "w", encoding="utf-8") as f:
+            json.dump(otro, f)
+        with pytest.raises(AssertionError):
+            cargar_base(ruta_mango)
+
+    def test_registrar_base(self, con_mango):
+        entrada = REGISTRO.entrada("mango")
+        assert entrada.nombre == "Mango" and "larvas_pulpa" in entrada.sintomas
+        assert not REGISTRO.cargado("mango")
+        resultado = SistemaExpertoPlagas().diagnosticar("Mango", ["larvas_pulpa", "frutos_caidos"])
+        assert resultado["reglas_activadas"] == ["mosca_fruta"]
+        assert REGISTRO.cargado("mango")
+
+
+class TestExportar:
+    """Los cultivos escritos a mano caben en el formato"""
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_ida_y_vuelta(self, cultivo, tmp_path):
+        datos = exportar_base(MAPA_CULTIVOS[cultivo], cultivo)
+        ruta = tmp_path / f"{cultivo}.json"
+        ruta.write_text(json.dumps(datos, ensure_ascii=False), encoding="utf-8")
+        original = MatcherCompilado(MAPA_CULTIVOS[cultivo], cultivo)
+        generado = cargar_base(str(ruta)).matcher()
+        assert generado is not None
+
+        # Regla por regla: misma condición, mismas supresiones y mismo diagnóstico
+        por_nombre = {r.nombre: r for r in generado.reglas}
+        rng = random.Random(cultivo)
+        vocabulario = list(original.vocabulario)
+        reglas = validar(datos)["reglas"]
+        for regla in reglas:
+            # Quien declara una plaga supresora queda por encima de las reglas que suprime
+            for otra in reglas:
+                if otra["diagnostico"]["plaga"] in regla["suprimida_por"] and otra is not regla:
+                    assert por_nombre[otra["nombre"]].salience > por_nombre[regla["nombre"]].salience
+        for regla in original.reglas:
+            nueva = por_nombre[regla.nombre]
+            assert nueva.salience >= regla.salience
+            assert sorted(map(repr, nueva.negaciones)) == sorted(map(repr, regla.negaciones))
+            assert [h.clave for h in nueva.hechos] == [h.clave for h in regla.hechos]
+            for _ in range(60):
+                sintomas = rng.sample(vocabulario, rng.randint(0, 5))
+                assert (nueva.activacion.evaluar(generado.mascara(sintomas))
+                        == regla.activacion.evaluar(original.mascara(sintomas)))
+
+    def test_regla_que_nunca_dispara(self):
+        class ReglasPera(KnowledgeEngine):
+            @Rule(Caso(cultivo="pera", sintomas=MATCH.s),
+                  TEST(lambda s: "manchas" in s and "manchas" not in s))
+            def imposible(self):
+                self.declare(Diagnostico(plaga="Nada", certeza=1.0, regla_activada="imposible"))
+
+        with pytest.raises(BaseInvalida, match="imposible"):
+            exportar_base(ReglasPera, "pera")
+
+    def test_fuente_legible(self):
+        fuente = generar_fuente(exportar_base(MAPA_CULTIVOS["cacao"], "cacao"))
+        assert "class ReglasCacao(KnowledgeEngine):" in fuente
+        assert "NOT(Diagnostico())" in fuente
+        compile(fuente, "<cacao>", "exec")
@@ -0,0 +1,109 @@
+import pytest
+import random
+import subprocess
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import obtener_matcher
+from engine.diagramas import construir_diagrama, obtener_diagrama
+from tests.test_compilado import CASOS
+from tests.test_tablas import ReglasPera
+
+
+@pytest.fixture
+def experta():
+    return SistemaExpertoPlagas()
+
+
+@pytest.fixture
+def diagrama():
+    return SistemaExpertoPlagas(backend="diagrama")
+
+
+class TestEquivalencia:
+    """El backend diagrama debe devolver exactamente lo mismo que experta."""
+
+    @pytest.mark.parametrize("cultivo,sintomas", CASOS)
+    def test_casos_conocidos(self, experta, diagrama, cultivo, sintomas):
+        assert diagrama.diagnosticar(cultivo, sintomas) == experta.diagnosticar(cultivo, sintomas)
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_casos_aleatorios(self, experta, diagrama, cultivo):
+        rng = random.Random(f"diagrama-{cultivo}")
+        vocabulario = list(obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo).vocabulario)
+        for _ in range(40):
+            sintomas = rng.sample(vocabulario, rng.randint(0, 7)) + ["ruido"]
+            assert diagrama.diagnosticar(cultivo, sintomas) == experta.diagnosticar(cultivo, sintomas)
+
+    @pytest.mark.parametrize("cultivo", ["café", "cacao"])
+    def test_todas_las_combinaciones(self, cultivo):
+        """En los cultivos chicos, cada combinación de síntomas coincide con el matcher"""
+        matcher = obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo)
+        diagrama = obtener_diagrama(MAPA_CULTIVOS[cultivo], cultivo)
+        vocabulario = matcher.vocabulario
+        for m in range(0, 1 << len(vocabulario), 7):
+            sintomas = {s for i, s in enumerate(vocabulario) if m >> i & 1}
+            assert list(diagrama.declarados(sintomas)) == matcher.declarados(sintomas)
+
+    def test_metricas(self, diagrama):
+        resultado = diagrama.diagnosticar("limon", ["mielada", "fumagina"], metricas=True)
+        assert resultado["metricas"]["origen"] == "diagrama"
+        assert resultado["metricas"]["reglas_coincidentes"] >= 1
+
+
+class TestDiagrama:
+    """Forma de los diagramas"""
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_reducido(self, cultivo):
+        d = obtener_diagrama(MAPA_CULTIVOS[cultivo], cultivo)
+        nodos = list(zip(d.variables, d.bajo, d.alto))
+        assert all(bajo != alto for _, bajo, alto in nodos)
+        assert len(set(nodos)) == len(nodos)
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_a_lo_sumo_una_pregunta_por_sintoma(self, cultivo):
+        e = obtener_diagrama(MAPA_CULTIVOS[cultivo], cultivo).estadisticas()
+        assert e["camino_maximo"] <= e["sintomas"]
+
+    def test_mismo_tamano_en_cada_construccion(self):
+        """El tamaño no depende del orden de la agenda de este proceso"""
+        tamanos = {construir_diagrama(MAPA_CULTIVOS["uva"], "uva").nodos for _ in range(2)}
+        assert len(tamanos) == 1
+
+    def test_combinaciones_resueltas(self):
+        chico = construir_diagrama(MAPA_CULTIVOS["cacao"], "cacao")
+        assert chico.estadisticas()["resueltos"] > 0
+        grande = construir_diagrama(MAPA_CULTIVOS["papa"], "papa", limite=4)
+        assert grande.estadisticas()["resueltos"] == 0
+        grande.declarados({"ruido"})
+        assert len(grande.resueltos) == 1
+
+
+class TestDiagramaDelProceso:
+    """Los diagramas se arman en cada proceso, con su orden de disparo."""
+
+    def test_una_por_proceso(self):
+        assert obtener_diagrama(ReglasPera, "pera") is obtener_diagrama(ReglasPera, "pera")
+
+    @pytest.mark.parametrize("semilla", ["0", "12345"])
+    def test_otra_semilla_de_hash(self, semilla):
+        """En un proceso con otra PYTHONHASHSEED, el diagrama de ese proceso sigue igual a experta"""
+        codigo = ("import random; from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS; "
+                  "from engine.compilado import obtener_matcher; "
+                  "e, d = SistemaExpertoPlagas(), SistemaExpertoPlagas(backend='diagrama'); "
+                  "rng = random.Random(3); distintos = 0\n"
+                  "for c in MAPA_CULTIVOS:\n"
+                  "    v = list(obtener_matcher(MAPA_CULTIVOS[c], c).vocabulario)\n"
+                  "    for _ in range(150):\n"
+                  "        s = rng.sample(v, rng.randint(0, 6))\n"
+                  "        distintos += d.diagnosticar(c, s) != e.diagnosticar(c, s)\n"
+                  "print(distintos)")
+        entorno = dict(os.environ, PYTHONHASHSEED=semilla)
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                                env=entorno, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        assert salida.returncode == 0, salida.stderr
+        assert salida.stdout.strip() == "0"
@@ -0,0 +1,120 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.compilado import MatcherCompilado
+from engine.equivalencia import verificar, vocabulario_de, casos_borde, main, DESCONOCIDO
+from engine.registro import REGISTRO
+from experta import KnowledgeEngine, Rule, MATCH, TEST, NOT
+from knowledge.hechos import Caso, Diagnostico
+
+
+class ReglasPera(KnowledgeEngine):
+    @Rule(Caso(cultivo="pera", sintomas=MATCH.s),
+          TEST(lambda s: {"manchas", "hojas_secas"}.issubset(s)))
+    def moteado(self):
+        self.declare(Diagnostico(plaga="Moteado", certeza=1.0, regla_activada="moteado"))
+
+    @Rule(Caso(cultivo="pera", sintomas=MATCH.s),
+          TEST(lambda s: len({"manchas", "hojas_secas", "frutos_rajados"} & s) >= 1),
+          NOT(Diagnostico(plaga="Moteado")))
+    def moteado_parcial(self):
+        self.declare(Diagnostico(plaga="Moteado – sospecha", certeza=0.5,
+                                 regla_activada="moteado_parcial"))
+
+
+GRAVES = {"hojas_negras", "frutos_caidos"}
+
+
+class ReglasMango(KnowledgeEngine):
+    @Rule(Caso(cultivo="mango", sintomas=MATCH.s),
+          TEST(lambda s: GRAVES <= s))
+    def grave(self):
+        self.declare(Diagnostico(plaga="Grave", certeza=1.0, regla_activada="grave"))
+
+
+@pytest.fixture
+def con_mango():
+    REGISTRO.registrar("mango", ReglasMango, sintomas=["flores_secas"])
+    yield
+    REGISTRO.quitar("mango")
+
+
+@pytest.fixture
+def con_pera():
+    REGISTRO.registrar("pera", ReglasPera)
+    yield
+    REGISTRO.quitar("pera")
+
+
+@pytest.fixture
+def compilado_roto(monkeypatch):
+    """Backend compilado que pierde los diagnósticos cuando aparece moho_gris"""
+    original = MatcherCompilado.declarados
+
+    def declarados(self, sintomas, conteos=None):
+        if "moho_gris" in sintomas:
+            return []
+        return original(self, sintomas, conteos)
+
+    monkeypatch.setattr(MatcherCompilado, "declarados", declarados)
+
+
+class TestVerificar:
+    """Verificación diferencial contra experta"""
+
+    def test_todas_las_combinaciones(self, con_pera):
+        informe = verificar(["pera"], procesos=1)
+        datos = informe["cultivos"]["pera"]
+        assert datos["modo"] == "todas"
+        assert datos["casos"] == 2 ** datos["sintomas"]
+        assert datos["divergencias"] == []
+        assert informe["backends"] == ["compilado", "tabla", "generado", "diagrama"]
+
+    def test_muestras_con_casos_borde(self):
+        informe = verificar(["café"], backends=["compilado", "diagrama"], procesos=1,
+                            muestras=100, limite=10, tamano_trozo=64)
+        datos = informe["cultivos"]["café"]
+        assert datos["modo"] == "muestras"
+        assert datos["casos"] > 100 + datos["sintomas"] ** 2 // 2
+        assert datos["divergencias"] == []
+
+    def test_contraejemplo_minimo(self, compilado_roto):
+        informe = verificar(["uva"], backends=["compilado"], procesos=1, muestras=200, maximo=2)
+        divergencias = informe["cultivos"]["uva"]["divergencias"]
+        assert len(divergencias) == 2
+        assert divergencias[0]["indice"] < divergencias[1]["indice"]
+        for d in divergencias:
+            assert "moho_gris" in d["sintomas"]
+            assert d["minimo"] == ["moho_gris"]
+            assert d["obtenido"] == [] and d["experta"]
+
+    def test_en_paralelo(self, con_pera):
+        informe = verificar(["pera"], backends=["compilado"], procesos=2, tamano_trozo=2)
+        assert informe["procesos"] == 2
+        assert informe["cultivos"]["pera"]["casos"] == 8
+        assert informe["cultivos"]["pera"]["divergencias"] == []
+
+    def test_casos_borde(self):
+        casos = casos_borde(["a", "b", "c"])
+        assert [] in casos and ["a", "b", "c"] in casos and ["b"] in casos
+        assert ["a", "c"] in casos
+        assert ["a", "b", "c", DESCONOCIDO] in casos
+
+    def test_main(self, con_pera, capsys):
+        assert main(["pera", "--procesos", "1", "--backends", "compilado"]) == 0
+        assert "pera: 8 casos (todas" in capsys.readouterr().out
+
+    def test_vocabulario_sin_el_compilador(self, con_pera, con_mango):
+        assert vocabulario_de("pera") == ["frutos_rajados", "hojas_secas", "manchas"]
+        # Síntomas del registro y de las constantes del módulo, aunque no compile
+        assert vocabulario_de("mango") == ["flores_secas", "frutos_caidos", "hojas_negras"]
+
+    def test_sin_compilar_queda_sin_verificar(self, con_mango, capsys):
+        datos = verificar(["mango"], backends=["compilado"], procesos=1)["cultivos"]["mango"]
+        assert datos["modo"] == "sin_compilar" and not datos["verificado"]
+        assert datos["casos"] == 0 and "GRAVES" in datos["motivo"]
+        assert main(["mango", "--procesos", "1", "--backends", "compilado"]) == 2
+        assert "mango: SIN VERIFICAR" in capsys.readouterr().out
@@ -0,0 +1,86 @@
+import pickle
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.cache import CacheDiagnosticos
+from engine.resultado import DiagnosticoItem
+from knowledge.hechos import Ficha
+
+
+class TestFicha:
+    """Pruebas de las fichas internadas"""
+
+    def test_internada(self):
+        """Dos fichas con el mismo contenido son el mismo objeto"""
+        a = Ficha.interna({"umbral": "5%", "recomendaciones": ["x", "y"]})
+        b = Ficha.interna({"umbral": "5%", "recomendaciones": ("x", "y")})
+        assert a is b
+        assert a["recomendaciones"] == ("x", "y")
+
+    def test_es_inmutable(self):
+        """Una ficha no se puede modificar"""
+        ficha = Ficha.interna({"umbral": "5%"})
+        with pytest.raises(TypeError):
+            ficha["umbral"] = "10%"
+
+    def test_pickle_conserva_identidad(self):
+        """Al deserializar se obtiene la ficha ya internada"""
+        ficha = Ficha.interna({"umbral": "5%", "imagen": {"ruta": "a.jpg"}})
+        assert pickle.loads(pickle.dumps(ficha)) is ficha
+
+
+class TestDiagnosticosPrecalculados:
+    """Pruebas de los diagnósticos que devuelve el motor"""
+
+    @pytest.fixture
+    def sistema(self):
+        return SistemaExpertoPlagas()
+
+    def test_ficha_compartida_entre_disparos(self, sistema):
+        """La misma regla declara siempre la misma ficha"""
+        a = sistema.diagnosticar("cacao", ["brotes_anormales"])["diagnosticos"][0]
+        b = sistema.diagnosticar("cacao", ["brotes_anormales", "mazorcas_deformes"])
+        mismo = [d for d in b["diagnosticos"] if d["regla_activada"] == a["regla_activada"]]
+        assert mismo
+        assert mismo[0].ficha is a.ficha
+
+    def test_vista_de_solo_lectura(self, sistema):
+        """Los diagnósticos se leen como diccionarios, pero no se modifican"""
+        diag = sistema.diagnosticar("uva", ["tejido_araña"])["diagnosticos"][0]
+        assert isinstance(diag, DiagnosticoItem)
+        with pytest.raises(TypeError):
+            diag["plaga"] = "otra"
+        assert not hasattr(diag, "pop")
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_campos_de_la_interfaz(self, sistema, cultivo):
+        """plaga, certeza, umbral y recomendaciones siguen accesibles"""
+        for sintoma in ["tejido_araña", "brotes_anormales", "minas_hojas", "frutos_perforados"]:
+            for diag in sistema.diagnosticar(cultivo, [sintoma])["diagnosticos"]:
+                assert isinstance(diag["plaga"], str)
+                assert isinstance(diag["certeza"], float)
+                assert "ficha" not in diag
+                for clave in diag:
+                    diag[clave]
+                assert diag.get("recomendaciones", ()) is not None
+
+    @pytest.mark.parametrize("backend", ["compilado", "tabla"])
+    def test_backends_equivalentes(self, backend):
+        """Los otros backends devuelven las mismas vistas que experta"""
+        base = SistemaExpertoPlagas()
+        otro = SistemaExpertoPlagas(backend=backend)
+        for sintomas in [["brotes_anormales"], ["mazorcas_deformes", "brotes_anormales"]]:
+            assert (otro.diagnosticar("cacao", sintomas)["diagnosticos"]
+                    == base.diagnosticar("cacao", sintomas)["diagnosticos"])
+
+    def test_cache_comparte_items(self):
+        """La caché guarda los items una vez y los entrega sin copiarlos"""
+        sistema = SistemaExpertoPlagas(cache=CacheDiagnosticos(MAPA_CULTIVOS))
+        a = sistema.diagnosticar("cacao", ["brotes_anormales"])
+        b = sistema.diagnosticar("cacao", ["brotes_anormales"])
+        assert a["diagnosticos"] is not b["diagnosticos"]
+        assert a["diagnosticos"][0] is b["diagnosticos"][0]
@@ -0,0 +1,117 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import obtener_matcher
+from engine import generado
+from engine.generado import MatcherGenerado, cargar_modulo, generar_fuente, obtener_generado
+from experta import KnowledgeEngine, Rule, MATCH
+from knowledge.hechos import Caso, Diagnostico
+from tests.test_compilado import CASOS
+
+
+@pytest.fixture
+def experta():
+    return SistemaExpertoPlagas()
+
+
+@pytest.fixture
+def generado_():
+    return SistemaExpertoPlagas(backend="generado")
+
+
+class TestEquivalencia:
+    """El backend generado debe devolver exactamente lo mismo que experta."""
+
+    @pytest.mark.parametrize("cultivo,sintomas", CASOS)
+    def test_casos_conocidos(self, experta, generado_, cultivo, sintomas):
+        assert generado_.diagnosticar(cultivo, sintomas) == experta.diagnosticar(cultivo, sintomas)
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_casos_aleatorios(self, experta, generado_, cultivo):
+        rng = random.Random(f"generado-{cultivo}")
+        vocabulario = list(obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo).vocabulario)
+        for _ in range(40):
+            sintomas = rng.sample(vocabulario, rng.randint(0, 7)) + ["ruido"]
+            assert generado_.diagnosticar(cultivo, sintomas) == experta.diagnosticar(cultivo, sintomas)
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_misma_activacion_que_el_matcher(self, cultivo):
+        """Regla por regla, el código generado activa y declara igual que las Condicion"""
+        matcher = obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo)
+        modulo = cargar_modulo(MAPA_CULTIVOS[cultivo], cultivo, matcher)
+        bits = {nombre: 1 << j for j, nombre in enumerate(modulo.REGLAS)}
+        activas = modulo.crear(tuple(bits.values()))
+        rng = random.Random(cultivo)
+        vocabulario = list(matcher.vocabulario)
+        for _ in range(200):
+            sintomas = set(rng.sample(vocabulario, rng.randint(0, 8)))
+            m = matcher.mascara(sintomas)
+            activadas, declaran = activas(sintomas)
+            for regla in matcher.reglas:
+                bit = bits[regla.nombre]
+                assert bool(activadas & bit) == bool(regla.activacion.evaluar(m)), regla.nombre
+                if activadas & bit:
+                    assert bool(declaran & bit) == bool(regla.declaracion.evaluar(m)), regla.nombre
+
+    def test_metricas(self, generado_):
+        resultado = generado_.diagnosticar("uva", ["verrugas_hojas", "nudosidades_raices"], metricas=True)
+        assert resultado["metricas"]["origen"] == "generado"
+        assert resultado["metricas"]["reglas_coincidentes"] >= 1
+
+    def test_regla_no_compilable_vuelve_a_experta(self):
+        class ReglasRaras(KnowledgeEngine):
+            @Rule(Caso(cultivo="raro", sintomas=MATCH.s))
+            def regla(self, s):
+                self.declare(Diagnostico(plaga="Rara", certeza=len(s) / 10, regla_activada="regla"))
+
+        assert obtener_generado(ReglasRaras, "raro") is None
+
+
+class TestModulo:
+    """Generación y caché en disco de los módulos"""
+
+    def test_fuente(self):
+        fuente = generar_fuente(MAPA_CULTIVOS["uva"], "uva")
+        assert "def crear(bits):" in fuente and "frozenset(" in fuente
+        assert "'verrugas_hojas' in s" in fuente
+        # No depende del orden de la agenda de este proceso
+        assert fuente == generar_fuente(MAPA_CULTIVOS["uva"], "uva")
+
+    def test_un_matcher_por_proceso(self):
+        matcher = obtener_generado(MAPA_CULTIVOS["papa"], "papa")
+        assert isinstance(matcher, MatcherGenerado)
+        assert matcher is obtener_generado(MAPA_CULTIVOS["papa"], "papa")
+
+    def test_cache_en_disco(self, tmp_path, monkeypatch):
+        clase = MAPA_CULTIVOS["cacao"]
+        matcher = obtener_matcher(clase, "cacao")
+        modulo = cargar_modulo(clase, "cacao", matcher, str(tmp_path))
+        assert os.path.dirname(modulo.__file__) == str(tmp_path)
+        huella = generado.huella_reglas(clase, "cacao")
+        assert os.path.basename(modulo.__file__) == f"reglascacao_{huella[:16]}.py"
+
+        # Otro "proceso": el módulo sale del disco sin volver a generarlo
+        def sin_generar(*args, **kwargs):
+            raise AssertionError("debió salir de la caché")
+
+        monkeypatch.setattr(generado, "generar_fuente", sin_generar)
+        assert cargar_modulo(clase, "cacao", matcher, str(tmp_path)).REGLAS == modulo.REGLAS
+
+        # Si cambia la huella (reglas o generador), se vuelve a generar
+        monkeypatch.setattr(generado, "VERSION_GENERADOR", generado.VERSION_GENERADOR + 1)
+        with pytest.raises(AssertionError):
+            cargar_modulo(clase, "cacao", matcher, str(tmp_path))
+
+    def test_archivo_danado(self, tmp_path):
+        clase = MAPA_CULTIVOS["café"]
+        matcher = obtener_matcher(clase, "café")
+        ruta = cargar_modulo(clase, "café", matcher, str(tmp_path)).__file__
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("esto no es python(")
+        modulo = cargar_modulo(clase, "café", matcher, str(tmp_path))
+        assert set(modulo.REGLAS) == {r.nombre for r in matcher.reglas}
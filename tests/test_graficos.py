@@ -0,0 +1,78 @@
+import json
+import pytest
+import subprocess
+import sys
+import os
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from ui import graficos
+from ui.graficos import TEMAS, especificacion_gauge, svg_gauge, figura_gauge
+
+
+class TestEspecificacion:
+    """Figura del medidor memoizada por (certeza, tema)"""
+
+    @pytest.mark.parametrize("tema", list(TEMAS))
+    def test_indicador(self, tema):
+        figura = json.loads(especificacion_gauge(0.75, tema))
+        indicador = figura["data"][0]
+        assert indicador["type"] == "indicator" and indicador["mode"] == "gauge+number"
+        assert indicador["value"] == 75
+        assert indicador["title"]["text"] == TEMAS[tema]["titulo"]
+        assert ("threshold" in indicador["gauge"]) == (TEMAS[tema]["umbral"] is not None)
+
+    def test_misma_cadena_para_la_misma_certeza(self):
+        a = especificacion_gauge(0.7, "uva")
+        assert especificacion_gauge(0.1 * 7, "uva") is a
+        assert especificacion_gauge(0.9, "uva") != a
+
+    def test_color_segun_corte(self):
+        baja = json.loads(especificacion_gauge(0.6, "cacao"))["data"][0]["gauge"]["bar"]["color"]
+        alta = json.loads(especificacion_gauge(0.9, "cacao"))["data"][0]["gauge"]["bar"]["color"]
+        assert (baja, alta) == ("#ff9800", "#4caf50")
+
+    def test_layout(self):
+        assert json.loads(especificacion_gauge(1.0, "palta"))["layout"]["height"] == 300
+        assert json.loads(especificacion_gauge(1.0, "limon"))["layout"] == {}
+
+    def test_tema_desconocido(self):
+        with pytest.raises(KeyError):
+            especificacion_gauge(0.5, "mango")
+
+    def test_figura_de_plotly(self):
+        pytest.importorskip("plotly")
+        figura = figura_gauge(0.95, "uva")
+        assert figura is figura_gauge(0.95, "uva")
+        assert figura.data[0].value == 95
+
+
+class TestSvg:
+    """Medidor estático sin plotly"""
+
+    @pytest.mark.parametrize("certeza", [0.0, 0.6, 0.75, 1.0])
+    def test_svg_valido(self, certeza):
+        raiz = ET.fromstring(svg_gauge(certeza, "cacao"))
+        textos = [t.text for t in raiz.iter("{http://www.w3.org/2000/svg}text")]
+        assert textos == [f"{certeza * 100:.0f}", "Confianza"]
+        arcos = list(raiz.iter("{http://www.w3.org/2000/svg}path"))
+        assert len(arcos) == 3 + (certeza > 0)
+
+    def test_umbral(self):
+        assert "<line" in svg_gauge(0.8, "uva")
+        assert "<line" not in svg_gauge(0.8, "papa")
+
+    def test_memoizado(self):
+        antes = graficos.estadisticas()["svg"]["hits"]
+        svg_gauge(0.85, "palta")
+        svg_gauge(0.85, "palta")
+        assert graficos.estadisticas()["svg"]["hits"] > antes
+
+    def test_no_importa_plotly_ni_streamlit(self):
+        codigo = ("import sys; from ui import graficos; graficos.svg_gauge(0.9, 'uva'); "
+                  "graficos.especificacion_gauge(0.9, 'uva'); "
+                  "print('plotly' in sys.modules, 'streamlit' in sys.modules)")
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        assert salida.stdout.split() == ["False", "False"]
@@ -0,0 +1,122 @@
+import io
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine import imagenes
+from engine.imagenes import ManifiestoImagenes, referencias, ruta_cultivo
+from engine.motor import MAPA_CULTIVOS
+
+
+@pytest.fixture
+def directorio(tmp_path):
+    (tmp_path / "cacao").mkdir()
+    (tmp_path / "cacao" / "escoba_bruja.JPG").write_bytes(b"escoba")
+    (tmp_path / "uva").mkdir()
+    (tmp_path / "uva" / "aranita_roja.webp").write_bytes(b"aranita")
+    (tmp_path / "uva" / "notas.txt").write_text("no es imagen")
+    return tmp_path
+
+
+@pytest.fixture
+def manifiesto(directorio, tmp_path_factory):
+    return ManifiestoImagenes(str(directorio), str(tmp_path_factory.mktemp("miniaturas")))
+
+
+class TestManifiesto:
+    """Índice de images/ y caché en memoria"""
+
+    def test_indice(self, manifiesto):
+        assert len(manifiesto) == 2
+        assert sorted(i.ruta for i in manifiesto) == ["cacao/escoba_bruja.JPG", "uva/aranita_roja.webp"]
+
+    def test_resuelve_mayusculas_prefijo_y_extension(self, manifiesto):
+        assert manifiesto.resolver("cacao/escoba_bruja.jpg").ruta == "cacao/escoba_bruja.JPG"
+        assert manifiesto.resolver("images/cacao/escoba_bruja.jpg") is not None
+        assert manifiesto.resolver("uva/aranita_roja.jpg").ruta == "uva/aranita_roja.webp"
+        assert manifiesto.faltantes == {}
+
+    def test_faltante_se_informa_una_vez(self, manifiesto, capsys):
+        assert manifiesto.obtener("uva/aves.jpg", "uva") is None
+        assert manifiesto.miniatura("uva/aves.jpg") is None
+        assert manifiesto.faltantes == {"uva/aves.jpg": "uva"}
+        assert capsys.readouterr().err.count("uva/aves.jpg") == 1
+
+    def test_bytes_desde_memoria(self, manifiesto, directorio):
+        assert manifiesto.obtener("cacao/escoba_bruja.jpg") == b"escoba"
+        (directorio / "cacao" / "escoba_bruja.JPG").write_bytes(b"otra")
+        assert manifiesto.obtener("cacao/escoba_bruja.jpg") == b"escoba"
+        e = manifiesto.estadisticas()
+        assert (e["aciertos"], e["fallos"], e["entradas"]) == (1, 1, 1)
+
+    def test_escanear_ve_los_cambios(self, manifiesto, directorio):
+        manifiesto.obtener("cacao/escoba_bruja.jpg")
+        archivo = directorio / "cacao" / "escoba_bruja.JPG"
+        archivo.write_bytes(b"nueva version")
+        os.utime(archivo, ns=(1, 1))
+        manifiesto.escanear()
+        assert manifiesto.obtener("cacao/escoba_bruja.jpg") == b"nueva version"
+
+    def test_lru_por_bytes(self, directorio, tmp_path_factory):
+        manifiesto = ManifiestoImagenes(str(directorio), str(tmp_path_factory.mktemp("m")), max_bytes=8)
+        manifiesto.obtener("cacao/escoba_bruja.jpg")
+        manifiesto.obtener("uva/aranita_roja.webp")
+        e = manifiesto.estadisticas()
+        assert e["entradas"] == 1 and e["bytes"] == 7 and e["expulsados"] == 1
+
+    def test_sin_pillow_la_miniatura_es_el_original(self, manifiesto, monkeypatch, capsys):
+        monkeypatch.setattr(imagenes, "Image", None)
+        monkeypatch.setattr(imagenes, "_SIN_PILLOW_AVISADO", False)
+        assert manifiesto.miniatura("uva/aranita_roja.webp") == b"aranita"
+        assert manifiesto.miniatura("cacao/escoba_bruja.jpg") is not None
+        assert capsys.readouterr().err.count("no está instalado") == 1
+
+
+class TestMiniaturas:
+    """Miniaturas generadas con Pillow"""
+
+    @pytest.fixture
+    def foto(self, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+        (tmp_path / "papa").mkdir()
+        Image.new("RGB", (1200, 600), "green").save(tmp_path / "papa" / "acaros.jpg")
+        return tmp_path
+
+    def test_reduce_y_guarda_en_disco(self, foto, tmp_path_factory):
+        from PIL import Image
+        directorio_miniaturas = tmp_path_factory.mktemp("miniaturas")
+        manifiesto = ManifiestoImagenes(str(foto), str(directorio_miniaturas))
+        datos = manifiesto.miniatura("papa/acaros.jpg", ancho=300)
+        with Image.open(io.BytesIO(datos)) as reducida:
+            assert reducida.size == (300, 150)
+            assert reducida.format == "WEBP"
+        assert manifiesto.estadisticas()["generadas"] == 1
+
+        # Otro proceso la lee de disco sin volver a generarla
+        otro = ManifiestoImagenes(str(foto), str(directorio_miniaturas))
+        assert otro.miniatura("papa/acaros.jpg", ancho=300) == datos
+        assert otro.estadisticas()["generadas"] == 0
+
+
+class TestReferencias:
+    """Campo `imagen` de las reglas"""
+
+    def test_rutas_relativas_a_images(self):
+        rutas = dict(referencias({"papa": MAPA_CULTIVOS["papa"]}))
+        assert rutas["papa"].startswith("papa/papa/")
+        assert ruta_cultivo("papa", "papa/acaros.jpg") == "papa/papa/acaros.jpg"
+        assert ruta_cultivo("uva", "uva/aves.webp") == "uva/aves.webp"
+
+    def test_validar(self, manifiesto):
+        faltan = manifiesto.validar({"uva": MAPA_CULTIVOS["uva"]})
+        assert "uva/aranita_roja.jpg" not in faltan["uva"]
+        assert "uva/abejas.webp" in faltan["uva"]
+        assert all(manifiesto.faltantes[r] == "uva" for r in faltan["uva"])
+
+    def test_imagenes_del_proyecto(self):
+        """Las del proyecto se encuentran aunque cambie la extensión o las mayúsculas"""
+        manifiesto = ManifiestoImagenes()
+        assert manifiesto.resolver("cacao/escoba_bruja.jpg") is not None
+        assert manifiesto.resolver("uva/Filóxera_uva.jpg") is not None
@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.pool import PoolMotores
+
+
+CASOS = [
+    ("uva", ["verrugas_hojas", "nudosidades_raices"]),
+    ("café", ["frutos_perforados", "granos_dañados", "cerezas_caidas"]),
+    ("uva", ["nudosidades_raices", "verrugas_hojas"]),
+    ("mango", ["hojas_enrolladas"]),
+    ("Papa", ["hojas_enrolladas", "hojas_amarillentas"]),
+    ("uva", ["tejido_araña"]),
+    ("café", ["frutos_perforados", "granos_dañados", "cerezas_caidas"]),
+]
+
+
+@pytest.fixture(params=["experta", "compilado"])
+def sistema(request):
+    return SistemaExpertoPlagas(backend=request.param, pool=PoolMotores(MAPA_CULTIVOS))
+
+
+class TestDiagnosticoLote:
+    """Verifica el diagnóstico por lotes."""
+
+    def test_mismo_resultado_y_orden_que_uno_a_uno(self, sistema):
+        lote = sistema.diagnosticar_lote(CASOS)
+        assert lote["resultados"] == [sistema.diagnosticar(c, s) for c, s in CASOS]
+
+    def test_deduplica_conjuntos_repetidos(self, sistema):
+        lote = sistema.diagnosticar_lote(CASOS)
+        assert lote["casos"] == 7
+        # uva x2, café x1, papa x1 (mango no cuenta)
+        assert lote["unicos"] == 4
+        assert lote["casos_por_segundo"] > 0
+
+    def test_un_motor_por_cultivo(self):
+        pool = PoolMotores(MAPA_CULTIVOS)
+        sistema = SistemaExpertoPlagas(pool=pool)
+        sistema.diagnosticar_lote(CASOS * 50)
+        stats = pool.estadisticas()
+        assert stats["uva"]["construidos"] == 1
+        assert stats["uva"]["aciertos"] == 0
+
+    def test_resultados_duplicados_son_independientes(self, sistema):
+        resultados = sistema.diagnosticar_lote(CASOS)["resultados"]
+        resultados[1]["diagnosticos"].clear()
+        assert resultados[6]["diagnosticos"]
+
+    def test_cultivo_no_soportado_en_lote(self, sistema):
+        resultados = sistema.diagnosticar_lote(CASOS)["resultados"]
+        assert "no soportado" in resultados[3]["error"]
+
+    def test_lote_vacio(self, sistema):
+        lote = sistema.diagnosticar_lote([])
+        assert lote["resultados"] == [] and lote["casos"] == 0
+
+    def test_acepta_generadores(self, sistema):
+        lote = sistema.diagnosticar_lote((("cacao", []) for _ in range(3)))
+        assert lote["casos"] == 3 and lote["unicos"] == 1
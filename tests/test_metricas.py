@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS, POOL_MOTORES
+from engine.cache import CacheDiagnosticos
+from engine.metricas import METRICAS, Histograma
+
+SINTOMAS = ["frutos_perforados", "granos_dañados", "cerezas_caidas"]
+
+
+@pytest.fixture(autouse=True)
+def metricas_limpias():
+    METRICAS.reiniciar()
+    yield
+    METRICAS.reiniciar()
+
+
+class TestMetricasDiagnostico:
+    """Instrumentación de diagnosticar."""
+
+    @pytest.mark.parametrize("backend,fases", [
+        ("experta", {"motor", "reset", "declare", "run", "resultado"}),
+        ("compilado", {"matcher", "evaluar", "resultado"}),
+    ])
+    def test_fases_y_conteos(self, backend, fases):
+        sistema = SistemaExpertoPlagas(backend=backend)
+        resultado = sistema.diagnosticar("café", SINTOMAS, metricas=True)
+        metricas, resultado.metricas = resultado["metricas"], None
+        assert resultado == SistemaExpertoPlagas().diagnosticar("café", SINTOMAS)
+        assert set(metricas["fases_ms"]) == fases
+        assert metricas["origen"] == backend
+        assert metricas["total_ms"] >= sum(metricas["fases_ms"].values()) * 0.99
+        assert metricas["activaciones_disparadas"] >= 1
+        assert metricas["reglas_coincidentes"] >= metricas["activaciones_disparadas"]
+        assert metricas["hechos"] == len(resultado["diagnosticos"]) + 2
+
+    def test_conteos_iguales_en_ambos_backends(self):
+        experta = SistemaExpertoPlagas().diagnosticar("uva", ["tejido_araña"], metricas=True)
+        compilado = SistemaExpertoPlagas(backend="compilado").diagnosticar(
+            "uva", ["tejido_araña"], metricas=True)
+        for clave in ("reglas_coincidentes", "activaciones_disparadas", "hechos"):
+            assert experta["metricas"][clave] == compilado["metricas"][clave]
+
+    def test_sin_metricas_no_hay_clave(self):
+        assert "metricas" not in SistemaExpertoPlagas().diagnosticar("café", SINTOMAS)
+        assert METRICAS.volcar() == {}
+
+    def test_motor_queda_como_estaba(self):
+        SistemaExpertoPlagas().diagnosticar("cacao", ["brotes_anormales"], metricas=True)
+        with POOL_MOTORES.motor("cacao") as motor:
+            assert "update_agenda" not in vars(motor.strategy)
+            assert "get_next" not in vars(motor.agenda)
+
+    def test_cache(self):
+        sistema = SistemaExpertoPlagas(cache=CacheDiagnosticos(MAPA_CULTIVOS))
+        primero = sistema.diagnosticar("café", SINTOMAS, metricas=True)
+        segundo = sistema.diagnosticar("café", SINTOMAS, metricas=True)
+        assert "cache_guardar" in primero["metricas"]["fases_ms"]
+        assert segundo["metricas"]["origen"] == "cache"
+        assert sistema.diagnosticar("café", SINTOMAS).keys() == {"diagnosticos", "reglas_activadas"}
+
+
+class TestMetricasProceso:
+    """Agregado de métricas de todo el proceso."""
+
+    def test_instrumentar_acumula(self):
+        sistema = SistemaExpertoPlagas(instrumentar=True)
+        for _ in range(3):
+            assert "metricas" not in sistema.diagnosticar("café", SINTOMAS)
+        datos = METRICAS.volcar()["café"]
+        assert datos["diagnosticos"] == {"experta": 3}
+        assert datos["total_ms"]["cuenta"] == 3
+        assert datos["fases_ms"]["run"]["cubetas"]["+Inf"] == 3
+
+    def test_texto_prometheus(self):
+        SistemaExpertoPlagas(instrumentar=True).diagnosticar("uva", ["tejido_araña"])
+        texto = METRICAS.texto_prometheus()
+        assert 'plagas_diagnosticos_total{cultivo="uva",origen="experta"} 1' in texto
+        assert 'plagas_fase_ms_count{cultivo="uva",fase="total"} 1' in texto
+
+    def test_histograma(self):
+        histograma = Histograma((1, 10))
+        for valor in (0.5, 1, 5, 50):
+            histograma.observar(valor)
+        assert histograma.como_dict() == {
+            "cuenta": 4, "suma": 56.5, "cubetas": {"1": 2, "10": 3, "+Inf": 4}}
@@ -0,0 +1,119 @@
+import pytest
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+import engine.paralelo as paralelo
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import obtener_matcher
+from engine.paralelo import DiagnosticoParalelo
+
+CASOS = [
+    ("uva", ["verrugas_hojas", "nudosidades_raices"]),
+    ("limon", ["mielada", "fumagina", "hojas_amarillentas"]),
+    ("palta", ["raspado_frutos", "rugosidad_frutos"]),
+    ("café", ["frutos_perforados", "granos_dañados", "cerezas_caidas"]),
+    ("cacao", ["manchas_negras_mazorca", "lluvia_reciente"]),
+    ("papa", ["hojas_enrolladas", "hojas_amarillentas"]),
+    ("mango", ["x"]),
+] * 3
+
+# "fork": los trabajadores heredan los motores de este proceso y disparan igual
+CONTEXTO = multiprocessing.get_context("fork")
+
+
+@pytest.fixture(scope="module")
+def esperados():
+    return SistemaExpertoPlagas().diagnosticar_lote(CASOS)["resultados"]
+
+
+def _morir_una_vez(indices, casos):
+    marca = os.environ["MARCA_CAIDA"]
+    if not os.path.exists(marca):
+        open(marca, "w").close()
+        os._exit(1)
+    return _original(indices, casos)
+
+
+def _fallar_con_papa(indices, casos):
+    if any(cultivo == "papa" for cultivo, _ in casos):
+        raise RuntimeError("trozo roto")
+    return _original(indices, casos)
+
+
+_original = paralelo._diagnosticar_trozo
+
+
+class TestDiagnosticoParalelo:
+    """Verifica el reparto de lotes entre procesos."""
+
+    def test_mismos_resultados(self, esperados):
+        with DiagnosticoParalelo(procesos=2, tamano_trozo=4, mp_context=CONTEXTO) as par:
+            lote = par.diagnosticar_lote(CASOS)
+        assert lote["resultados"] == esperados
+        assert lote["casos"] == len(CASOS)
+
+    def test_orden_en_streaming(self, esperados):
+        with DiagnosticoParalelo(procesos=2, tamano_trozo=3, mp_context=CONTEXTO) as par:
+            pares = list(par.iterar(CASOS))
+        assert [i for i, _ in pares] == list(range(len(CASOS)))
+        assert [r for _, r in pares] == esperados
+
+    def test_sin_orden(self, esperados):
+        with DiagnosticoParalelo(procesos=2, tamano_trozo=2, mp_context=CONTEXTO) as par:
+            pares = dict(par.iterar(CASOS, ordenado=False))
+        assert [pares[i] for i in range(len(CASOS))] == esperados
+
+    def test_tamano_de_trozo_automatico(self):
+        par = DiagnosticoParalelo(procesos=4)
+        assert par._tamano_trozo(10) == 1
+        assert par._tamano_trozo(1600) == 100
+        assert par._tamano_trozo(10 ** 7) == 2000
+
+    def test_trabajador_caido(self, esperados, monkeypatch, tmp_path):
+        monkeypatch.setenv("MARCA_CAIDA", str(tmp_path / "caido"))
+        monkeypatch.setattr(paralelo, "_diagnosticar_trozo", _morir_una_vez)
+        with DiagnosticoParalelo(procesos=2, tamano_trozo=5, mp_context=CONTEXTO) as par:
+            lote = par.diagnosticar_lote(CASOS)
+            stats = par.estadisticas()
+        assert lote["resultados"] == esperados
+        assert stats["reinicios"] >= 1
+
+    def test_trozo_con_error_va_a_local(self, esperados, monkeypatch):
+        monkeypatch.setattr(paralelo, "_diagnosticar_trozo", _fallar_con_papa)
+        with DiagnosticoParalelo(procesos=2, tamano_trozo=7, mp_context=CONTEXTO) as par:
+            lote = par.diagnosticar_lote(CASOS)
+            stats = par.estadisticas()
+        assert lote["resultados"] == esperados
+        assert stats["en_local"] == 3
+
+    def test_rechaza_spawn(self):
+        with pytest.raises(ValueError, match="fork"):
+            DiagnosticoParalelo(procesos=2, mp_context=multiprocessing.get_context("spawn"))
+
+    def test_igual_que_en_serie_en_un_proceso_nuevo(self):
+        """Con el contexto por omisión y sin motores previos, el lote repartido da lo mismo que en serie"""
+        rng = random.Random(5)
+        casos = []
+        for cultivo in MAPA_CULTIVOS:
+            vocabulario = list(obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo).vocabulario)
+            casos += [(cultivo, rng.sample(vocabulario, rng.randint(1, 5))) for _ in range(60)]
+        codigo = ("import json, sys; from engine.motor import SistemaExpertoPlagas; "
+                  "from engine.paralelo import DiagnosticoParalelo\n"
+                  "casos = json.loads(sys.stdin.read())\n"
+                  "with DiagnosticoParalelo(procesos=3, tamano_trozo=20) as par:\n"
+                  "    paralelo = par.diagnosticar_lote(casos)['resultados']\n"
+                  "serie = SistemaExpertoPlagas().diagnosticar_lote(casos)['resultados']\n"
+                  "print(sum(a != b for a, b in zip(paralelo, serie)))")
+        entorno = dict(os.environ)
+        entorno.pop("PYTHONHASHSEED", None)
+        salida = subprocess.run([sys.executable, "-c", codigo], input=json.dumps(casos),
+                                capture_output=True, text=True, env=entorno,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        assert salida.returncode == 0, salida.stderr
+        assert salida.stdout.strip() == "0"
@@ -0,0 +1,110 @@
+import pytest
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS, armar_resultado
+from engine.pool import PoolMotores
+from knowledge.hechos import Caso
+
+
+@pytest.fixture
+def pool():
+    return PoolMotores(MAPA_CULTIVOS, tamano=2)
+
+
+def diagnosticar_sin_pool(cultivo, sintomas):
+    motor = MAPA_CULTIVOS[cultivo]()
+    motor.reset()
+    motor.declare(Caso(cultivo=cultivo, sintomas=set(sintomas)))
+    motor.run()
+    return armar_resultado(motor.facts.values())
+
+
+class TestPoolMotores:
+    """Verifica la reutilización de motores ya construidos."""
+
+    def test_reutiliza_el_motor(self, pool):
+        sistema = SistemaExpertoPlagas(pool=pool)
+        for _ in range(5):
+            sistema.diagnosticar("uva", ["verrugas_hojas", "nudosidades_raices"])
+        stats = pool.estadisticas()["uva"]
+        assert stats["construidos"] == 1
+        assert stats["aciertos"] == 4
+        assert stats["en_uso"] == 0
+
+    def test_mismo_resultado_que_motor_nuevo(self, pool):
+        sistema = SistemaExpertoPlagas(pool=pool)
+        casos = [
+            ("café", ["frutos_perforados", "granos_dañados", "cerezas_caidas"]),
+            ("café", ["frutos_perforados", "granos_dañados"]),
+            ("papa", ["hojas_enrolladas", "hojas_amarillentas", "clima_humedo"]),
+            ("cacao", []),
+        ]
+        for cultivo, sintomas in casos * 2:
+            assert sistema.diagnosticar(cultivo, sintomas) == diagnosticar_sin_pool(cultivo, sintomas)
+
+    def test_no_supera_el_tamano(self, pool):
+        sistema = SistemaExpertoPlagas(pool=pool)
+        errores = []
+
+        def trabajar():
+            try:
+                for _ in range(5):
+                    r = sistema.diagnosticar("limon", ["mielada", "fumagina"])
+                    assert r["diagnosticos"]
+            except Exception as exc:  # pragma: no cover
+                errores.append(exc)
+
+        hilos = [threading.Thread(target=trabajar) for _ in range(6)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+
+        assert not errores
+        stats = pool.estadisticas()["limon"]
+        assert stats["construidos"] <= 2
+        assert stats["en_uso"] == 0
+
+    def test_timeout_sin_motores_libres(self):
+        pool = PoolMotores(MAPA_CULTIVOS, tamano=1)
+        motor = pool.tomar("cacao")
+        with pytest.raises(TimeoutError):
+            pool.tomar("cacao", timeout=0.01)
+        assert pool.estadisticas()["cacao"]["esperas"] == 1
+        pool.devolver("cacao", motor)
+        assert pool.tomar("cacao", timeout=0.01) is motor
+
+    def test_motor_con_error_se_descarta(self, pool):
+        with pytest.raises(RuntimeError):
+            with pool.motor("uva"):
+                raise RuntimeError("fallo")
+        stats = pool.estadisticas()["uva"]
+        assert stats["descartados"] == 1
+        assert stats["libres"] == 0 and stats["en_uso"] == 0
+
+    def test_calentar(self, pool):
+        pool.calentar(["uva", "papa"], cantidad=2)
+        stats = pool.estadisticas()
+        assert stats["uva"]["construidos"] == 2
+        assert stats["papa"]["libres"] == 2
+        pool.calentar(["uva"], cantidad=2)
+        assert pool.estadisticas()["uva"]["construidos"] == 2
+
+    def test_motor_de_reglas_viejas_se_descarta(self):
+        mapa = {"uva": MAPA_CULTIVOS["uva"]}
+        pool = PoolMotores(mapa, tamano=1)
+        with pool.motor("uva"):
+            pass
+        mapa["uva"] = MAPA_CULTIVOS["cacao"]
+        with pool.motor("uva") as motor:
+            assert type(motor) is MAPA_CULTIVOS["cacao"]
+        stats = pool.estadisticas()["uva"]
+        assert stats["descartados"] == 1 and stats["construidos"] == 2
+
+    def test_tamano_invalido(self):
+        with pytest.raises(ValueError):
+            PoolMotores(MAPA_CULTIVOS, tamano=0)
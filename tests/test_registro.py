@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.registro import RegistroCultivos, REGISTRO
+from experta import KnowledgeEngine, Rule, MATCH, TEST
+from knowledge.hechos import Caso, Diagnostico
+
+
+class ReglasMango(KnowledgeEngine):
+    @Rule(Caso(cultivo="mango", sintomas=MATCH.s),
+          TEST(lambda s: "antracnosis_frutos" in s))
+    def antracnosis(self):
+        self.declare(Diagnostico(plaga="Antracnosis", certeza=0.9, regla_activada="antracnosis"))
+
+
+def mostrar_diagnostico_mango(CULTIVOS):
+    return "mango"
+
+
+@pytest.fixture
+def registro():
+    registro = RegistroCultivos()
+    registro.registrar("cacao", "knowledge.reglas_cacao:ReglasCacao")
+    registro.registrar("mango", "tests.test_registro:ReglasMango",
+                       "tests.test_registro:mostrar_diagnostico_mango", nombre="Mango")
+    return registro
+
+
+@pytest.fixture
+def con_mango():
+    REGISTRO.registrar("mango", "tests.test_registro:ReglasMango")
+    yield
+    REGISTRO.quitar("mango")
+
+
+class TestRegistroCultivos:
+    """Verifica la carga diferida de cultivos."""
+
+    def test_carga_en_el_primer_uso(self, registro):
+        assert "mango" in registro
+        assert not registro.cargado("mango")
+        assert registro["mango"] is ReglasMango
+        assert registro.cargado("mango")
+        assert not registro.cargado("mango", "interfaz")
+
+    def test_se_comporta_como_dict(self, registro):
+        assert list(registro) == ["cacao", "mango"]
+        assert len(registro) == 2
+        assert registro.get("pera") is None
+        with pytest.raises(KeyError):
+            registro["pera"]
+
+    def test_interfaz_y_nombre(self, registro):
+        assert registro.por_nombre("Mango") == "mango"
+        assert registro.por_nombre("Cacao") == "cacao"
+        assert registro.por_nombre("Pera") is None
+        assert registro.interfaz("mango")({}) == "mango"
+        assert registro.interfaz("cacao") is None
+
+    def test_precargar(self, registro):
+        registro.precargar(["mango"], interfaz=True)
+        assert registro.cargado("mango") and registro.cargado("mango", "interfaz")
+        assert not registro.cargado("cacao")
+        registro.precargar_en_segundo_plano().join()
+        assert registro.cargado("cacao")
+
+    def test_cultivos_base_registrados(self):
+        assert set(MAPA_CULTIVOS) == {"uva", "limon", "palta", "café", "cacao", "papa"}
+        assert MAPA_CULTIVOS.entrada("limon").nombre == "Limon"
+
+    def test_nuevo_cultivo_sin_tocar_el_motor(self, con_mango):
+        resultado = SistemaExpertoPlagas().diagnosticar("Mango", ["antracnosis_frutos"])
+        assert resultado["reglas_activadas"] == ["antracnosis"]
+        assert SistemaExpertoPlagas(backend="compilado").diagnosticar(
+            "mango", ["antracnosis_frutos"]) == resultado
@@ -0,0 +1,52 @@
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, _correr_motor
+from engine.metricas import contar_activaciones
+from benchmarks.casos import casos_reales, vocabularios
+from knowledge.hechos import Caso
+from knowledge.reglas_papa import ReglasPapa
+from tests.reglas_papa_original import ReglasPapaOriginal
+
+
+def _firma(resultado):
+    # Entre diagnósticos de igual certeza el orden depende de la red de experta
+    return sorted((d["certeza"], d["regla_activada"], d["plaga"]) for d in resultado["diagnosticos"])
+
+
+def _casos():
+    rng = random.Random(12)
+    vocabulario = vocabularios()["papa"]
+    return ([s for c, s in casos_reales() if c == "papa"]
+            + [rng.sample(vocabulario, rng.randint(0, 12)) for _ in range(300)])
+
+
+class TestReglasPapaConGuardas:
+    """ReglasPapa con las condiciones en el TEST da lo mismo que con ellas en el cuerpo."""
+
+    def test_mismos_diagnosticos(self):
+        antes, ahora = ReglasPapaOriginal(), ReglasPapa()
+        for sintomas in _casos():
+            esperado = _correr_motor(antes, "papa", sintomas)
+            resultado = _correr_motor(ahora, "papa", sintomas)
+            assert _firma(resultado) == _firma(esperado), sintomas
+            assert [d["certeza"] for d in resultado["diagnosticos"]] == \
+                [d["certeza"] for d in esperado["diagnosticos"]]
+
+    def test_solo_entran_las_reglas_que_coinciden(self):
+        motor = ReglasPapa()
+        conteos = {"reglas_coincidentes": 0, "activaciones_disparadas": 0}
+        motor.reset()
+        with contar_activaciones(motor, conteos):
+            motor.declare(Caso(cultivo="papa", sintomas={"hojas_enrolladas", "hojas_amarillentas",
+                                                         "clima_humedo"}))
+            motor.run()
+        assert conteos == {"reglas_coincidentes": 1, "activaciones_disparadas": 1}
+
+    def test_sin_sintomas_no_activa_nada(self):
+        resultado = SistemaExpertoPlagas().diagnosticar("papa", [], metricas=True)
+        assert resultado["metricas"]["activaciones_disparadas"] == 0
+        assert resultado["diagnosticos"] == []
@@ -0,0 +1,89 @@
+import json
+import pickle
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas
+from engine.resultado import DiagnosticoItem, ResultadoDiagnostico
+
+SINTOMAS = ["frutos_perforados", "granos_dañados"]
+
+
+@pytest.fixture(params=["experta", "compilado", "tabla", "generado", "diagrama"])
+def resultado(request):
+    return SistemaExpertoPlagas(backend=request.param).diagnosticar("café", SINTOMAS)
+
+
+class TestResultadoDiagnostico:
+    """Pruebas del resultado tipado de diagnosticar"""
+
+    def test_acceso_como_diccionario(self, resultado):
+        """Las interfaces siguen leyendo el resultado como un dict"""
+        assert isinstance(resultado, ResultadoDiagnostico)
+        assert set(resultado.keys()) == {"diagnosticos", "reglas_activadas"}
+        assert "error" not in resultado
+        assert resultado.get("diagnosticos") is resultado.diagnosticos
+        assert resultado["reglas_activadas"] == [d["regla_activada"] for d in resultado["diagnosticos"]]
+        certezas = [d["certeza"] for d in resultado["diagnosticos"]]
+        assert certezas == sorted(certezas, reverse=True)
+
+    def test_sin_atributos_extra(self, resultado):
+        """Resultado e items usan __slots__"""
+        assert not hasattr(resultado, "__dict__")
+        assert not hasattr(resultado["diagnosticos"][0], "__dict__")
+        with pytest.raises(AttributeError):
+            resultado["diagnosticos"][0].plaga = "otra"
+
+    def test_como_dict(self, resultado):
+        """como_dict devuelve tipos comunes, con listas en vez de tuplas"""
+        plano = resultado.como_dict()
+        assert type(plano["diagnosticos"][0]) is dict
+        assert isinstance(plano["diagnosticos"][0]["recomendaciones"], list)
+        assert plano["reglas_activadas"] == resultado["reglas_activadas"]
+
+    def test_como_json(self, resultado):
+        """como_json es JSON válido y equivale a como_dict"""
+        assert json.loads(resultado.como_json()) == resultado.como_dict()
+        # el item reutiliza su JSON ya codificado
+        item = resultado["diagnosticos"][0]
+        assert item.como_json() is item.como_json()
+
+    def test_error(self):
+        """Un cultivo no soportado trae la clave error"""
+        resultado = SistemaExpertoPlagas().diagnosticar("mango", ["x"])
+        assert "no soportado" in resultado["error"]
+        assert resultado["diagnosticos"] == [] and resultado["reglas_activadas"] == []
+        assert json.loads(resultado.como_json())["error"] == resultado["error"]
+
+    def test_copia_comparte_items(self, resultado):
+        """copia() crea listas nuevas pero no copia los items"""
+        copia = resultado.copia()
+        assert copia == resultado
+        copia["diagnosticos"].clear()
+        assert resultado["diagnosticos"]
+
+    def test_pickle(self, resultado):
+        """El resultado viaja entre procesos sin perder la ficha compartida"""
+        copia = pickle.loads(pickle.dumps(resultado))
+        assert copia == resultado
+        assert copia["diagnosticos"][0].ficha is resultado["diagnosticos"][0].ficha
+
+
+class TestDiagnosticoItem:
+    """Pruebas de los items de diagnóstico"""
+
+    def test_desde_hecho_sin_ficha(self):
+        """Un hecho sin ficha precalculada también se convierte"""
+        item = DiagnosticoItem.desde_hecho({"plaga": "X", "certeza": 0.5, "umbral": "1%",
+                                            "__factid__": 3})
+        assert dict(item) == {"plaga": "X", "certeza": 0.5, "umbral": "1%"}
+        assert item.regla_activada is None and "regla_activada" not in item
+
+    def test_igualdad_con_dict(self):
+        """Un item es igual a un dict con los mismos campos"""
+        item = DiagnosticoItem.desde_hecho({"plaga": "X", "certeza": 0.5})
+        assert item == {"plaga": "X", "certeza": 0.5}
+        assert item == DiagnosticoItem("X", 0.5)
@@ -0,0 +1,93 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine import SesionDiagnostico, SistemaExpertoPlagas
+from engine.motor import MAPA_CULTIVOS
+from engine.compilado import obtener_matcher
+from engine.registro import REGISTRO
+from experta import KnowledgeEngine, Rule, MATCH
+from knowledge.hechos import Caso, Diagnostico
+
+
+@pytest.fixture
+def experta():
+    return SistemaExpertoPlagas()
+
+
+class TestSesionDiagnostico:
+    """Diagnóstico incremental de un caso"""
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_igual_que_diagnosticar_de_cero(self, experta, cultivo):
+        """Tras cada casilla marcada o desmarcada, el mismo resultado que un diagnóstico completo"""
+        vocabulario = list(obtener_matcher(MAPA_CULTIVOS[cultivo], cultivo).vocabulario)
+        rng = random.Random(f"sesion-{cultivo}")
+        sesion = SesionDiagnostico(cultivo)
+        assert sesion.resultado == experta.diagnosticar(cultivo, [])
+        for _ in range(60):
+            sintoma = rng.choice(vocabulario + ["ruido"])
+            if sintoma in sesion.sintomas:
+                resultado = sesion.quitar_sintoma(sintoma)
+            else:
+                resultado = sesion.agregar_sintoma(sintoma)
+            assert resultado == experta.diagnosticar(cultivo, list(sesion.sintomas))
+
+    def test_sospecha_suprimida_vuelve(self, experta):
+        """Al quitar un síntoma, el diagnóstico completo se retira y la sospecha reaparece"""
+        sesion = SesionDiagnostico("uva", ["verrugas_hojas"])
+        inicial = sesion.resultado
+        assert "filoxera_parcial" in inicial["reglas_activadas"]
+
+        completo = sesion.agregar_sintoma("nudosidades_raices")
+        assert completo == experta.diagnosticar("uva", ["verrugas_hojas", "nudosidades_raices"])
+        assert "filoxera_completa" in sesion.agregadas
+
+        restaurado = sesion.quitar_sintoma("nudosidades_raices")
+        assert restaurado == inicial
+        assert "filoxera_completa" in sesion.quitadas
+        assert set(sesion.agregadas) == set(inicial["reglas_activadas"]) - set(completo["reglas_activadas"])
+
+    def test_solo_reevalua_las_reglas_afectadas(self):
+        matcher = obtener_matcher(MAPA_CULTIVOS["papa"], "papa")
+        sesion = SesionDiagnostico("papa")
+        sesion.agregar_sintoma("clima_humedo")
+        assert sesion.evaluaciones == len(matcher.indice_reglas["clima_humedo"])
+        assert sesion.evaluaciones < len(matcher.reglas)
+
+        antes = sesion.resultado
+        sesion.agregar_sintoma("ruido")
+        assert sesion.evaluaciones == len(matcher.indice_reglas["clima_humedo"])
+        assert sesion.resultado is antes
+
+    def test_actualizar_con_casillas(self, experta):
+        sesion = SesionDiagnostico("café", ["frutos_perforados"])
+        marcadas = ["granos_dañados", "cerezas_caidas"]
+        assert sesion.actualizar(marcadas) == experta.diagnosticar("café", marcadas)
+        assert sesion.sintomas == frozenset(marcadas)
+        # Sin cambios no se vuelve a diagnosticar
+        assert sesion.actualizar(marcadas) is sesion.resultado
+        assert sesion.agregadas == [] and sesion.quitadas == []
+
+    def test_cultivo_no_soportado(self):
+        sesion = SesionDiagnostico("mango")
+        assert "no soportado" in sesion.agregar_sintoma("x")["error"]
+
+    def test_reglas_no_compilables_usan_experta(self):
+        class ReglasRaras(KnowledgeEngine):
+            @Rule(Caso(cultivo="raro", sintomas=MATCH.s))
+            def regla(self, s):
+                self.declare(Diagnostico(plaga="Rara", certeza=len(s) / 10, regla_activada="regla"))
+
+        REGISTRO.registrar("raro", ReglasRaras)
+        try:
+            sesion = SesionDiagnostico("raro")
+            sesion.agregar_sintoma("a")
+            resultado = sesion.agregar_sintoma("b")
+        finally:
+            REGISTRO.quitar("raro")
+        assert resultado["diagnosticos"][0]["certeza"] == 0.2
+        assert sesion.evaluaciones == 0
@@ -0,0 +1,86 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+from engine.compilado import obtener_matcher
+from engine.tablas import construir_tabla, obtener_tabla, firma_reglas
+from experta import KnowledgeEngine, Rule, MATCH, TEST, NOT
+from knowledge.hechos import Caso, Diagnostico
+
+
+class ReglasPera(KnowledgeEngine):
+    @Rule(Caso(cultivo="pera", sintomas=MATCH.s),
+          TEST(lambda s: {"manchas", "hojas_secas"}.issubset(s)))
+    def moteado(self):
+        self.declare(Diagnostico(plaga="Moteado", certeza=1.0, regla_activada="moteado"))
+
+    @Rule(Caso(cultivo="pera", sintomas=MATCH.s),
+          TEST(lambda s: len({"manchas", "hojas_secas", "frutos_rajados"} & s) >= 1),
+          NOT(Diagnostico(plaga="Moteado")))
+    def moteado_parcial(self):
+        self.declare(Diagnostico(plaga="Moteado – sospecha", certeza=0.5,
+                                 regla_activada="moteado_parcial"))
+
+
+@pytest.fixture
+def tabla():
+    return obtener_tabla(MAPA_CULTIVOS["cacao"], "cacao")
+
+
+class TestTablaCultivo:
+    """Tablas precalculadas de los cultivos pequeños."""
+
+    def test_cubre_todas_las_combinaciones(self, tabla):
+        assert len(tabla.vocabulario) == 14
+        assert len(tabla.indices) == 2 ** 14
+        assert len(tabla.resultados) < 2 ** 14
+        assert tabla.bytes() == 2 ** 15
+
+    def test_equivale_a_experta(self, tabla):
+        experta = SistemaExpertoPlagas()
+        con_tabla = SistemaExpertoPlagas(backend="tabla")
+        rng = random.Random(11)
+        for _ in range(60):
+            sintomas = rng.sample(tabla.vocabulario, rng.randint(0, 6)) + ["ruido"]
+            assert con_tabla.diagnosticar("cacao", sintomas) == experta.diagnosticar("cacao", sintomas)
+
+    def test_construida_con_experta(self):
+        desde_experta = construir_tabla(ReglasPera, "pera", fuente="experta")
+        compilada = construir_tabla(ReglasPera, "pera")
+        assert desde_experta.vocabulario == ("frutos_rajados", "hojas_secas", "manchas")
+        assert desde_experta.firma == compilada.firma
+        for m in range(8):
+            esperados = [h.clave for h in compilada.resultados[compilada.indices[m]]]
+            assert [h.clave for h in desde_experta.resultados[desde_experta.indices[m]]] == esperados
+
+    def test_cultivo_grande_no_se_tabula(self):
+        assert obtener_tabla(MAPA_CULTIVOS["limon"], "limon") is None
+        assert construir_tabla(MAPA_CULTIVOS["cacao"], "cacao", limite=10) is None
+        resultado = SistemaExpertoPlagas(backend="tabla").diagnosticar("limon", ["mielada"])
+        assert resultado == SistemaExpertoPlagas().diagnosticar("limon", ["mielada"])
+
+    def test_fuente_desconocida(self):
+        with pytest.raises(ValueError):
+            construir_tabla(ReglasPera, "pera", fuente="magia")
+
+    def test_lote_y_metricas(self):
+        sistema = SistemaExpertoPlagas(backend="tabla")
+        casos = [("cacao", ["brotes_anormales"]), ("café", ["epoca_seca", "hojas_bronceadas"])]
+        lote = sistema.diagnosticar_lote(casos)
+        assert lote["resultados"] == [SistemaExpertoPlagas().diagnosticar(c, s) for c, s in casos]
+        assert sistema.diagnosticar("cacao", [], metricas=True)["metricas"]["origen"] == "tabla"
+
+
+class TestTablaDelProceso:
+    """Las tablas se arman en el proceso, con su orden de disparo."""
+
+    def test_sigue_el_orden_de_este_proceso(self, tabla):
+        matcher = obtener_matcher(MAPA_CULTIVOS["cacao"], "cacao")
+        assert tabla.firma == firma_reglas(MAPA_CULTIVOS["cacao"], [r.nombre for r in matcher.reglas])
+
+    def test_una_por_proceso(self, tabla):
+        assert obtener_tabla(MAPA_CULTIVOS["cacao"], "cacao") is tabla
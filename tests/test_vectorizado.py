@@ -0,0 +1,63 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS
+
+np = pytest.importorskip("numpy")
+from engine.vectorizado import obtener_matriz
+
+
+@pytest.fixture
+def sistema():
+    return SistemaExpertoPlagas(backend="compilado")
+
+
+class TestMatrizReglas:
+    """El evaluador vectorizado debe coincidir con diagnosticar."""
+
+    @pytest.mark.parametrize("cultivo", list(MAPA_CULTIVOS))
+    def test_equivale_a_diagnosticar(self, sistema, cultivo):
+        matriz = obtener_matriz(MAPA_CULTIVOS[cultivo], cultivo)
+        rng = random.Random(cultivo)
+        casos = [rng.sample(matriz.vocabulario, rng.randint(0, 8)) + ["ruido"]
+                 for _ in range(300)]
+        resultado = matriz.evaluar_conjuntos(casos)
+        assert len(resultado) == len(casos)
+        for i, sintomas in enumerate(casos):
+            assert resultado[i] == sistema.diagnosticar(cultivo, sintomas)
+
+    def test_arreglos_de_disparos(self):
+        matriz = obtener_matriz(MAPA_CULTIVOS["café"], "café")
+        resultado = matriz.evaluar_conjuntos([
+            ["frutos_perforados", "granos_dañados", "cerezas_caidas"],
+            [],
+        ])
+        assert resultado.inicio.tolist()[0] == 0
+        assert len(resultado.reglas) == resultado.inicio[-1]
+        certezas = dict(resultado.disparos(0))
+        assert certezas["broca_completa"] == 1.0
+        assert resultado.certezas[:resultado.inicio[1]].tolist() == list(certezas.values())
+        assert resultado[-1] == resultado[1]
+
+    def test_matriz_booleana(self):
+        matriz = obtener_matriz(MAPA_CULTIVOS["cacao"], "cacao")
+        observaciones = np.zeros((3, len(matriz.vocabulario)), dtype=bool)
+        observaciones[1, matriz.columna["brotes_anormales"]] = True
+        resultado = matriz.evaluar(observaciones)
+        assert resultado[0] == resultado[2]
+        assert "Escoba de bruja" in resultado[1]["diagnosticos"][0]["plaga"]
+
+    def test_sin_observaciones(self):
+        matriz = obtener_matriz(MAPA_CULTIVOS["uva"], "uva")
+        resultado = matriz.evaluar(np.zeros((0, len(matriz.vocabulario)), dtype=bool))
+        assert len(resultado) == 0
+        assert list(resultado) == []
+
+    def test_dimensiones_incorrectas(self):
+        matriz = obtener_matriz(MAPA_CULTIVOS["uva"], "uva")
+        with pytest.raises(ValueError):
+            matriz.evaluar(np.zeros((2, 3), dtype=bool))
@@ -0,0 +1,118 @@
+import importlib
+import pytest
+import subprocess
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from engine.compilado import obtener_matcher
+from engine.motor import MAPA_CULTIVOS
+from engine.registro import REGISTRO
+from benchmarks.casos import vocabularios
+from ui.vistas import VistaInvalida, construir_vista, obtener_vista
+
+
+CULTIVOS_CON_VISTA = ["uva", "limon", "palta", "café", "cacao", "papa"]
+
+
+def _sintomas(clave):
+    """Síntomas que la interfaz ofrece para el cultivo (CULTIVOS de ui/layout.py)"""
+    return vocabularios()[REGISTRO.entrada(clave).nombre.lower()]
+
+
+@pytest.fixture
+def datos_uva():
+    return importlib.import_module("ui.vistas.uva").VISTA
+
+
+class TestVistasDeLosCultivos:
+    """Las vistas registradas cargan contra el vocabulario de la interfaz"""
+
+    @pytest.mark.parametrize("clave", CULTIVOS_CON_VISTA)
+    def test_cargan(self, clave):
+        datos = REGISTRO.interfaz(clave)
+        vista = construir_vista(clave, REGISTRO.entrada(clave).nombre, _sintomas(clave), datos)
+        assert set(vista.etiquetas) == set(_sintomas(clave))
+        if vista.selector == "casillas":
+            marcados = [s for grupo in vista.grupos for s, _ in grupo.sintomas]
+            assert sorted(marcados) == sorted(_sintomas(clave))
+
+    @pytest.mark.parametrize("clave", CULTIVOS_CON_VISTA)
+    def test_explicaciones_de_reglas_existentes(self, clave):
+        vista = construir_vista(clave, "", _sintomas(clave), REGISTRO.interfaz(clave))
+        reglas = {r.nombre for r in obtener_matcher(MAPA_CULTIVOS[clave], clave).reglas}
+        assert set(vista.explicaciones) <= reglas
+
+    def test_papa_muestra_todos_los_sintomas(self):
+        """Los que no tenían categoría ahora tienen casilla"""
+        vista = construir_vista("papa", "Papa", _sintomas("papa"), REGISTRO.interfaz("papa"))
+        marcados = {s for grupo in vista.grupos for s, _ in grupo.sintomas}
+        assert {"tallos_mordidos", "hojas_abolladas", "hojas_amarillas"} <= marcados
+
+    def test_imagenes_y_alertas(self):
+        cacao = construir_vista("cacao", "Cacao", _sintomas("cacao"), REGISTRO.interfaz("cacao"))
+        plaga = "Escoba de bruja (Moniliophthora perniciosa)"
+        assert cacao.ruta_imagen({"plaga": plaga}) == "cacao/escoba_bruja.jpg"
+        assert cacao.alerta(plaga).formatear(plaga).startswith("ALERTA: Escoba de bruja es")
+        assert cacao.alerta("Mazorquero del cacao (Carmenta spp)") is None
+        papa = construir_vista("papa", "Papa", _sintomas("papa"))
+        assert papa.ruta_imagen({"plaga": "x", "imagen": "papa/acaros.jpg"}) == "papa/papa/acaros.jpg"
+        assert papa.ruta_imagen({"plaga": "x", "imagen": None}) is None
+
+
+class TestVistaCultivo:
+    """Construcción, validación y caché"""
+
+    def test_solo_lectura(self, datos_uva):
+        vista = construir_vista("uva", "Uva", _sintomas("uva"), datos_uva)
+        with pytest.raises(AttributeError):
+            vista.columnas = 3
+        with pytest.raises(AttributeError):
+            vista.grupos[0].nombre = "otro"
+        with pytest.raises(TypeError):
+            vista.etiquetas["verrugas_hojas"] = "otra"
+
+    def test_vista_por_omision(self):
+        vista = construir_vista("mango", "Mango", ["hojas_secas", "frutos_manchados"])
+        assert vista.etiqueta("hojas_secas") == "Hojas secas"
+        assert [g.nombre for g in vista.grupos] == [None]
+        assert vista.tema == "general" and vista.guia is None
+        assert vista.textos["sin_sintomas"]
+
+    def test_informacion_tecnica_solo_en_uva(self, datos_uva):
+        uva = construir_vista("uva", "Uva", _sintomas("uva"), datos_uva)
+        assert uva.textos["tecnica"].startswith("⚙️")
+        assert construir_vista("mango", "Mango", ["a"]).textos["tecnica"] == ""
+
+    def test_sin_categoria_van_a_otros(self):
+        vista = construir_vista("mango", "Mango", ["a", "b", "c"], {"categorias": {"Hojas": ["b"]}})
+        assert [(g.nombre, [s for s, _ in g.sintomas]) for g in vista.grupos] == \
+            [("Hojas", ["b"]), ("➕ Otros", ["a", "c"])]
+
+    @pytest.mark.parametrize("datos, mensaje", [
+        ({"colores": {}}, "Claves desconocidas: colores"),
+        ({"sintomas": {"z": "Zeta"}}, "z"),
+        ({"categorias": {"Hojas": ["a", "z"]}}, "z"),
+        ({"categorias": {"Hojas": ["a"], "Otras": ["a"]}}, "más de una"),
+        ({"selector": "radio"}, "selector"),
+        ({"textos": {"saludo": "hola"}}, "saludo"),
+        ({"alertas": [{"contiene": ["X"], "nivel": "grave", "texto": ""}]}, "nivel"),
+        ({"guia": {"titulo": "Guía", "carrusel": {"imagenes": "a.jpg"}}}, "{sintoma}"),
+    ])
+    def test_invalida(self, datos, mensaje):
+        with pytest.raises(VistaInvalida, match=mensaje):
+            construir_vista("mango", "Mango", ["a", "b"], datos)
+
+    def test_cache_por_proceso(self, datos_uva):
+        sintomas = _sintomas("uva")
+        vista = obtener_vista("uva", "Uva", sintomas, datos_uva)
+        assert obtener_vista("uva", "Uva", list(sintomas), datos_uva) is vista
+        # Otros datos (p. ej. el módulo recargado) la vuelven a construir
+        assert obtener_vista("uva", "Uva", sintomas, dict(datos_uva)) is not vista
+
+    def test_no_importa_streamlit(self):
+        codigo = "import sys, ui.vistas, ui.vistas.uva; print('streamlit' in sys.modules)"
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                                cwd=os.path.abspath('.'), check=True).stdout
+        assert salida.strip() == "False"
@@ -1 +1,7 @@
-from .layout import mostrar_interfaz
\ No newline at end of file
+def __getattr__(nombre):
+    # Streamlit se importa recién cuando se pide la interfaz: ui.graficos y
+    # los demás módulos sin Streamlit se pueden usar (y probar) sin él
+    if nombre == "mostrar_interfaz":
+        from .layout import mostrar_interfaz
+        return mostrar_interfaz
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
\ No newline at end of file
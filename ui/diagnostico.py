@@ -0,0 +1,209 @@
+import streamlit as st
+from ui.recursos import diagnostico_pedido, diagnosticar_en_sesion, mostrar_imagen, mostrar_gauge
+from ui.layout import formulario_sintomas, boton_diagnosticar, mostrar_diagnostico_en_vivo
+from ui.vistas import Carrusel
+
+# ───────────────────────────────────────────────
+# INTERFAZ DE DIAGNÓSTICO DE CUALQUIER CULTIVO
+# ───────────────────────────────────────────────
+# Todo lo propio de cada cultivo viene de su VistaCultivo (ui/vistas/):
+# acá solo se recorre lo que ya está resuelto en ella.
+
+
+def _mostrar_carrusel(vista, guia):
+    clave = f"pagina_{vista.clave}"
+    if clave not in st.session_state:
+        st.session_state[clave] = 0
+
+    total_paginas = (len(vista.sintomas) + guia.por_pagina - 1) // guia.por_pagina
+    inicio = st.session_state[clave] * guia.por_pagina
+    cols = st.columns(guia.por_pagina)
+    for col, sintoma in zip(cols, vista.sintomas[inicio:inicio + guia.por_pagina]):
+        with col:
+            if mostrar_imagen(guia.imagenes.format(sintoma=sintoma), ancho=320):
+                st.markdown(f"""
+                    <div style='margin-top: -10px; margin-bottom: 5px;'>
+                        <p style='font-size: 0.9em; font-weight: 600; margin-bottom: 3px;'>
+                            🟢 {vista.etiqueta(sintoma)}
+                        </p>
+                        <p style='font-size: 0.75em; color: #666; line-height: 1.3; margin: 0;'>
+                            {guia.descripciones.get(sintoma, "Descripción no disponible.")}
+                        </p>
+                    </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.warning(f"⚠️ {vista.etiqueta(sintoma)}")
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️", disabled=(st.session_state[clave] == 0), use_container_width=True,
+                     key=f"prev_{vista.clave}"):
+            st.session_state[clave] -= 1
+            st.rerun()
+    with col_info:
+        st.markdown(f"""
+            <div style='text-align: center; padding: 2px; font-size: 0.85em; color: #555;'>
+                Página {st.session_state[clave] + 1} de {total_paginas}
+            </div>
+        """, unsafe_allow_html=True)
+    with col_next:
+        if st.button("➡️", disabled=(st.session_state[clave] >= total_paginas - 1),
+                     use_container_width=True, key=f"next_{vista.clave}"):
+            st.session_state[clave] += 1
+            st.rerun()
+
+
+def _mostrar_guia(vista):
+    guia = vista.guia
+    with st.expander(guia.titulo, expanded=guia.abierta):
+        if isinstance(guia, Carrusel):
+            _mostrar_carrusel(vista, guia)
+        else:
+            st.markdown(guia.texto)
+
+
+def _seleccionar_sintomas(vista):
+    """Casillas por grupo o lista desplegable, según la vista. Devuelve los síntomas marcados."""
+    if vista.selector == "lista":
+        return st.multiselect(vista.pregunta, options=vista.sintomas, default=[],
+                              format_func=vista.etiqueta)
+
+    if vista.pregunta:
+        st.markdown(vista.pregunta)
+    seleccion = []
+    for grupo in vista.grupos:
+        with (st.expander(grupo.nombre) if grupo.nombre else st.container()):
+            cols = st.columns(vista.columnas)
+            for idx, (sintoma, etiqueta) in enumerate(grupo.sintomas):
+                if cols[idx % vista.columnas].checkbox(etiqueta, key=f"{vista.clave}_{sintoma}"):
+                    seleccion.append(sintoma)
+    st.markdown("---")
+    return seleccion
+
+
+def _mostrar_razonamiento(vista, diag, resultado, seleccion):
+    textos = vista.textos
+    reglas = [r for r in resultado.get("reglas_activadas", []) if r]
+    with st.expander(textos["razonamiento"], expanded=vista.razonamiento_abierto):
+        explicacion = vista.explicaciones.get(diag.get("regla_activada"))
+        if explicacion is not None:
+            if explicacion.titulo:
+                st.markdown(f"#### {explicacion.titulo}")
+            st.markdown(explicacion.texto)
+
+        st.markdown(f"**{textos['sintomas_marcados']}**")
+        for sintoma in seleccion:
+            st.markdown(f"- ✓ {vista.etiqueta(sintoma)}")
+
+        if explicacion is not None and explicacion.sugerencia:
+            if textos["preliminar"]:
+                st.warning(textos["preliminar"])
+            st.markdown(f"**{textos['sugerencia']}** {explicacion.sugerencia}")
+
+        st.markdown(f"**{textos['reglas']}**")
+        if reglas:
+            for regla in reglas:
+                st.code(regla, language="python")
+        else:
+            st.info("Ninguna regla específica activada")
+
+        if textos["proceso"]:
+            st.info(textos["proceso"].format(sintomas=len(seleccion), reglas=len(reglas),
+                                             certeza=int(diag["certeza"] * 100)))
+        if textos["fuente"]:
+            st.caption(textos["fuente"])
+
+
+def _mostrar_tecnica(vista, resultado, seleccion):
+    textos = vista.textos
+    with st.expander(textos["tecnica"]):
+        st.caption(f"**{textos['reglas']}**")
+        for regla in resultado.get("reglas_activadas", []):
+            st.code(regla, language="python")
+        st.caption(f"**{textos['sintomas_tecnicos']}**")
+        st.json(seleccion)
+
+
+def mostrar_diagnostico(vista):
+    """Selección de síntomas y diagnóstico del cultivo de `vista` (una VistaCultivo)."""
+    textos = vista.textos
+    if vista.encabezado:
+        st.markdown(vista.encabezado)
+    if vista.aviso:
+        st.warning(vista.aviso)
+    if vista.guia is not None:
+        _mostrar_guia(vista)
+    if vista.instrucciones:
+        st.markdown(vista.instrucciones)
+
+    with formulario_sintomas(vista.clave):
+        seleccion = _seleccionar_sintomas(vista)
+        mostrar_diagnostico_en_vivo(vista.clave, seleccion)
+        pulsado = boton_diagnosticar(vista.boton, use_container_width=True,
+                                     type="primary" if vista.boton_primario else "secondary")
+
+    if not diagnostico_pedido(pulsado, vista.clave, seleccion):
+        return
+    if not seleccion:
+        st.warning(textos["sin_sintomas"])
+        return
+
+    resultado = diagnosticar_en_sesion(vista.clave, seleccion)
+    if "error" in resultado:
+        st.error(resultado["error"])
+        return
+
+    diagnosticos = resultado["diagnosticos"]
+    if not diagnosticos or (vista.sin_certeza_es_sin_resultado and diagnosticos[0]["certeza"] == 0.0):
+        st.warning(textos["sin_resultado"])
+        if textos["consejo"]:
+            st.info(textos["consejo"])
+        return
+
+    diag = diagnosticos[0]
+    titulo = textos["titulo_tarjeta"].format(plaga=diag["plaga"])
+    # Las reglas de algunos cultivos no dan umbral de daño
+    umbral = (f"<p><strong>{textos['umbral']}:</strong> {diag['umbral']}</p>"
+              if diag.get("umbral") else "")
+    st.markdown(f"""
+    <div class="diagnostic-card">
+        <h3>{vista.icono(diag['certeza'])} {titulo}</h3>
+        <p><strong>{textos['certeza']}:</strong> {int(diag['certeza'] * 100)}%</p>
+        {umbral}
+    </div>
+    """, unsafe_allow_html=True)
+
+    alerta = vista.alerta(diag["plaga"])
+    if alerta is not None:
+        getattr(st, alerta.nivel)(alerta.formatear(diag["plaga"]))
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.markdown(f"#### {textos['recomendaciones']}")
+        for i, rec in enumerate(diag.get("recomendaciones") or (), 1):
+            st.markdown(f"**{i}.** {rec}")
+    with col2:
+        mostrar_gauge(diag["certeza"], vista.tema)
+
+    ruta = vista.ruta_imagen(diag)
+    if ruta:
+        mostrar_imagen(ruta, caption=diag["plaga"])
+
+    alternativas = [d for d in diagnosticos[1:] if d["certeza"] > vista.certeza_minima_alternativas]
+    if alternativas:
+        with st.expander(textos["alternativas"], expanded=False):
+            for d in alternativas:
+                st.markdown(f"- **{d['plaga']}** — Certeza: {int(d['certeza'] * 100)}% | "
+                            f"Regla: `{d.get('regla_activada') or 'N/A'}`")
+
+    _mostrar_razonamiento(vista, diag, resultado, seleccion)
+    if textos["tecnica"]:
+        _mostrar_tecnica(vista, resultado, seleccion)
+
+    for seccion in vista.secciones:
+        with st.expander(seccion.titulo, expanded=seccion.abierta):
+            st.markdown(seccion.texto)
+
+    if vista.nota:
+        st.markdown("---")
+        st.caption(vista.nota)
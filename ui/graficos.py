@@ -0,0 +1,147 @@
+"""
+Medidor de confianza de los diagnósticos, compartido por las interfaces.
+
+La certeza toma pocos valores distintos (0.6, 0.75, 0.9, 1.0...), así que
+la figura de cada (certeza, tema) se arma una sola vez: la especificación
+se guarda serializada en JSON y la figura de plotly se crea a partir de
+ella recién cuando hay que dibujarla, importando plotly en ese momento.
+`svg_gauge` dibuja el mismo medidor como SVG estático sin plotly.
+
+Este módulo no importa Streamlit ni plotly al cargarse.
+"""
+import importlib.util
+import json
+import math
+import os
+from functools import lru_cache
+
+# "plotly" o "svg"; sin plotly instalado se usa siempre "svg"
+MODO_GRAFICOS = os.environ.get("PLAGAS_GRAFICOS", "plotly")
+
+_STEPS_SEMAFORO = ((0, 50, "#ffcdd2"), (50, 80, "#fff9c4"), (80, 100, "#c8e6c9"))
+_STEPS_VERDES = ((0, 50, "#ffcdd2"), (50, 80, "#a5d6a7"), (80, 100, "#4caf50"))
+_STEPS_SUAVES = ((0, 60, "#ffebee"), (60, 85, "#c8e6c9"), (85, 100, "#81c784"))
+
+# Estilo del medidor de cada interfaz. `barra_baja` es el color de la barra
+# cuando la certeza no llega a `corte`; `umbral` es la marca roja (o None).
+TEMAS = {
+    "cacao": {"titulo": "Confianza", "barra": "#4caf50", "barra_baja": "#ff9800", "corte": 0.8,
+              "steps": _STEPS_SEMAFORO, "umbral": 90, "alto": 250, "margen_arriba": 50},
+    "cafe": {"titulo": "Confianza", "barra": "#4caf50", "barra_baja": "#ff9800", "corte": 0.8,
+             "steps": _STEPS_SEMAFORO, "umbral": 90, "alto": 250, "margen_arriba": 50},
+    "limon": {"titulo": "Nivel de Confianza", "barra": "#4caf50",
+              "steps": _STEPS_VERDES, "umbral": None, "alto": None, "margen_arriba": None},
+    "palta": {"titulo": "Nivel de Confianza", "barra": "#4caf50",
+              "steps": _STEPS_VERDES, "umbral": 90, "alto": 300, "margen_arriba": 40},
+    "papa": {"titulo": "Confianza", "barra": "#4CAF50",
+             "steps": _STEPS_SUAVES, "umbral": None, "alto": 250, "margen_arriba": 40},
+    "uva": {"titulo": "Confianza", "barra": "#2e7d32",
+            "steps": _STEPS_SUAVES, "umbral": 90, "alto": 250, "margen_arriba": 50},
+    # Cultivos sin tema propio
+    "general": {"titulo": "Confianza", "barra": "#4caf50",
+                "steps": _STEPS_VERDES, "umbral": None, "alto": 250, "margen_arriba": 40},
+}
+
+
+def _clave(certeza):
+    # 0.7 y 0.7000000001 comparten figura
+    return round(float(certeza), 4)
+
+
+def _color_barra(certeza, tema):
+    if "corte" in tema and certeza < tema["corte"]:
+        return tema["barra_baja"]
+    return tema["barra"]
+
+
+def especificacion_gauge(certeza, tema: str) -> str:
+    """Figura de plotly (data + layout) del medidor, serializada en JSON."""
+    return _especificacion(_clave(certeza), tema)
+
+
+@lru_cache(maxsize=256)
+def _especificacion(certeza, nombre_tema):
+    tema = TEMAS[nombre_tema]
+    gauge = {
+        "axis": {"range": [0, 100]},
+        "bar": {"color": _color_barra(certeza, tema)},
+        "steps": [{"range": [a, b], "color": color} for a, b, color in tema["steps"]],
+    }
+    if tema["umbral"] is not None:
+        gauge["threshold"] = {"line": {"color": "red", "width": 4}, "thickness": 0.75,
+                              "value": tema["umbral"]}
+    layout = {}
+    if tema["alto"] is not None:
+        layout = {"height": tema["alto"],
+                  "margin": {"l": 20, "r": 20, "t": tema["margen_arriba"], "b": 20}}
+    indicador = {"type": "indicator", "mode": "gauge+number", "value": round(certeza * 100, 2),
+                 "title": {"text": tema["titulo"]}, "gauge": gauge}
+    return json.dumps({"data": [indicador], "layout": layout}, separators=(",", ":"))
+
+
+@lru_cache(maxsize=256)
+def _figura(certeza, nombre_tema):
+    import plotly.io as pio
+    return pio.from_json(_especificacion(certeza, nombre_tema))
+
+
+def figura_gauge(certeza, tema: str):
+    """
+    go.Figure del medidor (importa plotly en la primera llamada). La misma
+    instancia se devuelve para cada (certeza, tema): no hay que modificarla.
+    """
+    return _figura(_clave(certeza), tema)
+
+
+def _punto(cx, cy, r, porcentaje):
+    angulo = math.pi * (1 - porcentaje / 100)
+    return cx + r * math.cos(angulo), cy - r * math.sin(angulo)
+
+
+def _arco(cx, cy, r, desde, hasta, color, ancho):
+    x0, y0 = _punto(cx, cy, r, desde)
+    x1, y1 = _punto(cx, cy, r, hasta)
+    return (f'<path d="M{x0:.2f} {y0:.2f} A{r} {r} 0 0 1 {x1:.2f} {y1:.2f}" '
+            f'fill="none" stroke="{color}" stroke-width="{ancho}"/>')
+
+
+def svg_gauge(certeza, tema: str) -> str:
+    """El medidor como SVG estático (semicírculo con bandas, barra, umbral y número)."""
+    return _svg(_clave(certeza), tema)
+
+
+@lru_cache(maxsize=256)
+def _svg(certeza, nombre_tema):
+    tema = TEMAS[nombre_tema]
+    cx, cy, r = 120, 140, 90
+    valor = max(0.0, min(100.0, certeza * 100))
+    partes = [_arco(cx, cy, r, a, b, color, 28) for a, b, color in tema["steps"]]
+    if valor > 0:
+        partes.append(_arco(cx, cy, r, 0, valor, _color_barra(certeza, tema), 12))
+    if tema["umbral"] is not None:
+        x0, y0 = _punto(cx, cy, r - 16, tema["umbral"])
+        x1, y1 = _punto(cx, cy, r + 16, tema["umbral"])
+        partes.append(f'<line x1="{x0:.2f}" y1="{y0:.2f}" x2="{x1:.2f}" y2="{y1:.2f}" '
+                      f'stroke="red" stroke-width="4"/>')
+    numero = f"{valor:.0f}" if valor == int(valor) else f"{valor:.1f}"
+    partes.append(f'<text x="{cx}" y="{cy - 6}" text-anchor="middle" font-size="36" '
+                  f'font-family="sans-serif" fill="#2e3b2f">{numero}</text>')
+    partes.append(f'<text x="{cx}" y="20" text-anchor="middle" font-size="16" '
+                  f'font-family="sans-serif" fill="#555">{tema["titulo"]}</text>')
+    alto = tema["alto"] or 250
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 240 155" width="100%" '
+            f'style="max-height:{alto}px" role="img" aria-label="{tema["titulo"]}: {numero}%">'
+            + "".join(partes) + "</svg>")
+
+
+@lru_cache(maxsize=None)
+def plotly_disponible():
+    """Si plotly está instalado (sin importarlo)."""
+    return importlib.util.find_spec("plotly") is not None
+
+
+def estadisticas():
+    """Aciertos y fallos de las cachés de especificaciones, figuras y SVG."""
+    return {nombre: funcion.cache_info()._asdict()
+            for nombre, funcion in (("especificaciones", _especificacion),
+                                    ("figuras", _figura), ("svg", _svg))}
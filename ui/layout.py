@@ -1,10 +1,10 @@
 import streamlit as st
-from ui.palta_interfaz import mostrar_diagnostico_palta
-from ui.uva_interfaz import mostrar_diagnostico_uva
-from ui.limon_interfaz import mostrar_diagnostico_limon
-from ui.cafe_interfaz import mostrar_diagnostico_cafe
-from ui.cacao_interfaz import mostrar_diagnostico_cacao
-from ui.papa_interfaz import mostrar_diagnostico_papa
+from contextlib import contextmanager
+from engine.registro import REGISTRO
+from engine.sesion import SesionDiagnostico
+from ui.recursos import (obtener_sistema, obtener_imagenes, mostrar_admin, contar_ejecucion,
+                         ADMIN_HABILITADO)
+from ui.vistas import obtener_vista
 # ───────────────────────────────────────────────
 # ESTILOS CSS PERSONALIZADOS
 # ───────────────────────────────────────────────
@@ -375,16 +375,81 @@ CULTIVOS = {
     
 }
 
+# ───────────────────────────────────────────────
+# DIAGNÓSTICO EN VIVO
+# ───────────────────────────────────────────────
+def en_vivo():
+    """True si el usuario activó el diagnóstico en vivo en la barra lateral."""
+    return st.session_state.get("en_vivo", False)
+
+
+@contextmanager
+def formulario_sintomas(cultivo):
+    """
+    Agrupa la selección de síntomas de un cultivo. Por defecto es un
+    st.form: marcar casillas no vuelve a correr el script, los cambios
+    quedan en el navegador y se envían juntos con el botón de diagnóstico.
+    Con el diagnóstico en vivo activado es un contenedor común y cada
+    casilla actualiza el ranking preliminar.
+    """
+    with (st.container() if en_vivo() else st.form(f"sintomas_{cultivo}")):
+        yield
+
+
+def boton_diagnosticar(etiqueta, **kwargs):
+    """Botón de diagnóstico dentro de formulario_sintomas (envía el formulario si lo hay)."""
+    if en_vivo():
+        return st.button(etiqueta, **kwargs)
+    return st.form_submit_button(etiqueta, **kwargs)
+
+
+def mostrar_diagnostico_en_vivo(cultivo, seleccion):
+    """
+    Ranking preliminar que se actualiza con cada casilla marcada: la sesión
+    del cultivo vive en st.session_state y solo reevalúa las reglas de los
+    síntomas que cambiaron. Solo se muestra con el diagnóstico en vivo activado.
+    """
+    if not en_vivo():
+        return
+    clave = f"sesion_{cultivo}"
+    if clave not in st.session_state:
+        st.session_state[clave] = SesionDiagnostico(cultivo, sistema=obtener_sistema())
+    resultado = st.session_state[clave].actualizar(seleccion)
+    if not seleccion or "error" in resultado:
+        return
+
+    posibles = [d for d in resultado["diagnosticos"] if d["certeza"] > 0]
+    if not posibles:
+        st.caption("🔎 Diagnóstico en vivo: sin coincidencias todavía.")
+        return
+    ranking = " · ".join(f"**{d['plaga']}** ({int(d['certeza'] * 100)}%)" for d in posibles[:3])
+    st.caption(f"🔎 Diagnóstico en vivo: {ranking}")
+
+
 # ───────────────────────────────────────────────
 # FUNCIÓN PRINCIPAL DE LA INTERFAZ
 # ───────────────────────────────────────────────
 def mostrar_interfaz():
+    contar_ejecucion()
+    # Índice de imágenes: se arma y valida en la primera ejecución del proceso
+    obtener_imagenes()
     inject_custom_css()
 
     # Encabezado
     st.markdown('<h1 class="main-header">🌱 Sistema Experto en Plagas Agrícolas</h1>', unsafe_allow_html=True)
     st.markdown('<p class="main-subheader">Diagnóstico técnico basado en guías oficiales</p>', unsafe_allow_html=True)
 
+    if ADMIN_HABILITADO and st.query_params.get("admin") == "1":
+        mostrar_admin()
+        return
+
+    # Cultivos registrados que no están en CULTIVOS
+    for clave in REGISTRO:
+        entrada = REGISTRO.entrada(clave)
+        if entrada.nombre not in CULTIVOS and entrada.sintomas is not None:
+            CULTIVOS[entrada.nombre] = {"sintomas": entrada.sintomas,
+                                        "descripcion": entrada.descripcion}
+
     # Sidebar
     st.sidebar.title("🧭 Navegación")
     cultivo_seleccionado = st.sidebar.selectbox(
@@ -394,25 +459,23 @@ def mostrar_interfaz():
 
     st.sidebar.markdown("---")
     st.sidebar.info("💡 **Consejo**: Seleccione todos los síntomas observables en el campo para un diagnóstico preciso.")
+    st.sidebar.toggle("🔎 Diagnóstico en vivo", key="en_vivo",
+                      help="Actualiza un ranking preliminar con cada síntoma marcado "
+                           "(cada casilla vuelve a correr la página).")
 
     # Cuerpo principal
     info = CULTIVOS[cultivo_seleccionado]
     st.subheader(f"🪴 {cultivo_seleccionado}")
     st.caption(info["descripcion"])
 
-    if cultivo_seleccionado == "Limon":
-        mostrar_diagnostico_limon(CULTIVOS)
-    elif cultivo_seleccionado == "Uva":
-        mostrar_diagnostico_uva(CULTIVOS)
-    elif cultivo_seleccionado == "Palta":
-        mostrar_diagnostico_palta(CULTIVOS)
-    elif cultivo_seleccionado == "Café":
-        mostrar_diagnostico_cafe(CULTIVOS)
-    elif cultivo_seleccionado == "Cacao":
-        mostrar_diagnostico_cacao(CULTIVOS)
-    elif cultivo_seleccionado == "Papa":
-        mostrar_diagnostico_papa(CULTIVOS)
-
+    # La vista de cada cultivo se importa y valida recién cuando se elige (plotly, con el primer medidor)
+    clave = REGISTRO.por_nombre(cultivo_seleccionado)
+    interfaz = REGISTRO.interfaz(clave) if clave else None
+    if callable(interfaz):
+        interfaz(CULTIVOS)
+    elif clave:
+        from ui.diagnostico import mostrar_diagnostico
+        mostrar_diagnostico(obtener_vista(clave, cultivo_seleccionado, info["sintomas"], interfaz))
     else:
         st.info(f"El módulo de diagnóstico para **{cultivo_seleccionado}** estará disponible en una próxima actualización.")
         st.image("https://placehold.co/600x200/e8f5e9/2e7d32?text=Próximamente", use_column_width=True)
@@ -0,0 +1,162 @@
+import os
+import threading
+
+import streamlit as st
+from engine.motor import SistemaExpertoPlagas, MAPA_CULTIVOS, POOL_MOTORES
+from engine.cache import CacheDiagnosticos
+from engine.imagenes import ManifiestoImagenes, ANCHO_MINIATURA
+from ui import graficos
+
+# La vista de administración (?admin=1) solo se abre con PLAGAS_ADMIN=1: su
+# botón vacía la caché que comparten todas las sesiones
+ADMIN_HABILITADO = os.environ.get("PLAGAS_ADMIN") == "1"
+
+# Los hilos de las sesiones suman a los mismos contadores
+_LOCK_CONTADORES = threading.Lock()
+
+# ───────────────────────────────────────────────
+# RECURSOS COMPARTIDOS POR TODAS LAS SESIONES
+# ───────────────────────────────────────────────
+@st.cache_resource
+def obtener_sistema():
+    """
+    Sistema experto del proceso: lo comparten todas las sesiones (Streamlit
+    vuelve a correr el script en cada interacción, pero esto se crea una
+    vez) junto con la caché de resultados por (cultivo, síntomas).
+    """
+    return SistemaExpertoPlagas(pool=POOL_MOTORES, cache=CacheDiagnosticos(MAPA_CULTIVOS))
+
+
+@st.cache_resource
+def contadores_sesion():
+    """
+    Ejecuciones del script, envíos del botón de diagnóstico y diagnósticos
+    reutilizados desde st.session_state frente a los pedidos al sistema.
+    """
+    return {"ejecuciones": 0, "envios": 0, "reutilizados": 0, "calculados": 0}
+
+
+def _contar(clave):
+    contadores = contadores_sesion()
+    with _LOCK_CONTADORES:
+        contadores[clave] += 1
+
+
+def contar_ejecucion():
+    """Se llama al comienzo de cada ejecución del script (cada ida y vuelta al servidor)."""
+    _contar("ejecuciones")
+
+
+@st.cache_resource
+def obtener_imagenes():
+    """
+    Índice de images/ del proceso. Se arma al primer uso y ahí mismo se
+    revisan las imágenes que nombran las reglas: las que faltan se informan
+    una vez y no en cada diagnóstico.
+    """
+    manifiesto = ManifiestoImagenes()
+    manifiesto.validar(MAPA_CULTIVOS)
+    return manifiesto
+
+
+def mostrar_imagen(ruta, caption=None, ancho=ANCHO_MINIATURA):
+    """Miniatura de `ruta` (relativa a images/). Devuelve False si la imagen no existe."""
+    datos = obtener_imagenes().miniatura(ruta, ancho)
+    if datos is None:
+        return False
+    st.image(datos, caption=caption, use_container_width=True)
+    return True
+
+
+def mostrar_gauge(certeza, tema):
+    """Medidor de confianza: la figura de plotly en caché, o el SVG si se pidió o no hay plotly."""
+    if graficos.MODO_GRAFICOS == "plotly" and graficos.plotly_disponible():
+        st.plotly_chart(graficos.figura_gauge(certeza, tema), use_container_width=True)
+    else:
+        st.markdown(graficos.svg_gauge(certeza, tema), unsafe_allow_html=True)
+
+
+# ───────────────────────────────────────────────
+# RESULTADO PERSISTENTE POR SESIÓN
+# ───────────────────────────────────────────────
+def _clave(cultivo):
+    return f"diagnostico_{cultivo}"
+
+
+def diagnostico_pedido(pulsado, cultivo, seleccion):
+    """
+    True si hay que mostrar el diagnóstico: se pulsó el botón ahora o ya se
+    diagnosticó esta misma selección en la sesión (así abrir un expander o
+    cambiar de página no lo hace desaparecer).
+    """
+    if pulsado:
+        _contar("envios")
+        return True
+    guardado = st.session_state.get(_clave(cultivo))
+    return guardado is not None and guardado["sintomas"] == frozenset(seleccion)
+
+
+def diagnosticar_en_sesion(cultivo, seleccion):
+    """Diagnóstico de la selección, reutilizando el de la sesión si no cambió."""
+    sintomas = frozenset(seleccion)
+    guardado = st.session_state.get(_clave(cultivo))
+    if guardado is not None and guardado["sintomas"] == sintomas:
+        _contar("reutilizados")
+        return guardado["resultado"]
+    _contar("calculados")
+    resultado = obtener_sistema().diagnosticar(cultivo, list(seleccion))
+    st.session_state[_clave(cultivo)] = {"sintomas": sintomas, "resultado": resultado}
+    return resultado
+
+
+# ───────────────────────────────────────────────
+# VISTA DE ADMINISTRACIÓN
+# ───────────────────────────────────────────────
+def mostrar_admin():
+    """
+    Tasas de acierto de las cachés y estado de los motores. Se abre con
+    ?admin=1 solo si el servidor corre con PLAGAS_ADMIN=1 (ver ADMIN_HABILITADO).
+    """
+    st.subheader("⚙️ Administración")
+    cache = obtener_sistema().cache
+    stats = cache.estadisticas()
+    with _LOCK_CONTADORES:
+        sesion = dict(contadores_sesion())
+    pedidos = sesion["reutilizados"] + sesion["calculados"]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Aciertos caché", stats["aciertos"])
+    col2.metric("Fallos caché", stats["fallos"])
+    col3.metric("Tasa de aciertos", f"{stats['tasa_aciertos']:.0%}")
+    col4.metric("Entradas", stats["entradas"], help=f"{stats['bytes'] / 1024:.0f} KB")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Reutilizados en sesión", sesion["reutilizados"])
+    col2.metric("Pedidos al sistema", sesion["calculados"])
+    col3.metric("Tasa en sesión", f"{sesion['reutilizados'] / pedidos:.0%}" if pedidos else "–")
+
+    envios = sesion["envios"]
+    col1, col2 = st.columns(2)
+    col1.metric("Ejecuciones del script", sesion["ejecuciones"])
+    col2.metric("Ejecuciones por diagnóstico", f"{sesion['ejecuciones'] / envios:.1f}" if envios else "–",
+                help="Idas y vueltas al servidor por cada envío del botón de diagnóstico")
+
+    st.caption(f"Expulsados: {stats['expulsados']} • Expirados: {stats['expirados']} • "
+               f"Invalidaciones: {stats['invalidaciones']}")
+
+    imagenes = obtener_imagenes()
+    e = imagenes.estadisticas()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Imágenes", e["imagenes"])
+    col2.metric("Aciertos miniaturas", f"{e['tasa_aciertos']:.0%}", help=f"{e['bytes'] / 1024:.0f} KB en memoria")
+    col3.metric("Imágenes faltantes", e["faltantes"])
+    if imagenes.faltantes:
+        with st.expander("Imágenes faltantes"):
+            st.table([{"ruta": r, "cultivo": c} for r, c in imagenes.faltantes.items()])
+
+    st.markdown("**Motores por cultivo**")
+    st.table(POOL_MOTORES.estadisticas())
+
+    if st.button("🗑️ Vaciar caché de resultados"):
+        cache.limpiar()
+        st.success("Caché vaciada.")
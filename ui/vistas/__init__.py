@@ -0,0 +1,324 @@
+"""
+Vistas de diagnóstico descritas con datos.
+
+Cada cultivo describe su pantalla en un diccionario (ui/vistas/<cultivo>.py,
+registrado como interfaz del cultivo: 'ui.vistas.uva:VISTA'):
+
+    VISTA = {
+        "encabezado": "### ¿Qué está pasando con tus uvas?",
+        "sintomas": {"verrugas_hojas": "Bolitas o verrugas en las hojas", ...},
+        "categorias": {"🍃 Hojas": ["verrugas_hojas", ...], ...},
+        "explicaciones": {"filoxera_completa": {"titulo": "...", "texto": "..."}},
+        "alertas": [{"contiene": ["Tristeza"], "nivel": "info", "texto": "..."}],
+        "secciones": [{"titulo": "Limitaciones", "texto": "..."}],
+    }
+
+`validar` lo revisa y `construir_vista` lo convierte, una vez por proceso,
+en una VistaCultivo congelada: etiquetas de todos los síntomas, grupos de
+casillas ya filtrados por los síntomas del cultivo (los que ninguna
+categoría nombra van a un grupo final), explicaciones por regla y alertas.
+ui/diagnostico.py la dibuja; en cada ejecución solo se consultan
+diccionarios. Un cultivo sin vista propia usa la de por omisión.
+
+Este módulo no importa Streamlit.
+"""
+import threading
+from types import MappingProxyType
+
+from engine.imagenes import ruta_cultivo
+
+_CLAVES_VISTA = {"encabezado", "instrucciones", "aviso", "guia", "selector", "pregunta",
+                 "sintomas", "categorias", "columnas", "boton", "boton_primario", "tema",
+                 "textos", "razonamiento_abierto", "sin_certeza_es_sin_resultado",
+                 "certeza_minima_alternativas", "imagenes", "alertas", "explicaciones",
+                 "secciones", "nota"}
+
+SELECTORES = ("casillas", "lista")
+NIVELES = ("error", "warning", "info", "success")
+
+# Textos que cada vista puede reemplazar en "textos"
+TEXTOS = {
+    "sin_sintomas": "⚠️ Por favor, seleccione al menos un síntoma.",
+    "sin_resultado": "❌ No se encontró un diagnóstico compatible con los síntomas ingresados.",
+    "consejo": "",
+    "titulo_tarjeta": "Diagnóstico: {plaga}",
+    "certeza": "Certeza",
+    "umbral": "Umbral de daño económico",
+    "recomendaciones": "Recomendaciones:",
+    "alternativas": "📋 Diagnósticos alternativos",
+    "razonamiento": "🔍 Trazabilidad de la inferencia",
+    "sintomas_marcados": "Síntomas ingresados:",
+    "reglas": "Reglas activadas:",
+    "preliminar": "",
+    "sugerencia": "🔍 Qué buscar para confirmar:",
+    "proceso": "",
+    "fuente": "",
+    # Desplegable con las reglas y los síntomas en crudo; vacío, no se muestra
+    "tecnica": "",
+    "sintomas_tecnicos": "Síntomas técnicos procesados:",
+    "otros": "➕ Otros",
+}
+
+# Ícono de la tarjeta según la certeza (el primero cuyo mínimo se alcanza)
+ICONOS = ((0.8, "✅"), (0.6, "⚠️"), (0.0, "❓"))
+
+
+class VistaInvalida(ValueError):
+    """El diccionario no describe una vista válida."""
+    pass
+
+
+class _Congelado:
+    """Objeto de solo lectura: los campos se fijan al crearlo."""
+
+    __slots__ = ()
+
+    def __init__(self, **campos):
+        for nombre, valor in campos.items():
+            object.__setattr__(self, nombre, valor)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"{type(self).__name__} es de solo lectura")
+
+    __delattr__ = __setattr__
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{c}={getattr(self, c)!r}' for c in self.__slots__)})"
+
+
+class Seccion(_Congelado):
+    """Expander con texto en markdown."""
+    __slots__ = ("titulo", "texto", "abierta")
+
+
+class Carrusel(_Congelado):
+    """Guía con una imagen y descripción por síntoma, `por_pagina` a la vez."""
+    __slots__ = ("titulo", "imagenes", "descripciones", "por_pagina", "abierta")
+
+
+class Grupo(_Congelado):
+    """Casillas de una categoría: (síntoma, etiqueta) en orden. Sin nombre no va en expander."""
+    __slots__ = ("nombre", "sintomas")
+
+
+class Explicacion(_Congelado):
+    __slots__ = ("titulo", "texto", "sugerencia")
+
+
+class Alerta(_Congelado):
+    """Mensaje para los diagnósticos cuya plaga contiene alguno de `contiene`."""
+    __slots__ = ("contiene", "nivel", "texto")
+
+    def coincide(self, plaga):
+        return any(fragmento in plaga for fragmento in self.contiene)
+
+    def formatear(self, plaga):
+        return self.texto.format(plaga=plaga, plaga_corta=plaga.split("(")[0].strip())
+
+
+class VistaCultivo(_Congelado):
+    """Todo lo que la interfaz necesita de un cultivo, ya resuelto."""
+
+    __slots__ = ("clave", "nombre", "sintomas", "etiquetas", "grupos", "selector", "columnas",
+                 "encabezado", "instrucciones", "aviso", "guia", "pregunta", "boton",
+                 "boton_primario", "tema", "textos", "razonamiento_abierto",
+                 "sin_certeza_es_sin_resultado", "certeza_minima_alternativas", "imagenes",
+                 "alertas", "explicaciones", "secciones", "nota")
+
+    def etiqueta(self, sintoma):
+        return self.etiquetas.get(sintoma, sintoma)
+
+    def alerta(self, plaga):
+        """Primera alerta que corresponde a `plaga`, o None."""
+        for alerta in self.alertas:
+            if alerta.coincide(plaga):
+                return alerta
+        return None
+
+    def ruta_imagen(self, diagnostico):
+        """Ruta relativa a images/ de la imagen de un diagnóstico, o None."""
+        ruta = self.imagenes.get(diagnostico["plaga"])
+        if ruta is not None:
+            return ruta
+        imagen = diagnostico.get("imagen")
+        return ruta_cultivo(self.clave, imagen) if imagen else None
+
+    @staticmethod
+    def icono(certeza):
+        for minimo, icono in ICONOS:
+            if certeza >= minimo:
+                return icono
+        return ICONOS[-1][1]
+
+
+def _etiqueta_por_omision(sintoma):
+    return sintoma.replace("_", " ").capitalize()
+
+
+def _texto(datos, clave, contexto):
+    valor = datos.get(clave, "")
+    if not isinstance(valor, str):
+        raise VistaInvalida(f"{contexto}: '{clave}' debe ser texto")
+    return valor
+
+
+def _lista_textos(valor, contexto):
+    if not isinstance(valor, list) or not all(isinstance(s, str) and s for s in valor):
+        raise VistaInvalida(f"{contexto} debe ser una lista de textos")
+    return tuple(valor)
+
+
+def _diccionario(datos, clave):
+    valor = datos.get(clave, {})
+    if not isinstance(valor, dict):
+        raise VistaInvalida(f"'{clave}' debe ser un objeto")
+    return valor
+
+
+def _seccion(datos, contexto):
+    if not isinstance(datos, dict) or not isinstance(datos.get("titulo"), str):
+        raise VistaInvalida(f"{contexto}: cada sección necesita 'titulo'")
+    return Seccion(titulo=datos["titulo"], texto=_texto(datos, "texto", contexto),
+                   abierta=bool(datos.get("abierta", False)))
+
+
+def _guia(datos):
+    if datos is None:
+        return None
+    if not isinstance(datos, dict) or "carrusel" not in datos:
+        return _seccion(datos, "guia")
+    carrusel = datos["carrusel"]
+    if not isinstance(carrusel, dict) or "{sintoma}" not in carrusel.get("imagenes", ""):
+        raise VistaInvalida("guia: 'carrusel' necesita 'imagenes' con '{sintoma}'")
+    por_pagina = carrusel.get("por_pagina", 3)
+    if not isinstance(por_pagina, int) or por_pagina < 1:
+        raise VistaInvalida("guia: 'por_pagina' debe ser un entero positivo")
+    return Carrusel(titulo=_texto(datos, "titulo", "guia"), imagenes=carrusel["imagenes"],
+                    descripciones=MappingProxyType(dict(_diccionario(carrusel, "descripciones"))),
+                    por_pagina=por_pagina, abierta=bool(datos.get("abierta", False)))
+
+
+def validar(datos, sintomas):
+    """Revisa la vista contra los síntomas del cultivo (o lanza VistaInvalida)."""
+    if not isinstance(datos, dict):
+        raise VistaInvalida("La vista debe ser un objeto")
+    desconocidas = set(datos) - _CLAVES_VISTA
+    if desconocidas:
+        raise VistaInvalida(f"Claves desconocidas: {', '.join(sorted(desconocidas))}")
+    if datos.get("selector", "casillas") not in SELECTORES:
+        raise VistaInvalida(f"'selector' debe ser uno de {', '.join(SELECTORES)}")
+    columnas = datos.get("columnas", 2)
+    if not isinstance(columnas, int) or columnas < 1:
+        raise VistaInvalida("'columnas' debe ser un entero positivo")
+
+    conocidos = set(sintomas)
+    etiquetas = _diccionario(datos, "sintomas")
+    ajenos = set(etiquetas) - conocidos
+    if ajenos:
+        raise VistaInvalida(f"'sintomas' nombra síntomas que el cultivo no tiene: {', '.join(sorted(ajenos))}")
+    vistos = set()
+    for nombre, lista in _diccionario(datos, "categorias").items():
+        lista = _lista_textos(lista, f"categoría '{nombre}'")
+        ajenos = set(lista) - conocidos
+        if ajenos:
+            raise VistaInvalida(f"Categoría '{nombre}': síntomas que el cultivo no tiene: "
+                                f"{', '.join(sorted(ajenos))}")
+        repetidos = vistos.intersection(lista)
+        if repetidos:
+            raise VistaInvalida(f"Categoría '{nombre}': síntomas en más de una categoría: "
+                                f"{', '.join(sorted(repetidos))}")
+        vistos.update(lista)
+
+    textos = _diccionario(datos, "textos")
+    desconocidas = set(textos) - set(TEXTOS)
+    if desconocidas:
+        raise VistaInvalida(f"'textos' desconocidos: {', '.join(sorted(desconocidas))}")
+    for regla, explicacion in _diccionario(datos, "explicaciones").items():
+        if not isinstance(explicacion, dict) or not isinstance(explicacion.get("texto"), str):
+            raise VistaInvalida(f"Explicación de '{regla}': falta 'texto'")
+    alertas = datos.get("alertas", [])
+    if not isinstance(alertas, list):
+        raise VistaInvalida("'alertas' debe ser una lista")
+    for alerta in alertas:
+        if not isinstance(alerta, dict) or alerta.get("nivel", "info") not in NIVELES:
+            raise VistaInvalida(f"Cada alerta necesita un 'nivel' entre {', '.join(NIVELES)}")
+        _lista_textos(alerta.get("contiene"), "'contiene' de una alerta")
+        _texto(alerta, "texto", "alerta")
+    if not isinstance(datos.get("secciones", []), list):
+        raise VistaInvalida("'secciones' debe ser una lista")
+    return datos
+
+
+def construir_vista(clave, nombre, sintomas, datos=None):
+    """VistaCultivo de `datos` (None: la vista por omisión) para los síntomas del cultivo."""
+    datos = validar(datos if datos is not None else {}, sintomas)
+    sintomas = tuple(sintomas)
+    etiquetas_propias = datos.get("sintomas", {})
+    etiquetas = {s: etiquetas_propias.get(s) or _etiqueta_por_omision(s) for s in sintomas}
+    textos = dict(TEXTOS, **datos.get("textos", {}))
+
+    # Orden de las casillas: el de las categorías, o el de las etiquetas y luego el del cultivo
+    categorias = datos.get("categorias")
+    if categorias:
+        grupos = [(nombre_grupo, list(lista)) for nombre_grupo, lista in categorias.items()]
+        nombrados = {s for _, lista in grupos for s in lista}
+        resto = [s for s in sintomas if s not in nombrados]
+        if resto:
+            grupos.append((textos["otros"], resto))
+    else:
+        orden = [s for s in etiquetas_propias if s in etiquetas]
+        grupos = [(None, orden + [s for s in sintomas if s not in etiquetas_propias])]
+    grupos = tuple(Grupo(nombre=n, sintomas=tuple((s, etiquetas[s]) for s in lista))
+                   for n, lista in grupos if lista)
+
+    explicaciones = {regla: Explicacion(titulo=e.get("titulo", ""), texto=e["texto"],
+                                        sugerencia=e.get("sugerencia", ""))
+                     for regla, e in datos.get("explicaciones", {}).items()}
+    alertas = tuple(Alerta(contiene=tuple(a["contiene"]), nivel=a.get("nivel", "info"),
+                           texto=a.get("texto", ""))
+                    for a in datos.get("alertas", []))
+    return VistaCultivo(
+        clave=clave,
+        nombre=nombre,
+        sintomas=sintomas,
+        etiquetas=MappingProxyType(etiquetas),
+        grupos=grupos,
+        selector=datos.get("selector", "casillas"),
+        columnas=datos.get("columnas", 2),
+        encabezado=datos.get("encabezado", ""),
+        instrucciones=datos.get("instrucciones", ""),
+        aviso=datos.get("aviso", ""),
+        guia=_guia(datos.get("guia")),
+        pregunta=datos.get("pregunta", "Seleccione los síntomas observados en el campo:"),
+        boton=datos.get("boton", "🔍 Diagnosticar"),
+        boton_primario=bool(datos.get("boton_primario", False)),
+        tema=datos.get("tema", "general"),
+        textos=MappingProxyType(textos),
+        razonamiento_abierto=bool(datos.get("razonamiento_abierto", False)),
+        sin_certeza_es_sin_resultado=bool(datos.get("sin_certeza_es_sin_resultado", False)),
+        certeza_minima_alternativas=float(datos.get("certeza_minima_alternativas", 0.0)),
+        imagenes=MappingProxyType(dict(datos.get("imagenes", {}))),
+        alertas=alertas,
+        explicaciones=MappingProxyType(explicaciones),
+        secciones=tuple(_seccion(s, "secciones") for s in datos.get("secciones", [])),
+        nota=datos.get("nota", ""),
+    )
+
+
+_VISTAS = {}
+_lock = threading.Lock()
+
+
+def obtener_vista(clave, nombre, sintomas, datos=None):
+    """
+    VistaCultivo del cultivo, construida en el primer pedido del proceso.
+    Se vuelve a construir solo si cambian los datos o los síntomas.
+    """
+    sintomas = tuple(sintomas)
+    guardada = _VISTAS.get(clave)
+    if guardada is not None and guardada[0] is datos and guardada[1] == sintomas:
+        return guardada[2]
+    vista = construir_vista(clave, nombre, sintomas, datos)
+    with _lock:
+        _VISTAS[clave] = (datos, sintomas, vista)
+    return vista
@@ -0,0 +1,157 @@
+"""Vista de diagnóstico del cacao."""
+
+VISTA = {
+    # Descargo de responsabilidad - requisito académico
+    "aviso": "AVISO IMPORTANTE: Este sistema es una herramienta de asistencia para diagnóstico preliminar.\n"
+             "La decisión final debe ser tomada por un ingeniero agrónomo, fitopatólogo o técnico agrícola calificado.",
+    "guia": {
+        "titulo": "Guía rápida de síntomas observables (Campo)",
+        "texto": """
+**Manchas oscuras en mazorca**
+- Pequeñas manchas oscuras en superficie de mazorca
+
+**Polvo blanco**
+- Polvo blanco característico (millones de conidias)
+
+**Pudrición de fruto**
+- Pudrición interna del fruto, mazorca momificada
+
+**Alta humedad ambiente**
+- Humedad relativa mayor al 80%
+
+**Temperatura óptima**
+- Temperatura 21-27°C favorable
+
+**Brotes anormales**
+- Brotes hinchados, deformados (fase verde)
+
+**Hipertrofia de cojines**
+- Cojines florales hinchados anormalmente
+
+**Escobas secas**
+- Brotes secos necróticos (fase seca - fuente de esporas)
+
+**Mazorcas perforadas**
+- Perforaciones pequeñas en cáscara
+
+**Galerías internas**
+- Galerías en pulpa y semillas
+
+**Adulto volador presente**
+- Observación de polillas adultas
+
+**Manchas negras en mazorca**
+- Manchas negras con borde difuso
+
+**Pudrición rápida**
+- Pudrición acelerada en 3-5 días
+
+**Lluvia reciente**
+- Síntomas evidentes después de lluvias
+""",
+    },
+    "instrucciones": "### Seleccione los síntomas observados en sus plantas\n---",
+    "pregunta": "",
+    "columnas": 3,
+    "boton": "Diagnosticar",
+    "tema": "cacao",
+    "razonamiento_abierto": True,
+    "sin_certeza_es_sin_resultado": True,
+
+    "sintomas": {
+        "manchas_oscuras_mazorca": "Manchas oscuras en mazorca",
+        "polvo_blanco": "Polvo blanco",
+        "pudricion_fruto": "Pudrición de fruto",
+        "alta_humedad_ambiente": "Alta humedad ambiente",
+        "temperatura_optima": "Temperatura óptima (21-27°C)",
+        "brotes_anormales": "Brotes anormales",
+        "hipertrofia_cojines": "Hipertrofia de cojines florales",
+        "escobas_secas": "Escobas secas",
+        "mazorcas_perforadas": "Mazorcas perforadas",
+        "galerias_internas": "Galerías internas",
+        "adulto_volador_presente": "Adulto volador presente",
+        "manchas_negras_mazorca": "Manchas negras en mazorca",
+        "pudricion_rapida": "Pudrición rápida",
+        "lluvia_reciente": "Lluvia reciente",
+    },
+
+    # Imagen de cada plaga, relativa a images/
+    "imagenes": {
+        "Moniliasis del cacao (Moniliophthora roreri)": "cacao/moniliasis.jpg",
+        "Moniliasis del cacao (Moniliophthora roreri) – etapa inicial": "cacao/moniliasis.jpg",
+        "Riesgo de Moniliasis – condiciones ambientales favorables": "cacao/moniliasis.jpg",
+        "Escoba de bruja (Moniliophthora perniciosa)": "cacao/escoba_bruja.jpg",
+        "Escoba de bruja (Moniliophthora perniciosa) – sospecha": "cacao/escoba_bruja.jpg",
+        "Mazorquero del cacao (Carmenta spp)": "cacao/mazorquero.jpg",
+        "Mazorquero del cacao (Carmenta spp) – daño inicial": "cacao/mazorquero.jpg",
+        "Pudrición negra de mazorca (Phytophthora palmivora)": "cacao/pudricion_negra.jpg",
+        "Pudrición negra de mazorca (Phytophthora spp) – etapa inicial": "cacao/pudricion_negra.jpg",
+    },
+
+    # Alerta para enfermedades devastadoras
+    "alertas": [
+        {"contiene": ["Moniliasis", "Escoba de bruja"], "nivel": "error",
+         "texto": "ALERTA: {plaga_corta} es una enfermedad devastadora.\n"
+                  "Puede causar pérdidas del 40-90% de la producción.\n"
+                  "Acción inmediata requerida."},
+    ],
+
+    "textos": {
+        "sin_sintomas": "Seleccione al menos un síntoma.",
+        "sin_resultado": "Sin diagnóstico identificado: Los síntomas no coinciden con las plagas principales del cacao.",
+        "consejo": "Recomendación: Consulte con un técnico agrícola para análisis adicional.",
+        "certeza": "Nivel de Certeza",
+        "recomendaciones": "Recomendaciones de Manejo Integrado",
+        "alternativas": "Diagnósticos alternativos (diagnóstico diferencial)",
+        "razonamiento": "Explicación del Razonamiento (Trazabilidad)",
+        "proceso": "1. Entrada: Se declararon {sintomas} síntomas como hechos\n"
+                   "2. Motor de inferencia: Encadenamiento hacia adelante (forward chaining)\n"
+                   "3. Evaluación: Se activaron {reglas} regla(s)\n"
+                   "4. Resultado: Diagnóstico con certeza del {certeza}%\n"
+                   "5. Base de conocimiento: INIAP Ecuador, AGROSAVIA Colombia (2014-2022)",
+    },
+
+    "secciones": [
+        {"titulo": "Limitaciones y Supuestos del Sistema", "texto": """
+### Limitaciones conocidas:
+- **Periodo de latencia**: Moniliasis puede tardar 40-80 días sin síntomas visibles
+- **Síntomas ambiguos**: Manchas oscuras pueden ser por múltiples patógenos
+- **Periodo de observación**: No considera fenología del cultivo ni historial de la parcela
+- **Interacciones complejas**: No detecta infecciones simultáneas de múltiples patógenos
+- **Variabilidad genética**: Asume variedades comerciales comunes (CCN-51, ICS, Trinitarios)
+
+### Supuestos del sistema:
+- Plantación de cacao en condiciones de manejo convencional
+- Clima tropical/subtropical (temperatura 21-27°C, humedad relativa alta)
+- Síntomas observados en plantas adultas en producción
+- No considera plagas secundarias o regionales específicas
+
+### Casos donde el sistema puede fallar:
+- Síntomas muy tempranos (periodo de incubación)
+- Daños por factores abióticos (sequía, toxicidad, vientos)
+- Plagas emergentes no documentadas en la base de conocimiento
+- Diferenciación entre Moniliasis y Phytophthora en etapas tempranas
+"""},
+        {"titulo": "Fuentes Técnicas y Validación", "texto": """
+### Fuentes consultadas:
+**Instituciones de investigación:**
+- **INIAP Ecuador** (Instituto Nacional de Investigaciones Agropecuarias)
+- **AGROSAVIA Colombia** (Corporación Colombiana de Investigación Agropecuaria)
+- **SENASA Perú** (Servicio Nacional de Sanidad Agraria)
+- **CATIE** (Centro Agronómico Tropical de Investigación y Enseñanza)
+
+### Validación:
+Este sistema NO ha sido validado por expertos en campo
+- Desarrollado con fines académicos
+- Base de conocimiento extraída de literatura técnica oficial
+- Requiere validación por agrónomos especializados en cacao
+
+### Responsable de decisión final:
+Ingeniero agrónomo o técnico agrícola certificado
+"""},
+    ],
+
+    "nota": "Nota de Transparencia: Este sistema experto utiliza reglas determinísticas basadas en "
+            "literatura técnica oficial. La certeza refleja la completitud de síntomas observados, no probabilidades "
+            "estadísticas. Siempre consulte con un profesional antes de aplicar tratamientos químicos.",
+}
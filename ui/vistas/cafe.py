@@ -0,0 +1,137 @@
+"""Vista de diagnóstico del café."""
+
+VISTA = {
+    # Descargo de responsabilidad - requisito académico
+    "aviso": "⚠️ **AVISO IMPORTANTE**: Este sistema es una herramienta de asistencia para diagnóstico preliminar.\n"
+             "**La decisión final debe ser tomada por un ingeniero agrónomo, fitopatólogo o técnico agrícola calificado.**",
+    "guia": {
+        "titulo": "📖 Guía rápida de síntomas observables (Campo)",
+        "texto": """
+**Frutos perforados**
+- Perforación circular en el disco del fruto (parte central del grano)
+
+**Granos dañados internamente**
+- Polvo café fino en el interior del grano
+
+**Manchas amarillas en hojas**
+- Manchas cloróticas visibles en el envés
+
+**Polvo naranja**
+- Polvo fino de color naranja o amarillo en la cara inferior de la hoja
+
+**Hojas con galerías internas**
+- Líneas serpenteadas dentro del tejido foliar
+
+**Hojas bronceadas**
+- Coloración bronceada o amarillenta en periodos secos
+
+**Manchas necróticas circulares**
+- Lesiones marrones con borde marcado
+
+**Plantas débiles o marchitas**
+- Pérdida de vigor, crecimiento lento
+
+**Presencia de hormigas en el cuello del tallo**
+- Indica posible asociación con cochinillas
+""",
+    },
+    "instrucciones": "### Seleccione los síntomas observados en sus plantas\n---",
+    "pregunta": "",
+    "columnas": 3,
+    "boton": "Diagnosticar",
+    "tema": "cafe",
+    "razonamiento_abierto": True,
+    "sin_certeza_es_sin_resultado": True,
+
+    "sintomas": {
+        "frutos_perforados": "Frutos perforados",
+        "granos_dañados": "Daño interno en el grano",
+        "cerezas_caidas": "Caída prematura de frutos",
+        "manchas_amarillas_envés": "Manchas amarillas en hojas",
+        "caida_hojas": "Caída progresiva de hojas",
+        "polvo_naranja": "Polvo anaranjado en el envés",
+        "amarillamiento_hojas": "Hojas amarillentas generales",
+        "marchitez_plantas": "Marchitez persistente",
+        "muerte_plantas": "Plantas muy debilitadas",
+        "hormigas_cuello_tallo": "Hormigas en el cuello de la planta",
+        "minas_serpentinas_hojas": "Trayectorias blanquecinas en hojas",
+        "defoliacion": "Pérdida de hojas",
+        "hojas_necroticas": "Hojas con partes secas",
+        "hojas_bronceadas": "Hojas bronceadas o rojizas",
+        "telaraña_envés": "Telarañas finas en el envés",
+        "epoca_seca": "Síntomas en época seca",
+        "manchas_necroticas_hojas": "Manchas circulares necrosadas",
+        "plantulas_debiles": "Plántulas débiles en vivero",
+    },
+
+    # Imagen de cada plaga, relativa a images/
+    "imagenes": {
+        "Broca del café (Hypothenemus hampei)": "cafe/broca.jpg",
+        "Broca del café (Hypothenemus hampei) – sospecha": "cafe/broca.jpg",
+        "Roya amarilla del café (Hemileia vastatrix)": "cafe/roya.jpg",
+        "Roya amarilla del café (Hemileia vastatrix) – etapa inicial": "cafe/roya.jpg",
+        "Cochinillas de raíces del café (Puto barberi, Dysmicoccus spp)": "cafe/cochinilla.jpg",
+        "Cochinillas de raíces – indicio por hormigas": "cafe/cochinilla.jpg",
+        "Minador de hojas del café (Leucoptera coffeella)": "cafe/minador.jpg",
+        "Arañita roja del café (Oligonychus yothersi)": "cafe/arañita.jpg",
+        "Arañita roja del café (Oligonychus yothersi) – focos iniciales": "cafe/arañita.jpg",
+        "Mancha de hierro (Cercospora coffeicola)": "cafe/mancha.jpg",
+    },
+
+    "textos": {
+        "sin_sintomas": "Seleccione al menos un síntoma.",
+        "sin_resultado": "❌ **Sin diagnóstico identificado**: Los síntomas no coinciden con las plagas principales del café.",
+        "consejo": "📋 **Recomendación**: Consulte con un técnico agrícola para análisis adicional.",
+        "certeza": "Nivel de Certeza",
+        "recomendaciones": "🌾 Recomendaciones de Manejo Integrado",
+        "alternativas": "📋 Diagnósticos alternativos (diagnóstico diferencial)",
+        "razonamiento": "🧠 Explicación del Razonamiento (Trazabilidad)",
+        "proceso": "1. **Entrada**: Se declararon {sintomas} síntomas como hechos\n"
+                   "2. **Motor de inferencia**: Encadenamiento hacia adelante (forward chaining)\n"
+                   "3. **Evaluación**: Se activaron {reglas} regla(s)\n"
+                   "4. **Resultado**: Diagnóstico con certeza del {certeza}%\n"
+                   "5. **Base de conocimiento**: CENICAFE, SENASA, INIA (2020-2023)",
+    },
+
+    "secciones": [
+        {"titulo": "⚠️ Limitaciones y Supuestos del Sistema", "texto": """
+### Limitaciones conocidas:
+- **Síntomas ambiguos**: Amarillamiento puede ser por cochinillas, deficiencias nutricionales o estrés hídrico
+- **Periodo de observación**: No considera fenología del cultivo ni historial de la parcela
+- **Interacciones complejas**: No detecta infecciones simultáneas de múltiples patógenos
+- **Variabilidad genética**: Asume variedades comerciales comunes (Typica, Caturra, Bourbon)
+
+### Supuestos del sistema:
+- ✓ Cafetal en condiciones de manejo convencional
+- ✓ Clima tropical/subtropical (temperatura 18-24°C, precipitación 1500-2000mm)
+- ✓ Síntomas observados en plantas adultas en producción
+- ✓ No considera plagas secundarias o regionales específicas
+
+### Casos donde el sistema puede fallar:
+- Síntomas muy tempranos (periodo de incubación)
+- Daños por factores abióticos (heladas, sequía, toxicidad)
+- Plagas emergentes no documentadas en la base de conocimiento
+"""},
+        {"titulo": "📚 Fuentes Técnicas y Validación", "texto": """
+### Fuentes consultadas:
+**Instituciones de investigación:**
+- **CENICAFE** (Centro Nacional de Investigaciones del Café, Colombia)
+- **SENASA Perú** (Servicio Nacional de Sanidad Agraria)
+- **INIA Perú** (Instituto Nacional de Innovación Agraria) - MIP 2022
+- **Café de Colombia** (Federación Nacional de Cafeteros)
+
+### Validación:
+⚠️ **Este sistema NO ha sido validado por expertos en campo**
+- Desarrollado con fines académicos
+- Base de conocimiento extraída de literatura técnica oficial
+- Requiere validación por agrónomos especializados en café
+
+### Responsable de decisión final:
+👨‍🌾 **Ingeniero agrónomo o técnico agrícola certificado**
+"""},
+    ],
+
+    "nota": "💡 **Nota de Transparencia**: Este sistema experto utiliza reglas determinísticas basadas en "
+            "literatura técnica oficial. La certeza refleja la completitud de síntomas observados, no probabilidades "
+            "estadísticas. Siempre consulte con un profesional antes de aplicar tratamientos químicos.",
+}
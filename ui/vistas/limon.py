@@ -0,0 +1,51 @@
+"""Vista de diagnóstico del limón."""
+
+VISTA = {
+    "selector": "lista",
+    "boton": "🔍 Diagnosticar Plaga",
+    "tema": "limon",
+    "certeza_minima_alternativas": 0.5,
+
+    "guia": {
+        "titulo": "🔍 Guía de síntomas observables",
+        "abierta": True,
+        "carrusel": {
+            "imagenes": "limon/sintomas/{sintoma}.jpg",
+            "por_pagina": 3,
+            "descripciones": {
+                # Daños en hojas
+                "hojas_enrolladas": "Hojas retorcidas o encrespadas, típicamente por pulgones o ácaros.",
+                "hojas_plateadas": "Apariencia plateada o blanquecina en el haz, causada por ácaro del tostado.",
+                "hojas_amarillentas": "Clorosis general, puede indicar queresas o moscas blancas.",
+                "hojas_deformadas": "Hojas distorsionadas, arrugadas o con crecimiento anormal.",
+                "hojas_con_minas_serpentinas": "Túneles serpenteantes plateados, daño de minador de hojas.",
+                "hojas_con_puntos_amarillos": "Pequeños puntos amarillos dispersos por alimentación de ácaros.",
+                "hojas_con_manchas_negras": "Manchas oscuras o negras, posible fumagina asociada a insectos chupadores.",
+
+                # Presencia de insectos/ácaros
+                "escamas_blancas_hojas": "Costras blancas en hojas, piojos blancos o queresas.",
+                "escamas_marrones_hojas": "Escamas marrones circulares o alargadas, queresas diaspididas.",
+                "insectos_algodonosos": "Masas blancas algodonosas, cochinilla harinosa o acanalada.",
+                "moscas_blancas_envés": "Pequeños insectos blancos voladores en envés de hojas.",
+                "pulgones_brotes": "Colonias de pulgones verdes, negros o marrones en brotes tiernos.",
+
+                # Secreciones
+                "mielada": "Sustancia pegajosa brillante en hojas/ramas, producida por insectos chupadores.",
+                "fumagina": "Hongo negro hollín sobre mielada, reduce fotosíntesis.",
+
+                # Daños en frutos
+                "frutos_decolorados": "Frutos con manchas amarillas, grises o marrones.",
+                "frutos_con_manchas_oscuras": "Manchas negras o marrones en cáscara, por queresas o ácaros.",
+                "frutos_plateados": "Área plateada o bronceada en frutos por ácaro del tostado.",
+                "frutos_deformados": "Frutos con forma irregular o desarrollo asimétrico.",
+                "frutos_pequeños": "Frutos más pequeños de lo normal, por estrés de plagas.",
+                "cáscara_agrietada": "Grietas superficiales en cáscara por daño temprano de ácaros.",
+
+                # Daños en ramas/tronco
+                "escamas_tronco": "Costras marrones o blancas en tronco y ramas principales.",
+                "debilitamiento_planta": "Pérdida de vigor general, amarillamiento progresivo.",
+                "muerte_brotes": "Brotes secos o muertos, por queresas o moscas blancas severas.",
+            },
+        },
+    },
+}
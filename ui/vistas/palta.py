@@ -0,0 +1,71 @@
+"""Vista de diagnóstico de la palta."""
+
+VISTA = {
+    "selector": "lista",
+    "boton": "🔍 Diagnosticar Plaga/Enfermedad",
+    "tema": "palta",
+
+    "guia": {
+        "titulo": "🔍 Guía de síntomas observables",
+        "texto": """
+- **raspado_frutos**: raspado visible en frutos recién cuajados
+- **rugosidad_frutos**: textura rugosa y áspera en la epidermis
+- **bronceado_frutos**: coloración bronceada en superficie del fruto
+- **deformacion_frutos**: frutos con formas irregulares
+- **tostado_hojas**: hojas con apariencia tostada o quemada
+- **hojas_rojizas**: coloración rojiza en hojas maduras
+- **perdida_clorofila**: pérdida del color verde en las hojas
+- **bronceado_hojas**: bronceado en hojas por alta densidad de ácaros
+- **defoliacion_prematura**: caída temprana de hojas
+- **perforacion_brotes**: perforaciones en hojas jóvenes y brotes
+- **fumagina**: presencia de hongo negro (hollín) en hojas
+- **debilitamiento_planta**: planta con poco vigor y crecimiento lento
+- **hojas_pegajosas**: hojas con sustancia pegajosa (melaza)
+- **escamas_marron_frutos**: escamas alargadas marrón amarillento en frutos
+- **escamas_marron_hojas**: escamas alargadas con pliegue central en hojas
+- **secamiento_hojas**: hojas que se secan progresivamente
+- **escamas_blancas_pedunculo**: escamas blanco-rosadas en zona del pedúnculo
+- **escamas_circulares_frutos**: escamas circulares u ovaladas en frutos
+- **espirales_cera_hojas**: grandes espirales de secreciones céreas en envés
+- **huevos_desordenados_enves**: huevos alargados dispuestos desordenadamente
+- **cobertura_cera_hojas**: cobertura blanca de cera muy acentuada
+- **cestos_colgantes_hojas**: estructuras en forma de cesto colgando de hojas
+- **raspado_epidermis_hojas**: raspado superficial en epidermis de hojas
+- **larvas_con_refugio**: larvas protegidas dentro de cestos de follaje
+- **hojas_amarillas**: coloración amarillenta general en follaje
+- **defoliacion**: caída excesiva de hojas
+- **raices_necrosadas**: raíces podridas o con tejido muerto
+- **frutos_pequenos**: frutos más pequeños de lo normal
+- **muerte_regresiva**: muerte progresiva desde las puntas de ramas
+- **cancros_tronco**: heridas o lesiones en tronco y ramas
+- **exudados_blancos**: secreciones blanquecinas y grumosas
+- **muerte_ramas**: ramas completamente muertas con follaje seco
+- **pudricion_frutos_pedunculo**: pudrición del fruto en unión con el tallo
+- **manchas_amarillas_fruto**: lesiones amarillo pálido en forma de vagina en frutos
+- **variegado_hojas**: hojas con manchas de diferentes colores
+- **moteado_hojas**: puntos blancos o rosados en hojas
+- **crecimiento_horizontal**: árbol crece más horizontal que vertical
+- **corteza_facil_desprender**: corteza se desprende fácilmente con líneas amarillentas
+""",
+    },
+
+    # Información adicional según el diagnóstico (se muestra la primera que coincide)
+    "alertas": [
+        {"contiene": ["Tristeza"], "nivel": "info",
+         "texto": "💡 **Nota importante**: La Tristeza del palto prospera en suelos arcillosos con mal drenaje. Considere mejorar el sistema de drenaje."},
+        {"contiene": ["Brazo negro"], "nivel": "warning",
+         "texto": "⚠️ **Prevención crítica**: Desinfecte TODAS las herramientas de poda e injerto con lejía entre planta y planta para evitar propagación."},
+        {"contiene": ["Sunblotch"], "nivel": "error",
+         "texto": "🚨 **ALERTA**: Los viroides NO tienen cura. Las plantas infectadas deben ser eliminadas completamente y quemadas para evitar contagio."},
+        {"contiene": ["Queresas"], "nivel": "info",
+         "texto": "💡 **Importante para exportación**: Las queresas afectan la calidad cosmética del fruto y son frecuentemente interceptadas en cuarentena. Requiere tratamientos pre-cosecha y certificación fitosanitaria."},
+        {"contiene": ["Arañita"], "nivel": "info",
+         "texto": "💡 **Dato importante**: Esta especie de ácaro se encuentra en la cara SUPERIOR de las hojas (diferente a otros ácaros). Densidades de 300 ácaros/hoja o 70 hembras/hoja en sequía causan daño económico."},
+        {"contiene": ["Bicho del cesto"], "nivel": "success",
+         "texto": "✅ **Control facilitado**: Los cestos son muy visibles y pueden recolectarse manualmente. El control es más efectivo en estadios tempranos antes de que completen el cesto protector."},
+    ],
+
+    "textos": {
+        "fuente": "Basado en: Guía fotográfica de síntomas de deficiencias de nutrientes, enfermedades y plagas en paltos - www.caritas.org.pe / PortalFruticola.com (2023)",
+    },
+}
@@ -0,0 +1,93 @@
+"""Vista de diagnóstico de la papa."""
+
+VISTA = {
+    "encabezado": "## 🥔 Diagnóstico de Plagas en Papa",
+    "pregunta": "Selecciona los síntomas que observas en tu cultivo:",
+    "boton_primario": True,
+    "tema": "papa",
+
+    "sintomas": {
+        "hojas_enrolladas": "Hojas enrolladas",
+        "hojas_amarillentas": "Hojas amarillentas",
+        "tuneles_en_hojas": "Túneles en las hojas",
+        "larvas_presentes": "Larvas presentes",
+        "raices_perforadas": "Raíces perforadas",
+        "tuberculos_huecos": "Tubérculos huecos",
+        "plantas_debilitadas": "Plantas debilitadas",
+        "manchas_amarillas": "Manchas amarillas en hojas",
+        "hojas_con_galerias": "Galerías en hojas",
+        "insectos_pequenos_negros": "Insectos pequeños negros",
+        "tallos_perforados": "Tallos perforados",
+        "tuberculos_danados": "Tubérculos dañados",
+        "hojas_plateadas": "Hojas plateadas",
+        "insectos_pequenos": "Insectos pequeños visibles",
+        "hojas_arrugadas": "Hojas arrugadas",
+        "polvo_fino_blanco": "Polvo fino blanco sobre hojas",
+        "hojas_devoradas": "Hojas devoradas",
+        "insectos_amarillos_negros": "Insectos amarillos con negro",
+        "tallos_cortados": "Tallos cortados",
+        "plantas_caidas": "Plantas caídas",
+        "hojas_amarillas": "Hojas amarillas",
+        "insectos_mosca_blanca": "Insectos tipo mosca blanca",
+        "tuberculos_con_galerias": "Tubérculos con galerías",
+        "larvas_internas": "Larvas dentro del tubérculo",
+        "suelo_humedo": "Suelo húmedo o lodoso",
+        "raices_mascadas": "Raíces mascadas",
+        "tallos_deformados": "Tallos deformados",
+        "hojas_abolladas": "Hojas abolladas o deformadas",
+        "tuberculos_decolorados": "Tubérculos decolorados",
+        "larvas_rosadas": "Larvas rosadas visibles",
+        "suelo_agrietado": "Suelo agrietado",
+        "raices_mordidas": "Raíces mordidas",
+        "tallos_mordidos": "Tallos mordidos",
+        "ataque_nocturno": "Daño visible solo de noche",
+        "hojas_curvadas": "Hojas curvadas hacia adentro",
+        "insectos_verdes": "Insectos verdes pequeños",
+        "hojas_mordidas": "Hojas mordidas",
+        "rastro_baboso": "Rastro baboso en hojas o suelo",
+        "hojas_manchas_negras": "Manchas negras en hojas",
+        "clima_humedo": "Clima húmedo o lluvioso reciente",
+    },
+
+    "categorias": {
+        "🍃 Hojas": [
+            "hojas_enrolladas", "hojas_amarillentas", "tuneles_en_hojas",
+            "hojas_con_galerias", "hojas_plateadas", "hojas_arrugadas",
+            "hojas_devoradas", "hojas_curvadas", "hojas_manchas_negras", "hojas_mordidas",
+            "hojas_abolladas", "hojas_amarillas",
+        ],
+        "🌿 Tallos y raíces": [
+            "tallos_perforados", "tallos_cortados", "tallos_deformados", "tallos_mordidos",
+            "raices_perforadas", "raices_mascadas", "raices_mordidas",
+        ],
+        "🥔 Tubérculos": [
+            "tuberculos_huecos", "tuberculos_danados",
+            "tuberculos_con_galerias", "tuberculos_decolorados",
+        ],
+        "🐛 Insectos visibles": [
+            "larvas_presentes", "insectos_pequenos_negros", "insectos_pequenos",
+            "insectos_amarillos_negros", "insectos_mosca_blanca",
+            "larvas_internas", "larvas_rosadas", "insectos_verdes",
+        ],
+        "🌱 Planta completa": [
+            "plantas_debilitadas", "manchas_amarillas", "plantas_caidas",
+        ],
+        "🌾 Suelo y ambiente": [
+            "suelo_humedo", "suelo_agrietado", "ataque_nocturno", "clima_humedo",
+        ],
+        "🐌 Otros": [
+            "polvo_fino_blanco", "rastro_baboso",
+        ],
+    },
+
+    "textos": {
+        "sin_sintomas": "⚠️ Debes seleccionar al menos un síntoma.",
+        "sin_resultado": "🤔 No se encontró una plaga con esos síntomas. Intenta seleccionar más.",
+        "titulo_tarjeta": "Plaga identificada: {plaga}",
+        "certeza": "Nivel de certeza",
+        "recomendaciones": "✅ Recomendaciones:",
+        "alternativas": "🔄 Posibles alternativas",
+        "razonamiento": "🧠 Síntomas seleccionados",
+        "fuente": "Basado en el Manual de Plagas y Enfermedades del Cultivo de Papa - SENASA (2023).",
+    },
+}
@@ -0,0 +1,224 @@
+"""Vista de diagnóstico de la uva."""
+
+VISTA = {
+    "encabezado": "### ¿Qué está pasando con tus uvas?",
+    "pregunta": "Marca lo que ves en tus plantas:",
+    "boton": "🔍 Ver qué puede ser",
+    "boton_primario": True,
+    "tema": "uva",
+
+    # Síntomas técnicos en lenguaje común
+    "sintomas": {
+        "verrugas_hojas": "Bolitas o verrugas en las hojas",
+        "nudosidades_raices": "Pelotitas en las raíces",
+        "hojas_gris_plomizo": "Hojas de color gris",
+        "tejido_araña": "Telarañas en las hojas",
+        "brotacion_lenta": "Tarda en brotar",
+        "hojas_abarquilladas": "Hojas enrolladas hacia adentro",
+        "picaduras_racimos": "Marcas o picaduras en las uvas",
+        "aves_presentes": "Palomas o pájaros rondando",
+        "bayas_vacias": "Uvas vacías, solo cáscara",
+        "avispa_presencia": "Avispas alrededor de los racimos",
+        "racimos_consumidos": "Racimos comidos",
+        "madrigueras": "Hoyos en el suelo cerca de las plantas",
+        "hojas_consumidas": "Hojas comidas o con huecos",
+        "gusano_grande": "Gusano verde grande con cuerno",
+        "plantas_debiles": "Planta débil o raquítica",
+        "nódulos_redondeados_raíz": "Bultos redondos en raíces",
+        "polvillo_blanco": "Polvo blanco en las hojas",
+        "aborto_flores": "Flores se caen antes de dar fruto",
+        "moho_gris": "Pelusa gris en los racimos",
+        "racimos_podridos": "Racimos podridos",
+        "agallas_tallo": "Bultos o pelotas en el tronco",
+        "plantas_pequeñas": "Planta más chica de lo normal",
+        "clorosis_hojas": "Hojas amarillas",
+        "crecimiento_lento": "Crece muy lento",
+        "hojas_marchitas": "Hojas caídas o sin fuerza",
+        "suelo_seco": "Tierra muy seca",
+        "hojas_amarrillentas": "Hojas amarillentas",
+        "raíces_dañadas": "Raíces rotas o negras",
+        "flores_no_cuajan": "No salen uvas después de la flor",
+        "temperatura_alta": "Mucho calor últimamente",
+        "racimos_desiguales": "Racimos desparejos",
+        "poda_inadecuada": "Se podó mal o no se podó",
+    },
+
+    "categorias": {
+        "🍃 Hojas": [
+            "verrugas_hojas", "hojas_gris_plomizo", "tejido_araña",
+            "hojas_abarquilladas", "hojas_consumidas", "polvillo_blanco",
+            "clorosis_hojas", "hojas_marchitas", "hojas_amarrillentas",
+        ],
+        "🍇 Racimos y frutos": [
+            "picaduras_racimos", "bayas_vacias", "racimos_consumidos",
+            "moho_gris", "racimos_podridos", "racimos_desiguales",
+        ],
+        "🌱 Planta completa": [
+            "brotacion_lenta", "plantas_debiles", "plantas_pequeñas",
+            "crecimiento_lento", "agallas_tallo",
+        ],
+        "🌿 Raíces": [
+            "nudosidades_raices", "nódulos_redondeados_raíz", "raíces_dañadas",
+        ],
+        "🌸 Flores": [
+            "aborto_flores", "flores_no_cuajan",
+        ],
+        "🐦 Animales presentes": [
+            "aves_presentes", "avispa_presencia", "gusano_grande", "madrigueras",
+        ],
+        "🌡️ Condiciones ambientales": [
+            "suelo_seco", "temperatura_alta", "poda_inadecuada",
+        ],
+    },
+
+    "textos": {
+        "sin_sintomas": "⚠️ Marca al menos una cosa que veas en tus plantas",
+        "sin_resultado": "🤔 Con estos síntomas no logro identificar el problema. "
+                         "Intenta marcar más detalles o consulta a un técnico agrónomo.",
+        "titulo_tarjeta": "Problema identificado: {plaga}",
+        "certeza": "Nivel de seguridad",
+        "umbral": "Cuándo actuar",
+        "recomendaciones": "💡 Qué hacer:",
+        "alternativas": "🔄 También podría ser...",
+        "razonamiento": "🧠 ¿Cómo llegamos a este diagnóstico?",
+        "sintomas_marcados": "📌 Lo que marcaste:",
+        "reglas": "Reglas del sistema experto aplicadas:",
+        "preliminar": "⚠️ **Este es un diagnóstico preliminar.** Te sugerimos observar más "
+                      "síntomas o consultar a un especialista para confirmar.",
+        "proceso": "Este diagnóstico se basa en la combinación de síntomas que seleccionaste "
+                   "según las reglas del sistema experto.",
+        "tecnica": "⚙️ Información técnica (para especialistas)",
+    },
+
+    # Por regla activada: por qué se llegó al diagnóstico y qué buscar para confirmarlo
+    "explicaciones": {
+        "filoxera_completa": {
+            "titulo": "¿Por qué identificamos Filóxera?",
+            "texto": "Detectamos esta plaga porque encontraste **dos señales clave**: verrugas en las hojas y pelotitas en las raíces. Cuando aparecen juntas, es casi seguro que se trata de filóxera.",
+        },
+        "filoxera_parcial": {
+            "titulo": "¿Por qué sospechamos de Filóxera?",
+            "texto": "Vimos **solo una de las dos señales** típicas de filóxera (verrugas en hojas O pelotitas en raíces). Por eso lo marcamos como sospecha. Te recomendamos revisar bien las raíces.",
+            "sugerencia": "Revisa las raíces buscando nudosidades o pelotitas.",
+        },
+        "aranita_roja_completa": {
+            "titulo": "¿Por qué identificamos Arañita Roja?",
+            "texto": "Las **hojas grises** junto con **telarañas** son el síntoma clásico de arañita roja. Estos bichitos se alimentan de las hojas y les quitan el color.",
+        },
+        "aranita_roja_parcial": {
+            "titulo": "¿Por qué sospechamos de Arañita Roja?",
+            "texto": "Las hojas grises pueden ser arañita roja, pero necesitamos confirmar. Voltea las hojas y busca con cuidado unos bichitos rojos muy pequeños.",
+            "sugerencia": "Busca telarañas finas en la parte inferior de las hojas.",
+        },
+        "acaro_hialino_completa": {
+            "titulo": "¿Por qué identificamos Ácaro Hialino?",
+            "texto": "Cuando la planta **tarda en brotar** y las **hojas se enrollan**, es señal de ácaro hialino. Estos ácaros atacan los brotes nuevos.",
+        },
+        "acaro_hialino_parcial": {
+            "titulo": "¿Por qué sospechamos de Ácaro Hialino?",
+            "texto": "Vimos hojas enrolladas pero no confirmamos brotación lenta. Puede ser ácaro hialino en etapa temprana. Observa los brotes en los próximos días.",
+            "sugerencia": "Observa si los brotes tardan en salir en los próximos días.",
+        },
+        "aves_completa": {
+            "titulo": "¿Por qué identificamos daño por Aves?",
+            "texto": "Si ves **picaduras en las uvas** y hay **pájaros rondando**, está claro que son ellos los culpables. Las aves picotean las uvas maduras.",
+        },
+        "picaduras_generales": {
+            "titulo": "¿Por qué hay daño en racimos sin identificar la causa?",
+            "texto": "Detectamos **picaduras en las uvas** pero no viste pájaros ni avispas. Podría ser cualquiera de los dos. Observa el campo en diferentes horas.",
+            "sugerencia": "Visita tu campo al amanecer y al atardecer para ver si hay aves o avispas.",
+        },
+        "avispas_abejas_completa": {
+            "titulo": "¿Por qué identificamos Avispas y Abejas?",
+            "texto": "Las **uvas vacías** (solo cáscara) con **avispas volando** es típico. Las avispas entran y se comen todo el jugo de la uva.",
+        },
+        "bayas_vacias_parcial": {
+            "titulo": "¿Por qué sospechamos de Avispas?",
+            "texto": "Las **uvas vacías** son típicas de avispas, pero no confirmaste su presencia. Revisa los racimos en las mañanas cuando están más activas.",
+            "sugerencia": "Busca avispas activas en las mañanas cerca de los racimos.",
+        },
+        "ratas_raton_completa": {
+            "titulo": "¿Por qué identificamos Ratas y Ratones?",
+            "texto": "Los **racimos comidos** junto con **hoyos en el suelo** delatan a las ratas. Ellas comen los racimos completos y hacen madrigueras.",
+        },
+        "ratas_raton_parcial": {
+            "titulo": "¿Por qué sospechamos de Roedores?",
+            "texto": "Encontraste **racimos comidos O madrigueras** (pero no ambos). Es probable que haya ratas, pero necesitamos más evidencia como heces o rastros.",
+            "sugerencia": "Busca heces de roedor (negras, ovaladas) o más madrigueras.",
+        },
+        "gusano_cornudo_completa": {
+            "titulo": "¿Por qué identificamos Gusano Cornudo?",
+            "texto": "Si hay **hojas comidas** y ves un **gusano grande con cuerno**, es el gusano cornudo de la vid. Es grande y fácil de ver.",
+        },
+        "hojas_consumidas_parcial": {
+            "titulo": "¿Por qué hay daño en hojas sin identificar el insecto?",
+            "texto": "Las **hojas comidas** indican un insecto defoliador, pero sin ver el gusano grande no podemos confirmar que sea gusano cornudo. Busca larvas grandes.",
+            "sugerencia": "Revisa las plantas de noche con una linterna para encontrar larvas grandes.",
+        },
+        "nematodos_completa": {
+            "titulo": "¿Por qué identificamos Nematodos?",
+            "texto": "Las **plantas débiles** con **bultos redondos en las raíces** indican nematodos. Son como anguilitas que atacan las raíces.",
+        },
+        "nematodos_parcial": {
+            "titulo": "¿Por qué sospechamos de Nematodos?",
+            "texto": "Detectamos **bultos en las raíces** que son típicos de nematodos, aunque la planta no se ve débil aún. Es importante actuar antes que empeore.",
+            "sugerencia": "Observa si la planta se debilita en las próximas semanas.",
+        },
+        "oidium_completa": {
+            "titulo": "¿Por qué identificamos Oidio?",
+            "texto": "El **polvo blanco** en las hojas junto con **flores que se caen** es oidio (caracha). Es una de las enfermedades más comunes en uva.",
+        },
+        "oidium_parcial": {
+            "titulo": "¿Por qué sospechamos de Oidio?",
+            "texto": "El polvo blanco solo puede ser oidio, pero como no viste otros síntomas, lo marcamos como sospecha. Revisa bien los racimos.",
+            "sugerencia": "Revisa los racimos buscando el polvo blanco o flores que se caen.",
+        },
+        "podredumbre_gris_completa": {
+            "titulo": "¿Por qué identificamos Podredumbre Gris?",
+            "texto": "La **pelusa gris** en **racimos podridos** es podredumbre gris (botrytis). Aparece sobre todo cuando hay mucha humedad.",
+        },
+        "podredumbre_gris_parcial": {
+            "titulo": "¿Por qué sospechamos de Podredumbre Gris?",
+            "texto": "La pelusa gris es el primer síntoma. Si no ves racimos podridos aún, estás a tiempo de controlarlo.",
+            "sugerencia": "Verifica si aparecen racimos podridos, especialmente en climas húmedos.",
+        },
+        "racimos_podridos_general": {
+            "titulo": "¿Por qué hay pudrición sin identificar la causa?",
+            "texto": "Los **racimos podridos** sin pelusa gris visible pueden ser por exceso de humedad, daño por insectos o mala ventilación. No es necesariamente botrytis.",
+            "sugerencia": "Busca moho gris (botrytis) o verifica el riego y ventilación.",
+        },
+        "agalla_corona_completa": {
+            "titulo": "¿Por qué identificamos Agalla de la Corona?",
+            "texto": "Los **bultos en el tronco** junto con **plantas chicas** indican agalla de la corona. Es una bacteria que forma tumores.",
+        },
+        "agalla_corona_parcial": {
+            "titulo": "¿Por qué sospechamos de Agalla de la Corona?",
+            "texto": "Vimos **bultos en el tronco** pero la planta no está pequeña todavía. Puede ser agalla en etapa inicial. Importante desinfectar herramientas.",
+            "sugerencia": "Monitorea el crecimiento de la planta comparándola con plantas sanas.",
+        },
+        "deficiencia_nutricional": {
+            "titulo": "¿Por qué pensamos en Deficiencia Nutricional?",
+            "texto": "Las **hojas amarillas** con **crecimiento lento** sin otros síntomas sugieren que le faltan nutrientes a la planta (nitrógeno o potasio).",
+        },
+        "estrés_hidrico": {
+            "titulo": "¿Por qué pensamos en Falta de Agua?",
+            "texto": "Las **hojas caídas** con **tierra seca** es señal clara: tu planta tiene sed. Necesita más riego.",
+        },
+        "problema_raices": {
+            "titulo": "¿Por qué pensamos en Problemas de Raíces?",
+            "texto": "Las **hojas amarillentas** con **raíces dañadas** indican problemas en el suelo: puede ser mal drenaje o pH inadecuado.",
+        },
+        "estrés_ambiental": {
+            "titulo": "¿Por qué pensamos en Estrés por Calor?",
+            "texto": "Cuando **no salen uvas después de la flor** y ha hecho **mucho calor**, el problema es el clima. El calor extremo afecta la formación de frutos.",
+        },
+        "manejo_cultivo": {
+            "titulo": "¿Por qué pensamos en Mal Manejo del Cultivo?",
+            "texto": "Los **racimos desparejos** con **mala poda** indican errores de manejo. No es una plaga, sino cómo se está cuidando la planta.",
+        },
+        "sin_diagnostico": {
+            "titulo": "¿Por qué no encontramos una plaga específica?",
+            "texto": "Los síntomas que marcaste no coinciden con ninguna plaga o enfermedad conocida de la uva. Puede ser un problema diferente.",
+        },
+    },
+}